@@ -0,0 +1,127 @@
+"""
+Benchmark the hot DatabaseManager queries before and after the index migration.
+
+Loads N rows (default 1,000,000) into wellness_plans and agent_memory of a
+throwaway SQLite file at schema version 1 (tables only), times
+get_user_history / get_agent_memory style queries, applies the remaining
+migrations and times them again.
+
+Usage:
+    python benchmark_db_indexes.py [--rows 1000000] [--queries 200]
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from wellsync_ai.data.migrations import apply_migrations, get_schema_version
+
+USER_HISTORY_SQL = """SELECT plan_data, confidence, timestamp FROM wellness_plans
+                      WHERE user_id = ? ORDER BY created_at DESC LIMIT ?"""
+AGENT_MEMORY_SQL = """SELECT data, timestamp, session_id FROM agent_memory
+                      WHERE agent_name = ? AND memory_type = ?
+                      ORDER BY created_at DESC LIMIT ?"""
+
+AGENTS = ["FitnessAgent", "NutritionAgent", "SleepAgent", "MentalWellnessAgent", "CoordinatorAgent"]
+MEMORY_TYPES = ["episodic", "semantic_patterns", "semantic_constraints", "working"]
+
+
+def load_rows(conn: sqlite3.Connection, rows: int, users: int) -> None:
+    """Bulk-insert synthetic plans and agent memories."""
+    start = datetime.now() - timedelta(days=365)
+    plan = json.dumps({"fitness": {"sessions": 3}, "confidence": 0.8})
+    memory = json.dumps({"proposal": {"summary": "ok"}, "confidence": 0.7})
+    batch = 50_000
+
+    for offset in range(0, rows, batch):
+        count = min(batch, rows - offset)
+        conn.executemany(
+            "INSERT INTO wellness_plans (user_id, plan_data, confidence, timestamp, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                (f"user_{random.randrange(users)}", plan, 0.8, "",
+                 (start + timedelta(seconds=offset + i)).isoformat(sep=" "))
+                for i in range(count)
+            )
+        )
+        conn.executemany(
+            "INSERT INTO agent_memory (agent_name, memory_type, session_id, data, timestamp, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (random.choice(AGENTS), random.choice(MEMORY_TYPES), None, memory, "",
+                 (start + timedelta(seconds=offset + i)).isoformat(sep=" "))
+                for i in range(count)
+            )
+        )
+        conn.commit()
+
+
+def time_queries(conn: sqlite3.Connection, queries: int, users: int) -> dict:
+    """Return median/p95 latency in milliseconds for both hot queries."""
+    results = {}
+    cases = {
+        "get_user_history": lambda: conn.execute(
+            USER_HISTORY_SQL, (f"user_{random.randrange(users)}", 3)
+        ).fetchall(),
+        "get_agent_memory": lambda: conn.execute(
+            AGENT_MEMORY_SQL, (random.choice(AGENTS), random.choice(MEMORY_TYPES), 50)
+        ).fetchall(),
+    }
+    for name, run in cases.items():
+        samples = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            run()
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(samples[int(len(samples) * 0.95) - 1], 3)
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    random.seed(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        apply_migrations(conn, target_version=1)
+
+        print(f"Loading {args.rows:,} rows into wellness_plans and agent_memory...")
+        started = time.perf_counter()
+        load_rows(conn, args.rows, args.users)
+        print(f"Loaded in {time.perf_counter() - started:.1f}s")
+
+        before = time_queries(conn, args.queries, args.users)
+
+        started = time.perf_counter()
+        apply_migrations(conn)
+        print(f"Migrated to schema v{get_schema_version(conn)} in {time.perf_counter() - started:.1f}s")
+
+        after = time_queries(conn, args.queries, args.users)
+        conn.close()
+
+    print(f"\n{'query':<20} {'v1 median':>12} {'v1 p95':>10} {'indexed median':>16} {'indexed p95':>12}")
+    for name in before:
+        print(
+            f"{name:<20} {before[name]['median_ms']:>10.3f}ms {before[name]['p95_ms']:>8.3f}ms "
+            f"{after[name]['median_ms']:>14.3f}ms {after[name]['p95_ms']:>10.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
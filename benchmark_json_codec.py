@@ -0,0 +1,132 @@
+"""
+Microbenchmark the JSON codecs on real SharedState and proposal payloads.
+
+Builds a SharedState through its public update methods (against a
+throwaway SQLite file and the in-memory Redis fallback), filled the way a
+completed workflow leaves it: profile, recent data, four agent proposals,
+per-domain plans and the unified plan. Then times encode/decode of the
+full document, a single cached agent proposal, and the indent=2 prompt
+rendering for every available codec.
+
+Usage:
+    python benchmark_json_codec.py [--number 2000]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ["REDIS_URL"] = "redis://127.0.0.1:1/0"
+os.environ["DB_WRITE_BEHIND_ENABLED"] = "false"
+
+from wellsync_ai.data.database import initialize_database  # noqa: E402
+from wellsync_ai.data.shared_state import AgentProposal, SharedState  # noqa: E402
+from wellsync_ai.utils import json_codec  # noqa: E402
+
+DOMAINS = {
+    "FitnessAgent": "fitness",
+    "NutritionAgent": "nutrition",
+    "SleepAgent": "sleep",
+    "MentalWellnessAgent": "mental_wellness",
+}
+
+
+def _domain_plan(domain: str) -> dict:
+    return {
+        "summary": f"Balanced {domain} plan for the week with progressive targets",
+        "daily_schedule": [
+            {
+                "day": day,
+                "activities": [
+                    {"time": f"{7 + slot}:00", "activity": f"{domain} block {slot}",
+                     "duration_minutes": 30 + 5 * slot, "intensity": 0.4 + 0.1 * slot,
+                     "notes": "Adjust if recovery score drops below 60"}
+                    for slot in range(4)
+                ],
+            }
+            for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+        ],
+        "targets": {"weekly_minutes": 210, "adherence_goal": 0.85, "confidence": 0.78},
+        "constraints_for_others": {"max_intensity": 0.8, "rest_days": ["Sun"]},
+    }
+
+
+def build_state() -> SharedState:
+    """A SharedState as left behind by a completed workflow."""
+    state = SharedState()
+    with state.batch():
+        state.update_user_profile({
+            "user_id": "bench_user",
+            "goals": {"fitness": "build strength", "sleep": "7.5h", "nutrition": "high protein"},
+            "constraints": {"workout_days": 4, "daily_budget": 500, "equipment": ["dumbbells", "mat"]},
+            "preferences": {"diet": "vegetarian", "cuisine": ["north indian", "mediterranean"]},
+            "baseline_metrics": {"weight_kg": 72.5, "resting_hr": 61, "sleep_hours": 6.4},
+        })
+        for data_type in ("sleep", "stress", "nutrition", "fitness"):
+            state.update_recent_data(data_type, {
+                "days": [{"date": f"2026-10-{10 + i}", "value": 6.5 + i * 0.1, "quality": "fair"}
+                         for i in range(7)]
+            })
+        proposals = {}
+        for agent_id, domain in DOMAINS.items():
+            proposal = AgentProposal(
+                agent_id=agent_id, proposal_type="weekly_plan", content=_domain_plan(domain),
+                confidence=0.8, constraints_used=["time", "budget", "recovery"],
+                dependencies=["SleepAgent"] if agent_id != "SleepAgent" else [],
+                reasoning="Derived from the last 7 days of data and stated goals. " * 4,
+                timestamp="2026-10-17T08:00:00",
+            )
+            state.add_agent_proposal(proposal)
+            proposals[agent_id] = proposal.to_dict()
+            state.update_current_plans(domain, _domain_plan(domain))
+        state.update_recent_data("agent_proposals", proposals)
+        state.update_recent_data("unified_plan", {d: _domain_plan(d) for d in DOMAINS.values()})
+        state.update_workflow_status("completed")
+    return state
+
+
+def bench(codec, payload, number: int) -> dict:
+    """Best of 3 repeats, in microseconds per call."""
+    encoded = codec.dumps(payload)
+
+    def best(stmt):
+        return min(timeit.repeat(stmt, number=number, repeat=3)) / number * 1e6
+
+    return {
+        "dumps_us": best(lambda: codec.dumps(payload)),
+        "loads_us": best(lambda: codec.loads(encoded)),
+        "indent2_us": best(lambda: codec.dumps(payload, indent=2)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    initialize_database()
+    state = build_state()
+    payloads = {
+        "shared_state": state.get_state_data(),
+        "agent_proposal": state.get_state_data()["agent_proposals"]["FitnessAgent"],
+    }
+
+    codecs = json_codec.available_codecs()
+    print(f"Codecs: {', '.join(sorted(codecs))}")
+    for name, payload in payloads.items():
+        size = len(json_codec.get_codec().dumps_bytes(payload))
+        print(f"\n{name} ({size / 1024:.1f} KiB)")
+        print(f"{'codec':<8} {'dumps':>10} {'loads':>10} {'indent=2':>10}")
+        for codec_name in sorted(codecs):
+            result = bench(codecs[codec_name](), payload, args.number)
+            print(
+                f"{codec_name:<8} {result['dumps_us']:>8.1f}us {result['loads_us']:>8.1f}us "
+                f"{result['indent2_us']:>8.1f}us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+-- WellSync AI Supabase Migration 002
+-- Composite indexes for the hot history and agent memory lookups.
+-- Run outside a transaction block (CREATE INDEX CONCURRENTLY).
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+INSERT INTO schema_migrations (version, description) VALUES (1, 'Baseline tables')
+ON CONFLICT (version) DO NOTHING;
+
+-- get_user_history: user_id = ? ORDER BY created_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wellness_plans_user_created
+    ON wellness_plans(user_id, created_at DESC);
+
+-- get_agent_memory: agent_name = ? AND memory_type = ? ORDER BY created_at DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_agent_memory_agent_type_created
+    ON agent_memory(agent_name, memory_type, created_at DESC);
+
+-- get_latest_shared_state: ORDER BY created_at DESC LIMIT 1
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_shared_states_created
+    ON shared_states(created_at DESC);
+
+-- Superseded by idx_wellness_plans_user_created (same leading column)
+DROP INDEX CONCURRENTLY IF EXISTS idx_wellness_plans_user;
+
+ANALYZE wellness_plans;
+ANALYZE agent_memory;
+
+INSERT INTO schema_migrations (version, description)
+VALUES (2, 'Composite indexes for history and agent memory lookups')
+ON CONFLICT (version) DO NOTHING;
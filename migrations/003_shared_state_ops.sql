@@ -0,0 +1,20 @@
+-- WellSync AI Supabase Migration 003
+-- Append-only op log for SharedState. Each commit stores only the fields
+-- that changed; full documents in shared_states become periodic snapshots.
+
+CREATE TABLE IF NOT EXISTS shared_state_ops (
+    id BIGSERIAL PRIMARY KEY,
+    state_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    ops JSONB NOT NULL,
+    timestamp TIMESTAMPTZ DEFAULT NOW(),
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Replay: state_id = ? AND version > ? ORDER BY version
+CREATE INDEX IF NOT EXISTS idx_shared_state_ops_state_version
+    ON shared_state_ops(state_id, version);
+
+INSERT INTO schema_migrations (version, description)
+VALUES (3, 'Shared state op log')
+ON CONFLICT (version) DO NOTHING;
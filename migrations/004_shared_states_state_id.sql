@@ -0,0 +1,21 @@
+-- WellSync AI Supabase Migration 004
+-- Key shared_states by state_id so snapshots are upserted and loaded with
+-- a point lookup instead of scanning for the latest row.
+
+ALTER TABLE shared_states ADD COLUMN IF NOT EXISTS state_id TEXT;
+
+UPDATE shared_states SET state_id = data->>'state_id' WHERE state_id IS NULL;
+
+-- Keep only the newest snapshot per state (ties on created_at go to the
+-- higher id, so exactly one row survives for the unique index)
+DELETE FROM shared_states s
+USING shared_states newer
+WHERE s.state_id = newer.state_id
+  AND (s.created_at, s.id) < (newer.created_at, newer.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_shared_states_state_id
+    ON shared_states(state_id);
+
+INSERT INTO schema_migrations (version, description)
+VALUES (4, 'Key shared_states by state_id')
+ON CONFLICT (version) DO NOTHING;
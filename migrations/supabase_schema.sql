@@ -1,4 +1,13 @@
 -- WellSync AI Supabase Schema Migration
+-- Full schema at version 2. Existing deployments apply the numbered
+-- migrations in this directory instead (see schema_migrations below).
+
+-- 0. Applied schema versions
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMPTZ DEFAULT NOW()
+);
 
 -- 1. User Profiles
 CREATE TABLE IF NOT EXISTS user_profiles (
@@ -21,12 +30,23 @@ CREATE TABLE IF NOT EXISTS wellness_plans (
 -- 3. Shared States (Orchestration context)
 CREATE TABLE IF NOT EXISTS shared_states (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    state_id TEXT UNIQUE,
     user_id TEXT,
     timestamp TIMESTAMPTZ DEFAULT NOW(),
     data JSONB NOT NULL,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- 3b. Shared state op log (deltas between snapshots in shared_states)
+CREATE TABLE IF NOT EXISTS shared_state_ops (
+    id BIGSERIAL PRIMARY KEY,
+    state_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    ops JSONB NOT NULL,
+    timestamp TIMESTAMPTZ DEFAULT NOW(),
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- 4. Agent Memory
 CREATE TABLE IF NOT EXISTS agent_memory (
     id BIGSERIAL PRIMARY KEY,
@@ -75,11 +95,23 @@ CREATE TABLE IF NOT EXISTS system_logs (
 );
 
 -- Create Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_wellness_plans_user ON wellness_plans(user_id);
+-- get_user_history: user_id = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_wellness_plans_user_created ON wellness_plans(user_id, created_at DESC);
+-- get_agent_memory: agent_name = ? AND memory_type = ? ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_agent_memory_agent_type_created ON agent_memory(agent_name, memory_type, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_agent_memory_session ON agent_memory(session_id);
+CREATE INDEX IF NOT EXISTS idx_shared_states_created ON shared_states(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_shared_state_ops_state_version ON shared_state_ops(state_id, version);
 CREATE INDEX IF NOT EXISTS idx_api_requests_user ON api_requests(user_id);
 CREATE INDEX IF NOT EXISTS idx_user_feedback_state ON user_feedback(state_id);
 
+INSERT INTO schema_migrations (version, description) VALUES
+    (1, 'Baseline tables'),
+    (2, 'Composite indexes for history and agent memory lookups'),
+    (3, 'Shared state op log'),
+    (4, 'Key shared_states by state_id')
+ON CONFLICT (version) DO NOTHING;
+
 -- Enable RLS (Row Level Security) - Basic for hackathon (allow anon for now, can be restricted later)
 ALTER TABLE user_profiles ENABLE ROW LEVEL SECURITY;
 ALTER TABLE wellness_plans ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the test suite.
+"""
+
+import pytest
+
+from wellsync_ai.utils.cache_manager import CacheManager
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """
+    A CacheManager in in-memory fallback mode, installed as the global cache.
+
+    REDIS_URL points at a closed port for the duration of the test only,
+    so the manager never reaches a developer's Redis.
+    """
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+    cache = object.__new__(CacheManager)
+    cache._initialize()
+    monkeypatch.setattr("wellsync_ai.utils.cache_manager.get_cache_manager", lambda: cache)
+    return cache
@@ -0,0 +1,172 @@
+"""
+Test suite for the agent pool.
+
+Tests checkout and check-in accounting, that a set checked out a second
+time carries none of the previous request's per-user state, and that an
+exhausted pool times out with AgentPoolExhausted (503 from
+/wellness-plan). Agents are built without their Swarms/LLM setup, with
+just the state the pool resets.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import pytest
+from flask import Flask, g, jsonify
+
+import wellsync_ai.api.routes.wellness as wellness_routes
+import wellsync_ai.workflows.agent_pool as agent_pool
+import wellsync_ai.workflows.plan_jobs as plan_jobs
+from wellsync_ai.agents.base_agent import MemoryStore
+from wellsync_ai.agents.coordinator_agent import CoordinatorAgent
+from wellsync_ai.agents.fitness_agent import FitnessAgent
+from wellsync_ai.agents.mental_wellness_agent import MentalWellnessAgent
+from wellsync_ai.agents.nutrition_agent import NutritionAgent
+from wellsync_ai.agents.sleep_agent import DEFAULT_SLEEP_NEED_HOURS, SleepAgent
+from wellsync_ai.api.utils import WellnessAPIError
+from wellsync_ai.workflows.agent_pool import AgentPool, AgentPoolExhausted, AgentSet
+
+
+def _shell(agent_class):
+    """An agent instance with per-request state but no LLM client."""
+    agent = object.__new__(agent_class)
+    agent.agent_name = agent_class.__name__
+    agent.session_id = None
+    agent.domain_constraints = {}
+    agent._pending_side_effects = set()
+    agent.memory = object.__new__(MemoryStore)
+    agent.memory.working_memory = {}
+    return agent
+
+
+def _agent_set():
+    agent_set = object.__new__(AgentSet)
+    agent_set.coordinator = _shell(CoordinatorAgent)
+    agent_set.agents = {
+        cls.__name__: _shell(cls)
+        for cls in (FitnessAgent, NutritionAgent, SleepAgent, MentalWellnessAgent)
+    }
+    return agent_set
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(agent_pool, "AgentSet", _agent_set)
+    return AgentPool(size=1, checkout_timeout=0.05)
+
+
+class TestAgentPool:
+    """Test checkout, check-in and exhaustion."""
+
+    def test_checkin_returns_the_set(self, pool):
+        """A set is counted while checked out and reused once returned."""
+        with pool.checkout() as first:
+            assert pool.get_pool_stats()["checked_out"] == 1
+
+        with pool.checkout() as second:
+            assert second is first
+
+        stats = pool.get_pool_stats()
+        assert stats["created"] == 1
+        assert stats["checked_out"] == 0
+        assert stats["total_checkouts"] == 2
+
+    def test_second_checkout_starts_clean(self, pool):
+        """Per-user trackers from one request are gone when the set is checked out again."""
+        with pool.checkout() as agent_set:
+            fitness = agent_set.agents["FitnessAgent"]
+            sleep = agent_set.agents["SleepAgent"]
+            mental = agent_set.agents["MentalWellnessAgent"]
+            fitness.session_id = "session-1"
+            fitness.domain_constraints = {"equipment": ["bands"]}
+            fitness.training_load_history.append(42)
+            fitness.overtraining_indicators["fatigue_history"] = [7]
+            fitness.memory.working_memory["last_interaction"] = {"user_id": "u1"}
+            sleep.sleep_debt_history.append(2.5)
+            sleep.sleep_need_baseline = 9.1
+            mental.adherence_history.append(0.4)
+            agent_set.coordinator.conflict_resolution_history.append({"user_id": "u1"})
+
+        with pool.checkout() as agent_set:
+            fitness = agent_set.agents["FitnessAgent"]
+            sleep = agent_set.agents["SleepAgent"]
+            assert fitness.session_id is None
+            assert fitness.domain_constraints == {}
+            assert fitness.training_load_history == []
+            assert fitness.overtraining_indicators == {}
+            assert fitness.memory.working_memory == {}
+            assert sleep.sleep_debt_history == []
+            assert sleep.sleep_need_baseline == DEFAULT_SLEEP_NEED_HOURS
+            assert agent_set.agents["MentalWellnessAgent"].adherence_history == []
+            assert agent_set.coordinator.conflict_resolution_history == []
+
+    def test_exhausted_pool_times_out(self, pool):
+        """With every set checked out, a checkout gives up after its timeout."""
+        with pool.checkout():
+            with pytest.raises(AgentPoolExhausted):
+                with pool.checkout():
+                    pass
+
+        assert pool.get_pool_stats()["checkout_timeouts"] == 1
+
+
+class FakeSharedState:
+    """Just enough of SharedState for the plan route."""
+
+    state_id = "s1"
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+    def update_user_profile(self, profile):
+        pass
+
+
+class FakeDatabase:
+    def log_api_request(self, **kwargs):
+        pass
+
+
+class TestPoolExhaustedResponse:
+    """Test the synchronous /wellness-plan path when no agents are free."""
+
+    def test_exhausted_pool_returns_503(self, pool, monkeypatch):
+        """Callers are told to retry instead of waiting indefinitely."""
+        monkeypatch.setattr(plan_jobs, "get_agent_pool", lambda: pool)
+        monkeypatch.setattr(wellness_routes, "get_database_manager", lambda: FakeDatabase())
+        monkeypatch.setattr(wellness_routes, "create_shared_state", lambda user_id: FakeSharedState())
+
+        app = Flask(__name__)
+        app.register_blueprint(wellness_routes.wellness_bp)
+
+        @app.before_request
+        def before_request():
+            g.request_id = "req-test"
+
+        @app.errorhandler(WellnessAPIError)
+        def handle_wellness_api_error(error):
+            return jsonify({"success": False, "error": {"code": error.error_code}}), error.status_code
+
+        held = threading.Event()
+        release = threading.Event()
+
+        def hold_the_only_set():
+            with pool.checkout():
+                held.set()
+                release.wait(timeout=5)
+
+        holder = threading.Thread(target=hold_the_only_set)
+        holder.start()
+        try:
+            assert held.wait(timeout=5)
+            response = app.test_client().post(
+                "/wellness-plan",
+                json={"user_profile": {"user_id": "u1"}, "constraints": {}}
+            )
+        finally:
+            release.set()
+            holder.join()
+
+        assert response.status_code == 503
+        assert response.get_json()["error"]["code"] == "AGENT_POOL_EXHAUSTED"
@@ -0,0 +1,125 @@
+"""
+Test suite for the async agent path.
+
+Tests that _acall_llm moves on to a fallback model after transient
+provider errors (but not after a bad request), and that background
+memory writes keep the session they were scheduled for even when the
+agent is reset before they run.
+"""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import litellm
+import pytest
+
+from wellsync_ai.agents.fitness_agent import FitnessAgent
+
+
+def _make_agent():
+    """A FitnessAgent shell with just the attributes the async path reads."""
+    agent = object.__new__(FitnessAgent)
+    agent.agent_name = "FitnessAgent"
+    agent.system_prompt = "You are a fitness coach."
+    agent._api_key = "test-key"
+    agent._config = SimpleNamespace(
+        llm_model="test/primary",
+        agent_retry_attempts=1,
+        agent_temperature=0.2,
+        agent_max_tokens=200
+    )
+    agent.fallback_models = ["test/primary", "test/backup"]
+    agent.current_model_index = 0
+    agent.session_id = None
+    agent._pending_side_effects = set()
+    return agent
+
+
+class RecordingMemory:
+    """Stands in for MemoryStore; the first write waits for a signal."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.episodes = []
+        self.working = {}
+
+    def store_episodic_memory(self, session_id, data):
+        self.release.wait(timeout=5)
+        self.episodes.append(session_id)
+
+    def update_working_memory(self, updates):
+        self.working.update(updates)
+
+
+def _respond(content):
+    message = SimpleNamespace(content=content)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class TestLLMFallback:
+    """Test model fallback in the async LLM call."""
+
+    @pytest.mark.parametrize("error_class", [
+        litellm.Timeout, litellm.APIConnectionError,
+        litellm.InternalServerError, litellm.ServiceUnavailableError
+    ])
+    def test_transient_errors_fall_back(self, monkeypatch, error_class):
+        """Timeouts, connection errors and 5xx move on to the next model."""
+        calls = []
+
+        async def acompletion(model, **kwargs):
+            calls.append(model)
+            if model == "test/primary":
+                raise error_class(message="upstream trouble", model=model, llm_provider="openai")
+            return _respond("ok")
+
+        monkeypatch.setattr(litellm, "acompletion", acompletion)
+        agent = _make_agent()
+
+        assert asyncio.run(agent._acall_llm("plan please")) == "ok"
+        assert calls == ["test/primary", "test/backup"]
+        assert agent.current_model_index == 1
+
+    def test_bad_requests_are_not_retried(self, monkeypatch):
+        """Errors another model would repeat are raised at once."""
+        calls = []
+
+        async def acompletion(model, **kwargs):
+            calls.append(model)
+            raise litellm.BadRequestError(message="bad prompt", model=model, llm_provider="openai")
+
+        monkeypatch.setattr(litellm, "acompletion", acompletion)
+
+        with pytest.raises(litellm.BadRequestError):
+            asyncio.run(_make_agent()._acall_llm("plan please"))
+        assert calls == ["test/primary"]
+
+
+class TestSideEffects:
+    """Test background memory writes."""
+
+    def test_write_keeps_its_session_after_reset(self):
+        """A write scheduled for one session lands there even after the agent is reset."""
+        agent = _make_agent()
+        agent.memory = RecordingMemory()
+        agent.session_id = "session-1"
+
+        async def request():
+            agent._schedule_side_effect(
+                agent._record_interaction,
+                agent.session_id,
+                agent._build_interaction({"user_id": "u1"}, {"budget": 10}, {"confidence": 0.9})
+            )
+
+        # The loop is gone before the write runs, as after asyncio.run in a workflow
+        asyncio.run(request())
+        agent.session_id = None
+        assert not agent.wait_for_side_effects(timeout=0.05)
+
+        agent.memory.release.set()
+
+        assert agent.wait_for_side_effects(timeout=5)
+        assert agent.memory.episodes == ["session-1"]
+        assert agent.memory.working["last_response_confidence"] == 0.9
+        assert agent._pending_side_effects == set()
@@ -0,0 +1,156 @@
+"""
+Test suite for the tiered cache.
+
+Tests the bounded in-process L1 tier: LRU eviction, byte accounting,
+TTL expiry and pattern invalidation, plus tag-based invalidation (and
+its index staying bounded by L1) and single-flight computation in the
+CacheManager's in-memory fallback mode.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from wellsync_ai.utils.cache_manager import LocalLRUCache
+
+
+class TestLocalLRUCache:
+    """Test L1 cache bounds and expiry."""
+    
+    def test_get_returns_stored_value(self):
+        """Stored values are returned until they expire."""
+        cache = LocalLRUCache()
+        cache.set("agent_proposal:a", '{"x": 1}', ttl=60)
+        
+        assert cache.get("agent_proposal:a") == '{"x": 1}'
+        assert cache.get_stats()['hits'] == 1
+    
+    def test_evicts_least_recently_used_entry(self):
+        """The entry limit evicts the least recently read key first."""
+        cache = LocalLRUCache(max_entries=2)
+        cache.set("a", "1", ttl=60)
+        cache.set("b", "2", ttl=60)
+        cache.get("a")
+        cache.set("c", "3", ttl=60)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.get_stats()['evictions'] == 1
+    
+    def test_byte_budget_is_enforced(self):
+        """Byte accounting evicts entries once the size budget is exceeded."""
+        cache = LocalLRUCache(max_entries=100, max_bytes=10)
+        cache.set("a", "12345", ttl=60)
+        cache.set("b", "67890", ttl=60)
+        cache.set("c", "xyz", ttl=60)
+        
+        stats = cache.get_stats()
+        assert stats['bytes'] <= 10
+        assert cache.get("a") is None
+    
+    def test_expired_entries_are_dropped(self):
+        """Entries past their TTL count as misses and are removed."""
+        cache = LocalLRUCache()
+        cache.set("a", "1", ttl=0.01)
+        time.sleep(0.02)
+        
+        assert cache.get("a") is None
+        assert cache.get_stats()['expirations'] == 1
+        assert cache.get_stats()['entries'] == 0
+    
+    def test_delete_matching_uses_glob_patterns(self):
+        """Pattern invalidation matches Redis-style globs."""
+        cache = LocalLRUCache()
+        cache.set("agent_proposal:FitnessAgent:1", "1", ttl=60)
+        cache.set("agent_proposal:SleepAgent:2", "2", ttl=60)
+        cache.set("chat:u1", "3", ttl=60)
+        
+        assert cache.delete_matching("agent_proposal:*") == 2
+        assert cache.get("chat:u1") == "3"
+
+
+class TestCacheTags:
+    """Test tag-based invalidation without a Redis server."""
+    
+    @pytest.fixture(autouse=True)
+    def _cache(self, cache):
+        self.cache = cache
+    
+    def test_invalidate_tags_drops_only_tagged_keys(self):
+        """Keys tagged with a user are dropped; other users' keys survive."""
+        self.cache.set("agent_proposal:FitnessAgent:1", {"a": 1}, tags=["user:u1", "agent:FitnessAgent"])
+        self.cache.set("agent_proposal:SleepAgent:1", {"b": 2}, tags=["user:u1", "agent:SleepAgent"])
+        self.cache.set("agent_proposal:FitnessAgent:2", {"c": 3}, tags=["user:u2", "agent:FitnessAgent"])
+        
+        assert self.cache.invalidate_tags("user:u1") == 2
+        assert self.cache.get("agent_proposal:SleepAgent:1") is None
+        assert self.cache.get("agent_proposal:FitnessAgent:2") == {"c": 3}
+    
+    def test_invalidate_unknown_tag_is_noop(self):
+        """Invalidating a tag nobody used removes nothing."""
+        self.cache.set("k", {"v": 1}, tags=["agent:FitnessAgent"])
+        
+        assert self.cache.invalidate_tags("user:missing") == 0
+        assert self.cache.get("k") == {"v": 1}
+
+    def test_evicted_keys_leave_the_tag_index(self):
+        """L1 eviction and expiry also drop the key from the tag index."""
+        self.cache.local_cache.max_entries = 2
+        for i in range(5):
+            self.cache.set(f"k{i}", {"v": i}, tags=["agent:FitnessAgent", f"user:u{i}"])
+        self.cache.set("short", {"v": 0}, ttl=0.01, tags=["agent:SleepAgent"])
+        time.sleep(0.02)
+        self.cache.get("short")
+
+        assert self.cache._local_tags == {"agent:FitnessAgent": {"k4"}, "user:u4": {"k4"}}
+        assert set(self.cache._local_key_tags) == {"k4"}
+
+
+class TestSingleFlight:
+    """Test request coalescing in get_or_compute without a Redis server."""
+    
+    @pytest.fixture(autouse=True)
+    def _cache(self, cache):
+        self.cache = cache
+    
+    def test_concurrent_callers_share_one_computation(self):
+        """Identical concurrent requests run compute once and all get the value."""
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"plan": "x"}
+        
+        async def run():
+            return await asyncio.gather(*[
+                self.cache.get_or_compute("agent_proposal:A:shared:1", compute) for _ in range(5)
+            ])
+        
+        results = asyncio.run(run())
+        
+        assert len(calls) == 1
+        assert all(value == {"plan": "x"} for value, _ in results)
+        assert sorted(source for _, source in results) == ['coalesced'] * 4 + ['computed']
+    
+    def test_uncacheable_results_are_not_stored(self):
+        """should_cache=False results are returned but the next call recomputes."""
+        calls = []
+        
+        async def compute():
+            calls.append(1)
+            return {"is_error": True}
+        
+        def run_once():
+            return asyncio.run(self.cache.get_or_compute(
+                "agent_proposal:A:shared:2", compute,
+                should_cache=lambda r: not r.get("is_error")
+            ))
+        
+        run_once()
+        value, source = run_once()
+        
+        assert len(calls) == 2
+        assert source == 'computed'
+        assert value == {"is_error": True}
@@ -0,0 +1,111 @@
+"""
+Test suite for the chat client pool.
+
+Tests that chat clients are built once per model and reused, that a
+failing model falls back to the next configured one and is put in a
+cooldown, and that a request fails only when every model failed.
+Streamed responses fall back only until the first token is sent.
+"""
+
+import pytest
+
+from wellsync_ai.utils.llm import ChatClientPool, ChatModelsUnavailable
+
+
+class FakeClient:
+    """Stands in for GoogleGeminiChat without calling the API."""
+
+    def __init__(self, model_name, fail=False):
+        self.model_name = model_name
+        self.model = object()
+        self.fail = fail
+        self.fail_mid_stream = False
+        self.calls = 0
+
+    def complete(self, message, context=""):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("503 model overloaded")
+        return f"{self.model_name}: {message}"
+
+    def stream(self, message, context=""):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("503 model overloaded")
+        yield f"{self.model_name}: "
+        if self.fail_mid_stream:
+            raise RuntimeError("connection reset")
+        yield message
+
+
+@pytest.fixture
+def pool():
+    pool = ChatClientPool(models=['gemini/primary', 'gemini/backup', 'groq/other'])
+    pool._clients = {model: FakeClient(model) for model in pool.models}
+    return pool
+
+
+class TestChatClientPool:
+    """Test client reuse, health tracking and fallback."""
+
+    def test_only_gemini_models_are_pooled(self, pool):
+        """Models this client cannot serve are skipped."""
+        assert pool.models == ['gemini/primary', 'gemini/backup']
+
+    def test_clients_are_reused_across_requests(self, pool):
+        """The same client object serves every request."""
+        primary = pool._clients['gemini/primary']
+
+        assert pool.generate_response('hi') == 'gemini/primary: hi'
+        assert pool.generate_response('again') == 'gemini/primary: again'
+        assert pool._client('gemini/primary') is primary
+        assert primary.calls == 2
+
+    def test_failure_falls_back_and_cools_down(self, pool):
+        """A failing model is skipped on the next request while cooling down."""
+        pool._clients['gemini/primary'].fail = True
+
+        assert pool.generate_response('hi') == 'gemini/backup: hi'
+        assert pool.generate_response('again') == 'gemini/backup: again'
+
+        stats = pool.get_stats()
+        assert pool._clients['gemini/primary'].calls == 1
+        assert stats['gemini/primary']['healthy'] is False
+        assert stats['gemini/primary']['consecutive_failures'] == 1
+        assert stats['gemini/backup']['successes'] == 2
+
+    def test_all_models_failing_raises(self, pool):
+        """The route's canned fallback takes over when no model answers."""
+        for client in pool._clients.values():
+            client.fail = True
+
+        with pytest.raises(ChatModelsUnavailable):
+            pool.generate_response('hi')
+
+
+class TestStreamingResponses:
+    """Test token streaming and its fallback rules."""
+
+    def test_stream_yields_tokens(self, pool):
+        """Tokens arrive as the model produces them."""
+        assert list(pool.stream_response('hi')) == ['gemini/primary: ', 'hi']
+        assert pool.get_stats()['gemini/primary']['successes'] == 1
+
+    def test_failure_before_first_token_falls_back(self, pool):
+        """Nothing was sent yet, so the next model answers."""
+        pool._clients['gemini/primary'].fail = True
+
+        assert "".join(pool.stream_response('hi')) == 'gemini/backup: hi'
+
+    def test_failure_mid_stream_is_raised(self, pool):
+        """A partial reply is not continued by another model."""
+        pool._clients['gemini/primary'].fail_mid_stream = True
+        tokens = []
+
+        with pytest.raises(RuntimeError):
+            for token in pool.stream_response('hi'):
+                tokens.append(token)
+
+        assert tokens == ['gemini/primary: ']
+        assert pool._clients['gemini/backup'].calls == 0
+        assert pool.get_stats()['gemini/primary']['failures'] == 1
@@ -0,0 +1,102 @@
+"""
+Test suite for chat history.
+
+Tests that the Redis-backed history is shared between ChatContext
+instances (i.e. workers), stays bounded by folding old turns into a
+rolling summary within its token budget, expires, and that the
+in-process fallback behaves the same way.
+"""
+
+import pytest
+
+from wellsync_ai.utils.chat_context import ChatContext, summarize_messages
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.llm_scheduler import estimate_tokens
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def small_window(monkeypatch):
+    config = get_config()
+    monkeypatch.setattr(config, "chat_history_window", 4)
+    monkeypatch.setattr(config, "chat_summary_max_tokens", 40)
+    return config
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def _context(user_id, server):
+    context = ChatContext(user_id)
+    context.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    return context
+
+
+def _chat(context, turns):
+    for i in range(turns):
+        context.add_messages([
+            {"role": "user", "content": f"question {i}"},
+            {"role": "assistant", "content": f"answer {i}"}
+        ])
+
+
+class TestRedisChatContext:
+    """Test the shared, bounded Redis history."""
+
+    def test_history_is_shared_between_workers(self, small_window, server):
+        """A second instance (another worker) sees the same conversation."""
+        _chat(_context("u1", server), 1)
+
+        history = _context("u1", server).get_history()
+
+        assert [m["content"] for m in history] == ["question 0", "answer 0"]
+        assert _context("u2", server).get_history() == []
+
+    def test_old_turns_are_compacted_into_summary(self, small_window, server):
+        """The list never exceeds two windows; older turns survive in the summary."""
+        context = _context("u1", server)
+        _chat(context, 10)
+
+        assert context.redis_client.llen(context.history_key) < 2 * context.window
+        summary = context.get_summary()
+        assert "answer 5" in summary
+        assert estimate_tokens(summary) <= small_window.chat_summary_max_tokens
+        rendered = context.get_context_string()
+        assert rendered.startswith("Earlier in this conversation:")
+        assert rendered.endswith("assistant: answer 9")
+
+    def test_keys_expire(self, small_window, server):
+        """History and summary carry the configured TTL."""
+        context = _context("u1", server)
+        _chat(context, 5)
+
+        assert 0 < context.redis_client.ttl(context.history_key) <= small_window.chat_history_ttl_seconds
+        assert context.redis_client.ttl(context.summary_key) > 0
+
+
+class TestFallbackChatContext:
+    """Test the in-process fallback."""
+
+    def test_fallback_is_bounded_too(self, small_window):
+        """Without Redis, history is compacted the same way and can be cleared."""
+        context = ChatContext("fallback-user")
+        context.redis_client = None
+        _chat(context, 10)
+
+        assert len(context.get_history(100)) < 2 * context.window
+        assert "question" in context.get_summary()
+        context.clear_history()
+        assert context.get_history() == []
+
+    def test_summary_drops_oldest_lines_and_clips_long_messages(self):
+        """The summary keeps the newest lines that fit the budget."""
+        messages = [{"role": "user", "content": f"message {i} " + "x" * 500} for i in range(5)]
+
+        summary = summarize_messages("", messages, max_tokens=120)
+
+        assert "message 4" in summary
+        assert "message 0" not in summary
+        assert all(len(line) < 220 for line in summary.splitlines())
@@ -0,0 +1,136 @@
+"""
+Test suite for compressed payload storage.
+
+Tests the compression header round trip for every available algorithm,
+the size threshold, and that the database and Redis managers write large
+payloads compressed (except user feedback, which is queried with LIKE)
+while still reading plain JSON written before compression was enabled.
+"""
+
+import json
+
+import pytest
+
+from wellsync_ai.data.database import DatabaseManager
+from wellsync_ai.data.redis_client import RedisManager
+from wellsync_ai.utils import compression
+
+PLAN = {
+    'fitness': {'days': [{'day': d, 'activity': 'zone 2 run', 'minutes': 40} for d in range(60)]},
+    'sleep': {'bedtime': '22:30', 'notes': 'Dim screens an hour before bed. ' * 40},
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_compressor():
+    yield
+    compression.set_compressor('auto')
+
+
+@pytest.fixture(params=sorted(compression.available_compressors()))
+def algorithm(request):
+    return request.param
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(db_path=str(tmp_path / "compressed.db"))
+    if manager.use_supabase:
+        pytest.skip("Supabase configured")
+    manager.write_behind_enabled = False
+    manager.initialize_database()
+    yield manager
+    manager.close()
+
+
+class TestCompression:
+    """Test the header format and threshold."""
+
+    def test_round_trip(self, algorithm):
+        """Large payloads are compressed with a header and restored exactly."""
+        compression.set_compressor(algorithm, min_bytes=64)
+        text = json.dumps(PLAN)
+
+        packed = compression.compress(text)
+
+        assert compression.is_compressed(packed)
+        assert len(packed) * 3 < len(text.encode('utf-8'))
+        assert compression.decompress_text(packed) == text
+        assert compression.decompress(memoryview(packed)) == text.encode('utf-8')
+
+    def test_small_and_legacy_values_pass_through(self):
+        """Values below the threshold, and old uncompressed ones, are left as-is."""
+        compression.set_compressor('auto', min_bytes=1024)
+        small = json.dumps({'status': 'running'})
+
+        assert compression.compress(small) == small
+        assert compression.decompress(small) == small
+        assert compression.decompress(small.encode('utf-8')) == small.encode('utf-8')
+
+    def test_disabled_compression_still_reads(self):
+        """With compression off, previously compressed data remains readable."""
+        compression.set_compressor('zlib', min_bytes=64)
+        packed = compression.compress(json.dumps(PLAN))
+        compression.set_compressor('none')
+
+        assert compression.compress(json.dumps(PLAN)) == json.dumps(PLAN)
+        assert json.loads(compression.decompress_text(packed)) == PLAN
+
+    def test_unknown_format_is_rejected(self):
+        """A header naming an unknown algorithm fails loudly."""
+        with pytest.raises(ValueError):
+            compression.decompress(compression.MAGIC + b'?' + b'data')
+
+
+class TestCompressedStorage:
+    """Test the database and Redis managers on compressed payloads."""
+
+    def test_large_plans_are_stored_compressed(self, db):
+        """Plans above the threshold are BLOBs; history still returns JSON text."""
+        compression.set_compressor('auto', min_bytes=256)
+        db.store_wellness_plan('u1', PLAN, 0.9)
+
+        with db.get_connection() as conn:
+            stored = conn.execute("SELECT plan_data FROM wellness_plans").fetchone()[0]
+        history = db.get_user_history('u1')
+
+        assert compression.is_compressed(stored)
+        assert len(stored) * 3 < len(json.dumps(PLAN))
+        assert json.loads(history[0]['plan_data']) == PLAN
+
+    def test_uncompressed_rows_still_read(self, db):
+        """Rows written before compression are decoded unchanged."""
+        state = {'state_id': 's1', 'plans': PLAN}
+        with db.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO shared_states (state_id, timestamp, data) VALUES (?, ?, ?)",
+                ('s1', 't', json.dumps(state))
+            )
+            conn.commit()
+
+        assert db.get_shared_state('s1') == state
+        db.store_shared_state(state)
+        assert db.get_shared_state('s1') == state
+
+    def test_feedback_stays_searchable(self, db):
+        """Feedback is never compressed, so LIKE queries over it keep matching."""
+        compression.set_compressor('auto', min_bytes=64)
+        db.store_user_feedback('s1', {'action': 'accepted', 'notes': 'Felt great. ' * 40})
+
+        with db.get_connection() as conn:
+            count = conn.execute(
+                "SELECT count(*) FROM user_feedback WHERE feedback_data LIKE '%accepted%'"
+            ).fetchone()[0]
+
+        assert count == 1
+
+    def test_redis_values_round_trip(self):
+        """Compressed shared state and working memory decode from Redis or the fallback."""
+        compression.set_compressor('auto', min_bytes=256)
+        redis_manager = RedisManager()
+
+        redis_manager.set_shared_state('s1', PLAN)
+        redis_manager.set_agent_working_memory('SleepAgent', PLAN)
+
+        assert redis_manager.get_shared_state('s1') == PLAN
+        assert redis_manager.get_agent_working_memory('SleepAgent') == PLAN
@@ -0,0 +1,250 @@
+"""
+Test suite for the SQLite data layer.
+
+Tests the pooled connections used by DatabaseManager: WAL setup,
+connection reuse, rollback of abandoned transactions and pool bounds,
+plus versioned schema migrations and the write-behind queue.
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from wellsync_ai.data.database import DatabaseManager, SQLiteConnectionPool
+from wellsync_ai.data.migrations import LATEST_VERSION, apply_migrations, get_schema_version
+from wellsync_ai.data.write_behind import WriteBehindQueue
+
+
+class TestSQLiteConnectionPool:
+    """Test pooled SQLite connections."""
+
+    def _pool(self, tmp_path, size=2, timeout=1.0):
+        return SQLiteConnectionPool(str(tmp_path / "pool.db"), size=size, timeout=timeout)
+
+    def test_connections_use_wal_and_normal_sync(self, tmp_path):
+        """Pooled connections are configured for WAL with synchronous=NORMAL."""
+        pool = self._pool(tmp_path)
+        with pool.connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            # 1 == NORMAL
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_connections_are_reused(self, tmp_path):
+        """Sequential borrowers get the same connection back."""
+        pool = self._pool(tmp_path)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        assert first is second
+        assert pool.get_stats()['created'] == 1
+
+    def test_uncommitted_work_is_rolled_back_on_return(self, tmp_path):
+        """A borrower that forgets to commit does not leak its transaction."""
+        pool = self._pool(tmp_path)
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+            conn.execute("INSERT INTO t VALUES (1)")
+
+        with pool.connection() as conn:
+            assert conn.execute("SELECT count(*) FROM t").fetchone()[0] == 0
+
+    def test_pool_is_bounded(self, tmp_path):
+        """Borrowers beyond the pool size wait and then time out."""
+        pool = self._pool(tmp_path, size=1, timeout=0.2)
+        release = threading.Event()
+
+        def hold():
+            with pool.connection():
+                release.wait(2)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        try:
+            while pool.get_stats()['in_use'] == 0:
+                pass
+            with pytest.raises(Exception):
+                with pool.connection():
+                    pass
+        finally:
+            release.set()
+            holder.join()
+
+        assert pool.get_stats()['created'] == 1
+
+
+class TestMigrations:
+    """Test versioned SQLite schema migrations."""
+
+    def test_new_database_reaches_latest_version(self, tmp_path):
+        """All migrations apply once and are recorded."""
+        conn = sqlite3.connect(str(tmp_path / "m.db"))
+
+        assert apply_migrations(conn) == list(range(1, LATEST_VERSION + 1))
+        assert get_schema_version(conn) == LATEST_VERSION
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+        assert apply_migrations(conn) == []
+
+    def test_hot_queries_use_composite_indexes(self, tmp_path):
+        """History and agent memory lookups are served by an index, not a scan."""
+        conn = sqlite3.connect(str(tmp_path / "m.db"))
+        apply_migrations(conn)
+
+        history_plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT plan_data FROM wellness_plans "
+            "WHERE user_id = ? ORDER BY created_at DESC LIMIT 3", ("u1",)
+        ))
+        memory_plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM agent_memory "
+            "WHERE agent_name = ? AND memory_type = ? ORDER BY created_at DESC LIMIT 10",
+            ("FitnessAgent", "episodic")
+        ))
+
+        assert "idx_wellness_plans_user_created" in history_plan
+        assert "idx_agent_memory_agent_type_created" in memory_plan
+        assert "TEMP B-TREE" not in history_plan + memory_plan
+
+    def test_shared_states_keyed_by_state_id(self, tmp_path):
+        """Upgrading keeps the newest snapshot per state and indexes state_id."""
+        conn = sqlite3.connect(str(tmp_path / "m.db"))
+        apply_migrations(conn, target_version=3)
+        for version in (1, 2):
+            conn.execute(
+                "INSERT INTO shared_states (timestamp, data) VALUES (?, ?)",
+                ("t", '{"state_id": "s1", "v": %d}' % version)
+            )
+        conn.commit()
+        apply_migrations(conn)
+
+        rows = conn.execute("SELECT state_id, data FROM shared_states").fetchall()
+        plan = " ".join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM shared_states WHERE state_id = ?", ("s1",)
+        ))
+        assert rows == [("s1", '{"state_id": "s1", "v": 2}')]
+        assert "idx_shared_states_state_id" in plan
+
+
+class TestDatabaseManager:
+    """Test DatabaseManager on a pooled SQLite file."""
+
+    def test_store_and_read_history(self, tmp_path):
+        """Plans written through the pool are read back."""
+        db = DatabaseManager(db_path=str(tmp_path / "wellsync.db"))
+        if db.use_supabase:
+            pytest.skip("Supabase configured")
+        db.initialize_database()
+
+        db.store_wellness_plan("u1", {"n": 1}, 0.8)
+        db.store_wellness_plan("u1", {"n": 2}, 0.9)
+
+        history = db.get_user_history("u1", limit=5)
+        assert len(history) == 2
+        assert db.get_pool_stats()['in_use'] == 0
+
+
+class TestWriteBehind:
+    """Test batched, deferred inserts."""
+
+    def setup_method(self):
+        self.db = None
+
+    def teardown_method(self):
+        if self.db is not None:
+            self.db.close()
+
+    def _db(self, tmp_path):
+        self.db = DatabaseManager(db_path=str(tmp_path / "wb.db"))
+        if self.db.use_supabase:
+            pytest.skip("Supabase configured")
+        self.db.write_behind_enabled = True
+        self.db.initialize_database()
+        return self.db
+
+    def _count(self, table):
+        with self.db.get_connection() as conn:
+            return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+    def test_rows_are_written_on_flush(self, tmp_path):
+        """Deferred rows land in the database once flushed."""
+        db = self._db(tmp_path)
+        for i in range(25):
+            db.log_system_event('INFO', f"event {i}", 'test', {'i': i})
+        db.store_agent_memory('FitnessAgent', 'episodic', {'x': 1}, 'session-1')
+
+        assert db.flush_writes(timeout=5)
+        assert self._count('system_logs') == 25
+        assert db.get_agent_memory('FitnessAgent', 'episodic')[0]['session_id'] == 'session-1'
+
+    def test_duplicate_row_does_not_lose_batch(self, tmp_path):
+        """A constraint violation only skips the offending row."""
+        db = self._db(tmp_path)
+        db.log_api_request('/x', 'POST', {}, request_id='req-1')
+        db.log_api_request('/x', 'POST', {}, request_id='req-1')
+        db.log_api_request('/x', 'POST', {}, request_id='req-2')
+
+        assert db.flush_writes(timeout=5)
+        assert self._count('api_requests') == 2
+
+    def test_full_queue_falls_back_to_synchronous_write(self, tmp_path):
+        """Backpressure: a full queue writes inline instead of dropping rows."""
+        db = self._db(tmp_path)
+        writer_busy = threading.Event()
+
+        class SlowWriter:
+            """Blocks background batches until released; inline writes pass through."""
+            def write_batch(self, table, rows):
+                if threading.current_thread().name == "db-write-behind":
+                    writer_busy.wait(5)
+                return db.write_batch(table, rows)
+
+        queue = WriteBehindQueue(SlowWriter(), max_size=1, batch_size=1, enqueue_timeout=0.01)
+        try:
+            for i in range(5):
+                queue.enqueue('system_logs', {'level': 'INFO', 'message': str(i), 'timestamp': 't'})
+            assert queue.get_stats()['sync_fallbacks'] >= 1
+        finally:
+            writer_busy.set()
+            queue.close()
+
+        assert self._count('system_logs') == 5
+
+    def test_flush_gives_up_on_a_full_queue(self, tmp_path):
+        """A flush that cannot even queue its marker returns False at its timeout."""
+        db = self._db(tmp_path)
+        writer_busy = threading.Event()
+
+        class StuckWriter:
+            def write_batch(self, table, rows):
+                writer_busy.wait(5)
+                return db.write_batch(table, rows)
+
+        queue = WriteBehindQueue(StuckWriter(), max_size=1, batch_size=1, enqueue_timeout=0.5)
+        try:
+            row = {'level': 'INFO', 'message': 'x', 'timestamp': 't'}
+            queue.enqueue('system_logs', row)   # taken by the writer, which blocks
+            queue.enqueue('system_logs', row)   # fills the queue
+            started = time.monotonic()
+            assert queue.flush(timeout=0.05) is False
+            assert time.monotonic() - started < 1
+        finally:
+            writer_busy.set()
+            queue.close()
+
+        assert self._count('system_logs') == 2
+
+    def test_rows_after_writer_stops_are_written_inline(self, tmp_path):
+        """Once the writer has stopped, enqueue writes synchronously instead of queueing."""
+        db = self._db(tmp_path)
+        queue = WriteBehindQueue(db, enqueue_timeout=0.01)
+        queue._queue.put(None)   # the writer exits without close()
+        queue._thread.join(5)
+
+        queue.enqueue('system_logs', {'level': 'INFO', 'message': 'late', 'timestamp': 't'})
+
+        assert queue.get_stats()['sync_fallbacks'] == 1
+        assert queue.get_stats()['queue_depth'] == 0
+        assert self._count('system_logs') == 1
@@ -0,0 +1,155 @@
+"""
+Test suite for proposal cache fingerprints.
+
+Tests canonicalization of equivalent inputs, numeric bucketing and the
+per-agent shared/user scoping of fingerprints, and that invalidating a
+user (directly, or by rejecting a plan) also drops the shared-scope
+proposals that user was served, but not ones only other users saw.
+"""
+
+import asyncio
+
+from flask import Flask, g
+
+from wellsync_ai.api.routes import feedback as feedback_routes
+
+from wellsync_ai.utils.fingerprint import (
+    FingerprintField, canonicalize, bucket_number, build_fingerprint
+)
+from wellsync_ai.workflows.wellness_orchestrator import (
+    WellnessWorkflowOrchestrator, invalidate_user_proposals
+)
+
+
+class TestCanonicalize:
+    """Test normalization of equivalent encodings."""
+    
+    def test_integral_floats_match_ints(self):
+        """3.0 and 3 produce the same canonical value."""
+        assert canonicalize({'minutes': 30.0}) == canonicalize({'minutes': 30})
+    
+    def test_unordered_lists_ignore_order_and_case(self):
+        """Set-like fields compare equal regardless of order and case."""
+        a = canonicalize(['Dumbbells', 'bands'], unordered=True)
+        b = canonicalize(['bands', 'dumbbells'], unordered=True)
+        assert a == b
+    
+    def test_ordered_lists_keep_order(self):
+        """Regular lists stay order-sensitive."""
+        assert canonicalize([1, 2]) != canonicalize([2, 1])
+    
+    def test_empty_values_are_dropped(self):
+        """Empty and None dict values look like missing keys."""
+        assert canonicalize({'a': 1, 'b': None, 'c': {}, 'd': []}) == {'a': 1}
+    
+    def test_bucket_number(self):
+        """Numbers round down to the bucket step."""
+        assert bucket_number(72.4, 2.5) == 70
+        assert bucket_number(33, 5) == 30
+        assert bucket_number('n/a', 5) == 'n/a'
+
+
+class TestBuildFingerprint:
+    """Test field extraction across the request inputs."""
+    
+    def setup_method(self):
+        self.fields = (
+            FingerprintField('user_profile.fitness_level'),
+            FingerprintField('user_profile.age', bucket=5),
+            FingerprintField('constraints.equipment', unordered=True),
+        )
+    
+    def test_equivalent_profiles_share_fingerprint(self):
+        """Undeclared fields such as user_id do not affect the fingerprint."""
+        a = build_fingerprint(self.fields, {
+            'user_profile': {'user_id': 'u1', 'fitness_level': 'beginner', 'age': 31},
+            'constraints': {'equipment': ['mat', 'bands']}
+        })
+        b = build_fingerprint(self.fields, {
+            'user_profile': {'user_id': 'u2', 'fitness_level': 'beginner', 'age': 34.0},
+            'constraints': {'equipment': ['bands', 'mat']}
+        })
+        assert a == b
+    
+    def test_declared_field_changes_fingerprint(self):
+        """A change in a declared field produces a different fingerprint."""
+        a = build_fingerprint(self.fields, {'user_profile': {'fitness_level': 'beginner'}})
+        b = build_fingerprint(self.fields, {'user_profile': {'fitness_level': 'advanced'}})
+        assert a != b
+
+
+class SharedScopeAgent:
+    """Agent whose proposal depends only on the fitness level."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def cache_fingerprint(self, user_data, constraints, shared_state=None):
+        return 'shared', {'fitness_level': user_data.get('fitness_level')}
+    
+    async def aprocess_wellness_request(self, user_data, constraints, shared_state):
+        self.calls += 1
+        return {'agent_name': 'FitnessAgent', 'confidence': 0.9, 'proposal': {'sessions': 3}}
+
+
+class TestSharedProposalInvalidation:
+    """Test invalidation of proposals cached across users."""
+    
+    def setup_method(self):
+        self.agent = SharedScopeAgent()
+        self.orchestrator = object.__new__(WellnessWorkflowOrchestrator)
+        self.orchestrator.agents = {'FitnessAgent': self.agent}
+        self.orchestrator._state_id = None
+        self.orchestrator._progress = {}
+        self.orchestrator._on_event = None
+    
+    def _run(self, user_id):
+        profile = {'user_id': user_id, 'fitness_level': 'beginner'}
+        return asyncio.run(self.orchestrator._run_agents(profile, {}, {}))
+    
+    def test_invalidating_the_reusing_user_drops_the_shared_entry(self, cache):
+        """u2 reuses u1's proposal; invalidating u2 (not the producer) forces a recompute."""
+        self._run('u1')
+        self._run('u2')
+        assert self.agent.calls == 1
+        
+        assert invalidate_user_proposals('u2') == 1
+        
+        self._run('u2')
+        assert self.agent.calls == 2
+    
+    def test_users_never_served_an_entry_leave_it_alone(self, cache):
+        """Invalidating an unrelated user keeps the shared proposal for everyone else."""
+        self._run('u1')
+        self._run('u2')
+        
+        assert invalidate_user_proposals('u3') == 0
+        
+        self._run('u2')
+        assert self.agent.calls == 1
+    
+    def test_rejecting_a_plan_drops_the_users_proposals(self, cache, monkeypatch):
+        """POST /feedback with accepted=false invalidates what the user was served."""
+        class FakeDatabase:
+            def store_user_feedback(self, state_id, feedback, request_id=None):
+                return 1
+        
+        monkeypatch.setattr(feedback_routes, "get_database_manager", lambda: FakeDatabase())
+        app = Flask(__name__)
+        app.register_blueprint(feedback_routes.feedback_bp)
+        
+        @app.before_request
+        def before_request():
+            g.request_id = "req-test"
+        
+        self._run('u1')
+        self._run('u2')
+        client = app.test_client()
+        
+        assert client.post("/feedback", json={"user_id": "u2", "accepted": True}).status_code == 200
+        self._run('u2')
+        assert self.agent.calls == 1
+        
+        assert client.post("/feedback", json={"user_id": "u2", "accepted": False}).status_code == 200
+        self._run('u2')
+        assert self.agent.calls == 2
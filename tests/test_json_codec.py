@@ -0,0 +1,97 @@
+"""
+Test suite for the JSON codec layer.
+
+Tests that every available codec round-trips the payload shapes stored in
+Redis, the cache and the database, stays readable by the other codecs,
+and that typed decoding builds the nested state records.
+"""
+
+import json
+
+import pytest
+
+from wellsync_ai.data.nutrition_state import BudgetState, NutritionState
+from wellsync_ai.data.shared_state import AgentProposal
+from wellsync_ai.utils import json_codec
+
+CODECS = sorted(json_codec.available_codecs())
+
+
+@pytest.fixture(params=CODECS)
+def codec(request):
+    return json_codec.available_codecs()[request.param]()
+
+
+class TestCodecs:
+    """Test encode/decode parity across codecs."""
+
+    PAYLOAD = {
+        'state_id': 's1',
+        'recent_data': {'sleep': {'data': {'hours': 7.5, 'quality': None}}},
+        'agent_proposals': {'FitnessAgent': {'confidence': 0.8, 'tags': ['a', 'b']}},
+        'note': 'Paneer tikka – ₹120',
+        'enabled': True,
+    }
+
+    def test_round_trip_matches_stdlib(self, codec):
+        """Decoded values are identical, and output is readable by the stdlib."""
+        encoded = codec.dumps(self.PAYLOAD)
+
+        assert isinstance(encoded, str)
+        assert codec.loads(encoded) == self.PAYLOAD
+        assert json.loads(encoded) == self.PAYLOAD
+        assert codec.loads(codec.dumps_bytes(self.PAYLOAD)) == self.PAYLOAD
+
+    def test_sorted_and_indented_output(self, codec):
+        """sort_keys and indent=2 behave like the stdlib options."""
+        data = {'b': 1, 'a': {'d': [1, 2], 'c': 'x'}}
+
+        assert json.loads(codec.dumps(data, sort_keys=True)) == data
+        assert list(json.loads(codec.dumps(data, sort_keys=True))) == ['a', 'b']
+        assert codec.dumps(data, indent=2) == json.dumps(data, indent=2)
+
+    def test_non_string_keys_and_default(self, codec):
+        """Integer keys are stringified and default handles unknown types."""
+        class Opaque:
+            def __str__(self):
+                return 'opaque'
+
+        assert codec.loads(codec.dumps({1: 'a'})) == {'1': 'a'}
+        assert codec.loads(codec.dumps({'x': Opaque()}, default=str)) == {'x': 'opaque'}
+
+    def test_out_of_range_integers_fall_back(self, codec):
+        """Values the fast codec cannot encode still serialize."""
+        assert codec.loads(codec.dumps({'n': 2 ** 70})) == {'n': 2 ** 70}
+
+    def test_decode_errors_are_json_decode_errors(self, codec):
+        """Callers can keep catching json.JSONDecodeError."""
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads('{"unterminated": ')
+
+
+class TestTypedDecoding:
+    """Test decoding into state records."""
+
+    def test_from_dict_ignores_unknown_fields(self):
+        """Extra keys from newer payloads do not break decoding."""
+        proposal = json_codec.loads_as(json_codec.dumps({
+            'agent_id': 'SleepAgent', 'proposal_type': 'plan', 'content': {},
+            'confidence': 0.7, 'constraints_used': [], 'dependencies': [],
+            'reasoning': 'r', 'timestamp': 't', 'added_later': 1
+        }), AgentProposal)
+
+        assert proposal.agent_id == 'SleepAgent'
+        assert proposal.session_id is None
+
+    def test_nutrition_state_sections_decode_to_records(self):
+        """NutritionState loads its nested sections as dataclasses."""
+        state = NutritionState('u1')
+        state.budget.add_expense(120.0, 'lunch')
+        data = json_codec.loads(json_codec.dumps(state.to_dict()))
+
+        restored = NutritionState('u1')
+        restored._load_from_dict(data)
+
+        assert isinstance(restored.budget, BudgetState)
+        assert restored.budget.spent == 120.0
+        assert restored.to_dict()['budget'] == state.to_dict()['budget']
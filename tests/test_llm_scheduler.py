@@ -0,0 +1,93 @@
+"""
+Test suite for the LLM request scheduler.
+
+Tests admission control against token buckets, priority headroom
+and 429-driven backoff.
+"""
+
+import asyncio
+
+from wellsync_ai.utils.llm_scheduler import (
+    LLMScheduler,
+    LLMPriority,
+    TokenBucket,
+    estimate_tokens
+)
+
+
+class TestTokenBucket:
+    """Test token bucket refill and availability."""
+    
+    def test_full_bucket_admits_immediately(self):
+        """A fresh bucket has its full capacity available."""
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+        
+        assert bucket.time_until_available(5) == 0.0
+    
+    def test_empty_bucket_reports_refill_time(self):
+        """Wait time reflects the refill rate once drained."""
+        bucket = TokenBucket(capacity=10, refill_per_second=2)
+        bucket.consume(10)
+        
+        wait = bucket.time_until_available(4)
+        assert 1.9 <= wait <= 2.0
+    
+    def test_reserve_requires_headroom(self):
+        """Reserve keeps part of the bucket free for higher priorities."""
+        bucket = TokenBucket(capacity=10, refill_per_second=1)
+        bucket.consume(8)
+        
+        assert bucket.time_until_available(2, reserve=0.0) == 0.0
+        assert bucket.time_until_available(2, reserve=0.25) > 0.0
+
+
+class TestLLMScheduler:
+    """Test scheduler admission and backoff."""
+    
+    def setup_method(self):
+        """Set up a scheduler with a tiny gemini quota."""
+        self.scheduler = LLMScheduler(rate_limits={'gemini': (2, 100000)})
+    
+    def test_provider_mapping(self):
+        """Provider is derived from the LiteLLM model prefix."""
+        assert LLMScheduler.provider_for('gemini/gemini-2.5-flash') == 'gemini'
+        assert LLMScheduler.provider_for('groq/llama-3-70b-8192') == 'groq'
+        assert LLMScheduler.provider_for('gpt-4o') == 'openai'
+    
+    def test_admits_without_delay_within_quota(self):
+        """Calls inside the quota are not delayed at all."""
+        waited = asyncio.run(self.scheduler.acquire('gemini/gemini-2.5-flash', 100, LLMPriority.CHAT))
+        
+        assert waited == 0.0
+        assert self.scheduler.get_stats()['admitted'] == 1
+    
+    def test_lower_priority_waits_when_bucket_is_low(self):
+        """Swarm workers leave headroom that chat can still use."""
+        model = 'gemini/gemini-2.5-flash'
+        self.scheduler.acquire_sync(model, 100, LLMPriority.CHAT)
+        
+        assert self.scheduler._try_admit(model, 100, LLMPriority.SWARM_WORKER) > 0
+        assert self.scheduler._try_admit(model, 100, LLMPriority.CHAT) == 0.0
+    
+    def test_rate_limit_backoff_grows_and_resets(self):
+        """Consecutive 429s back off exponentially until a success."""
+        model = 'gemini/gemini-2.5-flash'
+        
+        first = self.scheduler.report_rate_limited(model)
+        second = self.scheduler.report_rate_limited(model)
+        
+        assert second == first * 2
+        assert self.scheduler.is_blocked(model)
+        assert self.scheduler._try_admit(model, 1, LLMPriority.CHAT) > 0
+        
+        self.scheduler.report_success(model)
+        assert self.scheduler.report_rate_limited(model) == first
+    
+    def test_retry_after_overrides_backoff(self):
+        """Provider Retry-After hints take precedence."""
+        assert self.scheduler.report_rate_limited('gemini/x', retry_after=7) == 7
+
+
+def test_estimate_tokens():
+    """Token estimate is ~4 chars per token plus output allowance."""
+    assert estimate_tokens("a" * 400, 100) == 200
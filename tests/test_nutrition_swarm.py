@@ -0,0 +1,64 @@
+"""
+Test suite for the hierarchical nutrition swarm.
+
+Tests that worker analyses run concurrently under a per-worker deadline,
+and that a worker missing it (or failing) is reported in place of its
+analysis instead of holding up the manager's decision.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from wellsync_ai.agents.nutrition_swarm.nutrition_manager import NutritionManager
+
+
+class StubWorker:
+    """Worker that answers after a delay, or raises."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+
+    async def aprocess_wellness_request(self, user_data, constraints, shared_state=None):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {'proposal': {'status': 'analyzed'}, 'confidence': 0.9}
+
+
+def _manager(timeout, **workers):
+    manager = object.__new__(NutritionManager)
+    manager._config = SimpleNamespace(swarm_worker_timeout_seconds=timeout)
+    manager.budget_analyst = workers.get('budget', StubWorker())
+    manager.availability_mapper = workers.get('availability', StubWorker())
+    manager.preference_modeler = workers.get('preferences', StubWorker())
+    manager.timing_advisor = workers.get('timing', StubWorker())
+    return manager
+
+
+class TestWorkerDeadlines:
+    """Test per-worker timeouts in _collect_worker_analyses."""
+
+    def test_slow_worker_is_awaiting_analysis(self):
+        """A worker past its deadline is reported without delaying the others."""
+        manager = _manager(0.1, timing=StubWorker(delay=5))
+
+        started = time.monotonic()
+        reports = asyncio.run(manager._collect_worker_analyses({'user_id': 'u1'}, {}, None))
+
+        assert time.monotonic() - started < 2
+        assert reports['timing']['status'] == 'awaiting_analysis'
+        assert reports['timing']['confidence'] == 0
+        assert reports['budget'] == {'status': 'analyzed'}
+        assert reports['availability'] == {'status': 'analyzed'}
+        assert reports['preferences'] == {'status': 'analyzed'}
+
+    def test_failed_worker_reports_its_error(self):
+        """A worker that raises is reported with its error."""
+        manager = _manager(1, budget=StubWorker(error=RuntimeError("price feed down")))
+
+        reports = asyncio.run(manager._collect_worker_analyses({'user_id': 'u1'}, {}, None))
+
+        assert reports['budget'] == {'error': 'price feed down', 'confidence': 0}
+        assert reports['timing'] == {'status': 'analyzed'}
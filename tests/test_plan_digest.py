@@ -0,0 +1,97 @@
+"""
+Test suite for chat plan digests.
+
+Tests that a wellness plan renders to a compact digest within its token
+budget, and that the digest is cached per user (one database query for
+many chat messages) until a new plan is stored.
+"""
+
+import pytest
+
+from wellsync_ai.utils import plan_digest
+from wellsync_ai.utils.llm_scheduler import estimate_tokens
+from wellsync_ai.utils.plan_digest import get_plan_digest, invalidate_plan_digest, render_plan_digest
+
+PLAN = {
+    "fitness": {
+        "weekly_schedule": [{"day": f"day {i}", "workout": "strength " * 20} for i in range(7)],
+        "intensity": "moderate"
+    },
+    "nutrition": {"daily_calories": 2200, "meals": ["oats", "salad", "salmon", "yogurt", "nuts"]},
+    "sleep": {"target_hours": 8, "notes": ""},
+    "confidence": 0.9
+}
+
+
+class FakeDatabase:
+    """Counts history queries instead of hitting SQLite."""
+
+    def __init__(self, plans):
+        self.plans = plans
+        self.queries = 0
+
+    def get_user_history(self, user_id, limit=5):
+        self.queries += 1
+        return self.plans[:limit]
+
+
+@pytest.fixture
+def database(monkeypatch):
+    database = FakeDatabase([{"plan_data": PLAN, "timestamp": "2026-01-01T08:00:00"}])
+    monkeypatch.setattr("wellsync_ai.data.database.get_database_manager", lambda: database)
+    return database
+
+
+class TestRenderPlanDigest:
+    """Test digest rendering."""
+
+    def test_digest_is_compact_and_bounded(self):
+        """Sections become single clipped lines, long lists are cut, empty values dropped."""
+        digest = render_plan_digest(PLAN, max_tokens=300)
+        lines = digest.splitlines()
+
+        assert [line.split(":")[0] for line in lines] == ["fitness", "nutrition", "sleep", "confidence"]
+        assert all(len(line) <= plan_digest.DIGEST_LINE_CHARS for line in lines)
+        assert "(+2 more)" in digest
+        assert "notes" not in digest
+        assert estimate_tokens(digest) < estimate_tokens(str(PLAN))
+
+    def test_sections_beyond_budget_are_dropped(self):
+        """Later sections are left out rather than overrunning the budget."""
+        digest = render_plan_digest(PLAN, max_tokens=90)
+
+        assert estimate_tokens(digest) <= 90
+        assert digest.startswith("fitness:")
+        assert "confidence" not in digest
+
+    def test_json_text_is_parsed(self):
+        """Plans stored as JSON text render the same as dicts."""
+        assert render_plan_digest('{"sleep": {"target_hours": 8}}', 50) == "sleep: target_hours=8"
+
+
+class TestPlanDigestCache:
+    """Test per-user caching and invalidation."""
+
+    def test_digest_is_cached_until_a_new_plan_is_stored(self, cache, database):
+        """Repeated chat messages cost one query; storing a plan forces a refresh."""
+        first = get_plan_digest("u1")
+        second = get_plan_digest("u1")
+
+        assert database.queries == 1
+        assert first == second
+        assert first["plan_date"] == "2026-01-01T08:00:00"
+        assert "daily_calories=2200" in first["digest"]
+
+        database.plans = [{"plan_data": {"sleep": {"target_hours": 9}}, "timestamp": "2026-02-01T08:00:00"}]
+        invalidate_plan_digest("u1")
+
+        assert get_plan_digest("u1")["digest"] == "sleep: target_hours=9"
+        assert database.queries == 2
+
+    def test_users_without_plans_are_cached_too(self, cache, database):
+        """A user with no plan does not query the database on every message."""
+        database.plans = []
+
+        assert get_plan_digest("new-user") == {"digest": "", "plan_date": None}
+        get_plan_digest("new-user")
+        assert database.queries == 1
@@ -0,0 +1,311 @@
+"""
+Test suite for background and streamed wellness plan jobs.
+
+Tests that job mode answers 202 and the status endpoint can be polled
+until the plan is ready, Server-Sent Event framing, and that a state
+with a job already in flight cannot be streamed a second time (409 from
+the stream route). The workflow itself is replaced by a stub that waits
+for the test to release it. A separate case polls through a second
+SharedStateManager, as a different gunicorn worker would, to check the
+plan shows up once the job completes elsewhere.
+"""
+
+import json
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import pytest
+from flask import Flask, g, jsonify
+
+import wellsync_ai.api.routes.wellness as wellness_routes
+import wellsync_ai.data.shared_state as shared_state_module
+import wellsync_ai.workflows.plan_jobs as plan_jobs
+from wellsync_ai.api.utils import WellnessAPIError, format_sse
+from wellsync_ai.data.database import DatabaseManager
+from wellsync_ai.data.shared_state import SharedState, SharedStateManager
+from wellsync_ai.workflows.plan_jobs import PlanJobInFlight, PlanJobRunner
+
+PLAN_REQUEST = {"user_profile": {"user_id": "u1"}, "constraints": {}}
+
+
+class StatusStore:
+    """Stands in for RedisManager's workflow status calls."""
+
+    def __init__(self):
+        self.statuses = {}
+
+    def set_workflow_status(self, workflow_id, status, data=None):
+        self.statuses[workflow_id] = {"status": status, "data": data or {}}
+        return True
+
+    def get_workflow_status(self, workflow_id):
+        return self.statuses.get(workflow_id)
+
+
+class FakeSharedState:
+    """Just enough of SharedState for the plan routes."""
+
+    def __init__(self, state_id):
+        self.state_id = state_id
+        self.data = {"user_profile": {}, "recent_data": {}, "workflow_status": "initialized"}
+
+    @contextmanager
+    def batch(self):
+        yield self
+
+    def update_user_profile(self, profile):
+        self.data["user_profile"] = profile
+
+    def update_recent_data(self, data_type, data):
+        self.data["recent_data"][data_type] = {"data": data}
+
+    def update_workflow_status(self, status, data=None):
+        self.data["workflow_status"] = status
+
+    def view(self):
+        return self.data
+
+    def get_state_summary(self):
+        return {"state_id": self.state_id}
+
+
+class FakeDatabase:
+    def log_api_request(self, **kwargs):
+        pass
+
+
+class StubWorkflow:
+    """Replaces run_plan_workflow; each run blocks until release() is called."""
+
+    def __init__(self, statuses, states):
+        self.statuses = statuses
+        self.states = states
+        self.started = threading.Event()
+        self._release = threading.Event()
+
+    def release(self):
+        self._release.set()
+
+    def __call__(self, state_id, user_id, on_event=None):
+        self.started.set()
+        if on_event:
+            on_event("proposal", {"agent": "FitnessAgent"})
+        self._release.wait(timeout=5)
+        plan = {"fitness": {"sessions": 3}}
+        self.states[state_id].update_recent_data("unified_plan", plan)
+        self.statuses.set_workflow_status(state_id, "completed", {})
+        if on_event:
+            on_event("plan", {"plan": plan})
+        return {"plan": plan}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    statuses = StatusStore()
+    states = {"s1": FakeSharedState("s1")}
+    workflow = StubWorkflow(statuses, states)
+    runner = PlanJobRunner(max_workers=2)
+
+    monkeypatch.setattr(plan_jobs, "get_redis_manager", lambda: statuses)
+    monkeypatch.setattr(plan_jobs, "run_plan_workflow", workflow)
+    monkeypatch.setattr(plan_jobs, "get_plan_job_runner", lambda: runner)
+    monkeypatch.setattr(wellness_routes, "get_redis_manager", lambda: statuses)
+    monkeypatch.setattr(wellness_routes, "get_database_manager", lambda: FakeDatabase())
+    monkeypatch.setattr(wellness_routes, "get_shared_state", lambda state_id, refresh=False: states.get(state_id))
+    monkeypatch.setattr(wellness_routes, "create_shared_state", lambda user_id: states["s1"])
+
+    app = Flask(__name__)
+    app.register_blueprint(wellness_routes.wellness_bp)
+
+    @app.before_request
+    def before_request():
+        g.request_id = "req-test"
+
+    @app.errorhandler(WellnessAPIError)
+    def handle_wellness_api_error(error):
+        return jsonify({"success": False, "error": {"code": error.error_code}}), error.status_code
+
+    yield app.test_client(), runner, workflow
+    workflow.release()
+    runner.shutdown()
+
+
+class DictRedis:
+    """Stands in for the Redis shared state calls both workers share."""
+
+    def __init__(self):
+        self.states = {}
+
+    def set_shared_state(self, key, data, ttl=None):
+        self.states[key] = json.loads(data) if isinstance(data, str) else dict(data)
+        return True
+
+    def get_shared_state(self, key):
+        return self.states.get(key)
+
+
+def _frames(body):
+    """Parse an SSE body into (event, data) pairs, skipping comments."""
+    frames = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if lines:
+            frames.append((lines["event"], json.loads(lines["data"])))
+    return frames
+
+
+class TestPlanJobs:
+    """Test job mode and status polling."""
+
+    def test_job_is_accepted_then_polled_to_completion(self, env):
+        """POST returns 202 at once; GET reports progress, then the plan."""
+        client, runner, workflow = env
+
+        response = client.post("/wellness-plan?async=true", json=PLAN_REQUEST)
+
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body["state_id"] == "s1"
+        assert body["status"] == "queued"
+        assert workflow.started.wait(timeout=5)
+
+        polled = client.get(body["status_url"]).get_json()
+        assert polled["status"] == "queued"
+        assert polled["progress"]["request_id"] == "req-test"
+        assert "plan" not in polled
+
+        resubmitted = client.post("/wellness-plan", json={**PLAN_REQUEST, "async": True, "state_id": "s1"})
+        assert resubmitted.get_json()["status"] == "running"
+
+        workflow.release()
+        runner.shutdown(wait=True)
+        polled = client.get(body["status_url"]).get_json()
+        assert polled["status"] == "completed"
+        assert polled["plan"] == {"fitness": {"sessions": 3}}
+
+    def test_job_finishing_at_once_does_not_deadlock(self, env):
+        """A job done before its callback is registered is forgotten right away."""
+        _, runner, workflow = env
+        workflow.release()
+
+        class InlineExecutor:
+            """Runs each job to completion inside submit()."""
+            def submit(self, fn, *args):
+                future = Future()
+                future.set_result(fn(*args))
+                return future
+
+            def shutdown(self, wait=True):
+                pass
+
+        runner.shutdown()
+        runner._executor = InlineExecutor()
+        finished = threading.Event()
+
+        def submit_and_stream():
+            runner.submit("s1", "u1")
+            list(runner.stream("s1", "u1"))
+            finished.set()
+
+        threading.Thread(target=submit_and_stream, daemon=True).start()
+
+        assert finished.wait(timeout=5)
+        assert runner.get_stats()["in_flight"] == 0
+
+    def test_workers_never_exceed_the_agent_pool(self, monkeypatch):
+        """Extra workers would only wait on agent set checkout."""
+        config = plan_jobs.get_config()
+        monkeypatch.setattr(config, "plan_job_workers", 8)
+        monkeypatch.setattr(config, "agent_pool_size", 3)
+
+        runner = PlanJobRunner()
+        runner.shutdown()
+
+        assert runner.max_workers == 3
+
+
+class TestSseFormatting:
+    """Test Server-Sent Event frames."""
+
+    def test_event_frame(self):
+        """Frames carry the event name and one line of JSON, ending in a blank line."""
+        frame = format_sse("proposal", {"agent": "SleepAgent", "notes": "a\nb"})
+
+        assert frame == 'event: proposal\ndata: {"agent":"SleepAgent","notes":"a\\nb"}\n\n'
+
+    def test_keepalive_is_a_comment(self):
+        """Keepalives are SSE comments, which clients ignore."""
+        assert format_sse("keepalive", {}) == ": keepalive\n\n"
+
+
+class TestPlanStream:
+    """Test streamed plan generation and its in-flight check."""
+
+    def test_stream_emits_proposals_then_plan(self, env):
+        """The route frames each workflow event between state and done."""
+        client, _, workflow = env
+        workflow.release()
+
+        response = client.post("/wellness-plan/stream", json=PLAN_REQUEST)
+
+        assert response.mimetype == "text/event-stream"
+        events = [event for event, _ in _frames(response.get_data(as_text=True))]
+        assert events == ["state", "proposal", "plan", "done"]
+
+    def test_stream_rejects_a_state_already_in_flight(self, env):
+        """A second run for the same state is refused rather than replacing the job."""
+        client, runner, workflow = env
+        assert runner.submit("s1", "u1")
+        assert workflow.started.wait(timeout=5)
+
+        with pytest.raises(PlanJobInFlight):
+            runner.stream("s1", "u1")
+        response = client.post("/wellness-plan/stream", json={
+            "user_profile": {"user_id": "u1", "goals": {"primary": "strength"}},
+            "constraints": {},
+            "state_id": "s1"
+        })
+
+        assert response.status_code == 409
+        assert response.get_json()["error"]["code"] == "PLAN_IN_PROGRESS"
+        assert runner.get_stats()["in_flight"] == 1
+        # The running job's state was left as it was
+        assert workflow.states["s1"].data["user_profile"] == {}
+
+
+class TestStatusAcrossWorkers:
+    """Test polling from a worker other than the one running the job."""
+
+    def test_poll_sees_plan_committed_by_another_worker(self, env, tmp_path, monkeypatch):
+        """A state cached before the job completed is reloaded, not served stale."""
+        client, _, _ = env
+        db = DatabaseManager(db_path=str(tmp_path / "state.db"))
+        if db.use_supabase:
+            pytest.skip("Supabase configured")
+        db.write_behind_enabled = False
+        db.initialize_database()
+        monkeypatch.setattr(shared_state_module, "get_database_manager", lambda: db)
+        redis = DictRedis()
+        monkeypatch.setattr(shared_state_module, "get_redis_manager", lambda: redis)
+        statuses = wellness_routes.get_redis_manager()
+
+        # The job's worker holds its own copy of the state
+        job_state = SharedState()
+        job_state.update_user_profile({"user_id": "u1"})
+        statuses.set_workflow_status(job_state.state_id, "running", {})
+
+        # The polling worker loads the state before the job completes
+        polling_worker = SharedStateManager(sweep_interval=0)
+        monkeypatch.setattr(wellness_routes, "get_shared_state", polling_worker.get_shared_state)
+        polled = client.get(f"/wellness-plan/{job_state.state_id}").get_json()
+        assert polled["status"] == "running"
+
+        plan = {"fitness": {"sessions": 3}}
+        job_state.update_recent_data("unified_plan", plan)
+        statuses.set_workflow_status(job_state.state_id, "completed", {})
+
+        polled = client.get(f"/wellness-plan/{job_state.state_id}").get_json()
+        assert polled["status"] == "completed"
+        assert polled["plan"] == plan
+        db.close()
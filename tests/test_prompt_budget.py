@@ -0,0 +1,106 @@
+"""
+Test suite for agent prompt budgeting.
+
+Tests that structured data is rendered as compact JSON with abbreviated
+keys and trimmed to its cap keeping the most recent list items, that
+prompts over budget give up low-priority sections first while required
+ones stay intact, and that agents' plan history stays within its budget.
+"""
+
+import json
+from types import SimpleNamespace
+
+from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.llm_scheduler import estimate_tokens
+from wellsync_ai.utils.prompt_budget import (
+    TRUNCATION_MARKER, PromptBuilder, PromptPriority, compact_json, truncate_to_tokens
+)
+
+WORKOUTS = {"recent_workouts": [{"day": i, "duration_minutes": 45, "notes": "steady effort"} for i in range(40)]}
+
+
+class TestCompactJson:
+    """Test compact rendering and capping of structured data."""
+
+    def test_no_whitespace_and_abbreviated_keys(self):
+        """Output is valid, unindented JSON with shortened key words."""
+        text = compact_json({"sleep_history": {"average_hours": 7}, "notes": "a b"})
+
+        assert text == '{"sleep_hist":{"avg_hrs":7},"notes":"a b"}'
+        assert json.loads(text)["sleep_hist"]["avg_hrs"] == 7
+
+    def test_cap_keeps_most_recent_list_items(self):
+        """Long lists are cut from the front and the omission is noted."""
+        text = compact_json(WORKOUTS, max_tokens=150)
+        workouts = json.loads(text)["recent_workouts"]
+
+        assert estimate_tokens(text) <= 150
+        assert workouts[0].endswith("earlier")
+        assert workouts[-1]["day"] == 39
+
+    def test_text_is_cut_when_lists_cannot_shrink(self):
+        """A single oversized value falls back to a marked cut."""
+        text = compact_json({"notes": "x" * 4000}, max_tokens=50)
+
+        assert estimate_tokens(text) <= 50
+        assert text.endswith(TRUNCATION_MARKER)
+
+    def test_truncate_prefers_line_breaks(self):
+        """Cuts land on a line boundary when one is close."""
+        text = "\n".join(f"line {i}" for i in range(100))
+
+        cut = truncate_to_tokens(text, 20)
+
+        assert estimate_tokens(cut) <= 20
+        assert cut.splitlines()[-2].startswith("line ")
+
+
+class TestPromptBuilder:
+    """Test priority-based truncation."""
+
+    def test_prompt_within_budget_is_untouched(self):
+        """Sections render in order, separated by blank lines."""
+        prompt = PromptBuilder(max_tokens=100)
+        prompt.add("HEADER", PromptPriority.REQUIRED).add("\nBODY\n", PromptPriority.LOW)
+
+        assert prompt.render() == "\nHEADER\n\nBODY\n"
+
+    def test_low_priority_sections_give_way_first(self):
+        """History is cut or dropped before the profile; required text survives."""
+        task = "TASK:\n" + "do the thing\n" * 40
+        prompt = PromptBuilder(max_tokens=400)
+        prompt.add("REQUEST", PromptPriority.REQUIRED)
+        prompt.add("PROFILE:\n" + "fact\n" * 100, PromptPriority.HIGH)
+        prompt.add("HISTORY:\n" + "old plan\n" * 200, PromptPriority.LOW)
+        prompt.add(task, PromptPriority.REQUIRED)
+
+        rendered = prompt.render()
+
+        assert estimate_tokens(rendered) <= 400
+        assert rendered.count("fact") == 100
+        assert rendered.count("old plan") < 200
+        assert task.strip() in rendered
+
+    def test_section_cap_applies_on_its_own(self):
+        """A per-section cap holds even when the prompt is under budget."""
+        prompt = PromptBuilder(max_tokens=10000)
+        prompt.add("x\n" * 1000, PromptPriority.MEDIUM, max_tokens=50)
+
+        assert estimate_tokens(prompt.render()) <= 52
+
+
+class TestHistoricalContext:
+    """Test the shared plan-history section of agent prompts."""
+
+    def test_history_stays_within_budget(self):
+        """Stored plans (JSON text) are parsed, narrowed to the domain and capped."""
+        agent = SimpleNamespace(domain="fitness", _config=SimpleNamespace(agent_history_max_tokens=300))
+        plan = json.dumps({"fitness": WORKOUTS, "nutrition": {"meals": ["oats"] * 50}})
+        history = [{"timestamp": f"2026-0{i}-01", "confidence": 0.8, "plan_data": plan} for i in range(1, 4)]
+
+        formatted = WellnessAgent._format_historical_context(agent, history)
+
+        assert formatted.count("--- Plan") == 3
+        assert "oats" not in formatted
+        assert '"day":39' in formatted
+        assert estimate_tokens(formatted) <= 300 + 60
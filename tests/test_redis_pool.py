@@ -0,0 +1,145 @@
+"""
+Test suite for the shared Redis connection pool.
+
+Tests, against an in-process fake Redis server, that the pool counts
+round trips and connections, that the cache's multi-get reads several
+keys in one round trip, that L1 copies expire with their Redis key,
+that the TTL sweep is pipelined instead of costing two round trips per
+key, and that cache tag sets stay bounded and can be extended.
+"""
+
+import time
+
+import pytest
+import redis
+
+from wellsync_ai.data.redis_client import RedisManager
+from wellsync_ai.utils.redis_pool import MeteredConnectionPool
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def pool():
+    return MeteredConnectionPool(
+        connection_class=getattr(fakeredis, 'FakeRedisConnection', None) or fakeredis.FakeConnection,
+        server=fakeredis.FakeServer(),
+        max_connections=2,
+        timeout=0.1,
+        decode_responses=True
+    )
+
+
+class TestMeteredPool:
+    """Test pool accounting."""
+
+    def test_counts_round_trips_and_connections(self, pool):
+        """Each command or pipeline execution is one checkout on a reused connection."""
+        client = redis.Redis(connection_pool=pool)
+        client.set('a', 1)
+        pipe = client.pipeline(transaction=False)
+        pipe.get('a')
+        pipe.ttl('a')
+        pipe.execute()
+
+        stats = pool.get_stats()
+        assert stats['checkouts'] == 2
+        assert stats['connections'] == 1
+        assert stats['in_use'] == 0
+
+    def test_exhausted_pool_fails_after_timeout(self, pool):
+        """Checkouts beyond max_connections wait, then error and are counted."""
+        held = [pool.get_connection(), pool.get_connection()]
+
+        with pytest.raises(redis.ConnectionError):
+            pool.get_connection()
+        assert pool.get_stats()['in_use'] == 2
+        assert pool.get_stats()['checkout_errors'] == 1
+
+        for connection in held:
+            pool.release(connection)
+
+
+class TestPipelinedOperations:
+    """Test batched cache reads and TTL sweeps."""
+
+    def test_get_many_is_one_round_trip(self, pool, cache):
+        """Four agent entries are fetched with a single MGET and warm L1."""
+        cache.redis_client = redis.Redis(connection_pool=pool)
+        keys = [f"agent_proposal:{name}:user:abc" for name in ('Fitness', 'Nutrition', 'Sleep', 'Mental')]
+        for i, key in enumerate(keys[:3]):
+            cache.redis_client.set(key, f'{{"n": {i}}}')
+        before = pool.checkouts
+
+        found = cache.get_many(keys)
+
+        assert pool.checkouts == before + 1
+        assert found == {keys[0]: {'n': 0}, keys[1]: {'n': 1}, keys[2]: {'n': 2}}
+        assert cache.get(keys[1]) == {'n': 1}
+        assert pool.checkouts == before + 1
+
+    def test_l1_copy_expires_with_the_redis_key(self, pool, cache):
+        """An L2 hit is kept in L1 no longer than the key has left in Redis."""
+        cache.redis_client = redis.Redis(connection_pool=pool)
+        cache.redis_client.set("agent_proposal:short", '{"n": 1}', px=2000)
+        cache.redis_client.set("agent_proposal:long", '{"n": 2}', ex=3600)
+        cache.redis_client.set("agent_proposal:listed", '{"n": 3}', px=2000)
+
+        assert cache.get("agent_proposal:short") == {"n": 1}
+        assert cache.get("agent_proposal:long") == {"n": 2}
+        assert cache.get_many(["agent_proposal:listed"]) == {"agent_proposal:listed": {"n": 3}}
+
+        remaining = {
+            key: expires_at - time.monotonic()
+            for key, (_, expires_at, _) in cache.local_cache._entries.items()
+        }
+        assert 0 < remaining["agent_proposal:short"] <= 2
+        assert 0 < remaining["agent_proposal:listed"] <= 2
+        assert cache.l1_ttl - 1 < remaining["agent_proposal:long"] <= cache.l1_ttl
+
+    def test_tag_sets_drop_expired_members(self, pool, cache):
+        """Writes prune dead members and only push the tag's expiry out when needed."""
+        cache.redis_client = redis.Redis(connection_pool=pool)
+        tag_key = "cache:tags:agent:FitnessAgent"
+        cache.redis_client.zadd(tag_key, {"agent_proposal:gone": time.time() - 1})
+
+        cache.set("agent_proposal:a", {"n": 1}, ttl=60, tags=["agent:FitnessAgent"])
+        expiry = cache.redis_client.ttl(tag_key)
+        before = pool.checkouts
+        cache.set("agent_proposal:b", {"n": 2}, ttl=60, tags=["agent:FitnessAgent"])
+
+        assert pool.checkouts == before + 1
+        assert cache.redis_client.ttl(tag_key) == expiry
+        assert cache.redis_client.zrange(tag_key, 0, -1) == ["agent_proposal:a", "agent_proposal:b"]
+        assert cache.invalidate_tags("agent:FitnessAgent") == 2
+        assert cache.redis_client.exists(tag_key, "agent_proposal:a") == 0
+
+    def test_ttl_sweep_is_pipelined(self, pool):
+        """Keys without a TTL get one in two round trips, not two per key."""
+        manager = RedisManager()
+        manager._use_redis = True
+        manager._client = redis.Redis(connection_pool=pool)
+        for i in range(20):
+            manager._client.set(f"shared_state:{i}", '{}')
+        manager._client.set("workflow:w1", '{}', ex=60)
+        before = pool.checkouts
+
+        manager.clear_expired_data()
+
+        # One SCAN per pattern, plus TTL and EXPIRE pipelines for each non-empty pattern
+        assert pool.checkouts - before <= 3 + 2 * 2
+        assert manager._client.ttl("shared_state:7") > 0
+        assert manager._client.ttl("workflow:w1") <= 60
+
+    def test_added_tags_invalidate_the_entry(self, pool, cache):
+        """Tags added to a stored entry follow its expiry and keep the original ones."""
+        cache.redis_client = redis.Redis(connection_pool=pool)
+        cache.set("agent_proposal:shared", {"n": 1}, ttl=60, tags=["user:u1"])
+
+        assert cache.add_tags(["agent_proposal:shared", "agent_proposal:missing"], ["user:u2"]) == 1
+
+        scores = [cache.redis_client.zscore(f"cache:tags:user:{user}", "agent_proposal:shared") for user in ("u1", "u2")]
+        assert abs(scores[0] - scores[1]) < 1
+        assert cache.redis_client.ttl("cache:tags:user:u2") > 60
+        assert cache.invalidate_tags("user:u2") == 1
+        assert cache.get("agent_proposal:shared") is None
@@ -0,0 +1,274 @@
+"""
+Test suite for SharedState persistence.
+
+Tests the delta-based storage: batched commits, op log appends between
+snapshots, compaction, and rebuilding a state from snapshot plus ops
+after the Redis copy is gone, that an update racing serialization never
+leaves a stale cached encoding, plus the manager's bounded registry of
+loaded states (LRU, idle TTL sweeps and memory accounting).
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+import wellsync_ai.data.shared_state as shared_state_module
+from wellsync_ai.data.database import DatabaseManager
+from wellsync_ai.data.shared_state import (
+    AgentProposal, SharedState, SharedStateManager, UserProfile
+)
+
+
+class DictRedis:
+    """Minimal stand-in for the Redis shared state calls."""
+
+    def __init__(self):
+        self.states = {}
+        self.writes = 0
+
+    def set_shared_state(self, key, data, ttl=None):
+        self.writes += 1
+        self.states[key] = json.loads(data) if isinstance(data, str) else dict(data)
+        return True
+
+    def get_shared_state(self, key):
+        return self.states.get(key)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    db = DatabaseManager(db_path=str(tmp_path / "state.db"))
+    if db.use_supabase:
+        pytest.skip("Supabase configured")
+    db.write_behind_enabled = False
+    db.initialize_database()
+    redis = DictRedis()
+    monkeypatch.setattr(shared_state_module, "get_database_manager", lambda: db)
+    monkeypatch.setattr(shared_state_module, "get_redis_manager", lambda: redis)
+    yield db, redis
+    db.close()
+
+
+def _count(db, table):
+    with db.get_connection() as conn:
+        return conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+class TestSharedStatePersistence:
+    """Test op log commits and snapshot compaction."""
+
+    def test_first_commit_is_a_snapshot_then_deltas(self, storage):
+        """After the initial snapshot, updates append ops instead of full rows."""
+        db, _ = storage
+        state = SharedState()
+        state.update_user_profile({'user_id': 'u1'})
+        state.update_recent_data('sleep', {'hours': 7})
+        state.update_workflow_status('running')
+
+        assert _count(db, 'shared_states') == 1
+        assert _count(db, 'shared_state_ops') == 2
+
+    def test_batch_produces_one_durable_write(self, storage):
+        """Mutations inside a batch are coalesced into a single commit."""
+        db, redis = storage
+        state = SharedState()
+        state.update_user_profile({'user_id': 'u1'})
+        writes_before = redis.writes
+
+        with state.batch():
+            state.update_workflow_status('running')
+            for domain in ('fitness', 'nutrition', 'sleep', 'mental_wellness'):
+                state.update_current_plans(domain, {'domain': domain})
+            state.update_recent_data('unified_plan', {'ok': True})
+            state.update_workflow_status('completed')
+
+        assert redis.writes == writes_before + 1
+        assert _count(db, 'shared_state_ops') == 1
+        ops = db.get_shared_state_ops(state.state_id)[0]
+        # Both status updates collapse into the last one
+        assert [op['value'] for op in ops if op['path'] == ['workflow_status']] == ['completed']
+
+    def test_snapshot_interval_compacts_ops(self, storage, monkeypatch):
+        """Every N commits a snapshot is written and older ops are dropped."""
+        db, _ = storage
+        state = SharedState()
+        monkeypatch.setattr(state.config, "shared_state_snapshot_interval", 3)
+        state.update_user_profile({'user_id': 'u1'})
+        for i in range(3):
+            state.update_recent_data('steps', {'count': i})
+
+        # Snapshots are upserted per state_id
+        assert _count(db, 'shared_states') == 1
+        assert _count(db, 'shared_state_ops') == 0
+
+    def test_reload_replays_ops_after_redis_miss(self, storage):
+        """Without Redis, state is rebuilt from the snapshot plus the op log."""
+        db, redis = storage
+        state = SharedState()
+        state.update_user_profile({'user_id': 'u1'})
+        with state.batch():
+            state.update_current_plans('sleep', {'bedtime': '22:30'})
+            state.update_workflow_status('completed', {'agents': 4})
+
+        redis.states.clear()
+        reloaded = SharedState(state.state_id)
+
+        assert reloaded.get_current_plans('sleep')['plan'] == {'bedtime': '22:30'}
+        assert reloaded.get_state_data()['workflow_status'] == 'completed'
+        assert reloaded.get_state_data()['workflow_metadata'] == {'agents': 4}
+        assert reloaded.get_state_summary()['version'] == state.get_state_summary()['version']
+
+    def test_reload_is_not_limited_to_the_latest_state(self, storage):
+        """A state written before others is still found by its state_id."""
+        _, redis = storage
+        first = SharedState()
+        first.update_user_profile({'user_id': 'u1'})
+        second = SharedState()
+        second.update_user_profile({'user_id': 'u2'})
+
+        redis.states.clear()
+        reloaded = SharedState(first.state_id)
+
+        assert reloaded.get_user_profile().user_id == 'u1'
+
+
+
+class TestStateRecords:
+    """Test slotted records and the cached serialization."""
+
+    def test_records_are_slotted(self):
+        """Records carry no per-instance __dict__ and convert to plain dicts."""
+        proposal = AgentProposal(
+            agent_id='SleepAgent', proposal_type='plan', content={'hours': 8},
+            confidence=0.9, constraints_used=[], dependencies=[],
+            reasoning='ok', timestamp='t'
+        )
+
+        assert not hasattr(proposal, '__dict__')
+        assert proposal.to_dict()['content'] is proposal.content
+        assert AgentProposal(**proposal.to_dict()) == proposal
+        assert UserProfile.__slots__[0] == 'user_id'
+
+    def test_to_json_reencodes_only_dirty_sections(self, storage, monkeypatch):
+        """Unchanged sections reuse their cached encoding."""
+        state = SharedState()
+        state.update_current_plans('sleep', {'bedtime': '22:30'})
+        state.to_json()
+
+        encoded = []
+        real_dumps = json.dumps
+        monkeypatch.setattr(
+            shared_state_module.json_codec, 'dumps',
+            lambda value, *a, **kw: encoded.append(value) or real_dumps(value, *a, **kw)
+        )
+        state.update_recent_data('steps', {'count': 1})
+        document = json.loads(state.to_json())
+
+        assert document == json.loads(real_dumps(state.get_state_data()))
+        assert state.get_state_data()['current_plans'] not in encoded
+        assert state.get_state_data()['recent_data'] in encoded
+
+    def test_view_is_read_only(self, storage):
+        """view() exposes the live state without copying and rejects writes."""
+        state = SharedState()
+        state.update_workflow_status('running')
+
+        view = state.view()
+        assert view['workflow_status'] == 'running'
+        with pytest.raises(TypeError):
+            view['workflow_status'] = 'done'
+
+
+class TestEncodingCache:
+    """Test the per-section encoding cache under concurrent updates."""
+
+    def test_update_during_serialization_is_not_lost(self, storage, monkeypatch):
+        """A section updated while to_json() encodes it is re-encoded next time."""
+        state = SharedState()
+        state.update_recent_data('sleep', {'hours': 7})
+        state._encoded.clear()
+        encode = shared_state_module.json_codec.dumps
+        writers = []
+
+        def dumps(value, **kwargs):
+            encoded = encode(value, **kwargs)
+            if value is state._state_data['recent_data'] and not writers:
+                # Another thread updates the section between encoding and caching
+                writer = threading.Thread(
+                    target=state.update_recent_data, args=('sleep', {'hours': 8})
+                )
+                writers.append(writer)
+                writer.start()
+                writer.join(timeout=0.2)
+            return encoded
+
+        monkeypatch.setattr(shared_state_module.json_codec, 'dumps', dumps)
+        state.to_json()
+        writers[0].join(timeout=5)
+
+        encoded = json.loads(state.to_json())
+        assert encoded['recent_data']['sleep']['data'] == {'hours': 8}
+
+
+class TestSharedStateManager:
+    """Test the bounded registry of hydrated states."""
+
+    def test_least_recently_used_state_is_evicted(self, storage):
+        """Beyond the size bound the oldest state is dropped and reloaded on demand."""
+        manager = SharedStateManager(max_states=2, sweep_interval=0)
+        a = manager.create_shared_state('a')
+        b = manager.create_shared_state('b')
+        manager.get_shared_state(a.state_id)
+        manager.create_shared_state('c')
+
+        assert manager.get_shared_state(a.state_id) is a
+        reloaded = manager.get_shared_state(b.state_id)
+        assert reloaded is not b
+        assert reloaded.get_user_profile().user_id == 'b'
+
+    def test_states_in_a_batch_are_not_evicted(self, storage):
+        """A state with an open batch stays registered past the size bound."""
+        manager = SharedStateManager(max_states=1, sweep_interval=0)
+        busy = manager.create_shared_state('busy')
+        with busy.batch():
+            manager.create_shared_state('other')
+            assert manager.get_shared_state(busy.state_id) is busy
+
+    def test_idle_states_are_swept(self, storage):
+        """States not accessed within the idle TTL are evicted by a sweep."""
+        manager = SharedStateManager(idle_ttl=0.05, sweep_interval=0)
+        state = manager.create_shared_state('idle')
+        time.sleep(0.1)
+
+        assert manager.cleanup_expired_states() == 1
+        assert manager.get_stats()['states'] == 0
+        assert manager.get_stats()['bytes'] == 0
+        assert manager.get_shared_state(state.state_id).get_user_profile().user_id == 'idle'
+
+    def test_byte_budget_evicts_and_is_reported(self, storage):
+        """The approximate memory footprint is tracked and bounded."""
+        manager = SharedStateManager(sweep_interval=0)
+        first = manager.create_shared_state('a')
+        per_state = manager.get_stats()['bytes']
+        manager.max_bytes = per_state * 2 + per_state // 2
+        manager.create_shared_state('b')
+        manager.create_shared_state('c')
+
+        stats = manager.get_stats()
+        assert stats['states'] == 2
+        assert stats['evictions'] == 1
+        assert 0 < stats['bytes'] <= manager.max_bytes
+        assert first.state_id not in manager._active_states
+
+    def test_size_estimate_leaves_encoding_cache_alone(self, storage):
+        """The sweeper's measurement must not cache encodings behind a writer's back."""
+        manager = SharedStateManager(sweep_interval=0)
+        state = manager.create_shared_state('a')
+        state._set(('recent_data', 'sleep'), {'hours': 7})
+
+        manager.cleanup_expired_states()
+
+        assert 'recent_data' not in state._encoded
+        assert manager.get_stats()['bytes'] == len(state.to_json().encode('utf-8'))
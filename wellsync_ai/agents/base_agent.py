@@ -6,20 +6,41 @@ with wellness-specific functionality, memory integration, and
 domain constraint handling.
 """
 
+import asyncio
 import json
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple
 from abc import ABC, abstractmethod
 
 from swarms import Agent
 from swarms import LiteLLM
 
+from wellsync_ai.utils import json_codec
 from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.llm_scheduler import LLMPriority, get_llm_scheduler, estimate_tokens
+from wellsync_ai.utils.fingerprint import FingerprintField, build_fingerprint
+from wellsync_ai.utils.prompt_budget import MIN_SECTION_TOKENS, compact_json, truncate_to_tokens
 from wellsync_ai.data.database import get_database_manager
 from wellsync_ai.data.redis_client import get_redis_manager
 
 
+# Shared executor for fire-and-forget memory writes from the async agent path
+_side_effect_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="agent-memory")
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Extract a Retry-After hint (seconds) from a provider rate-limit error."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        return float(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
 class MemoryStore:
     """Memory management for wellness agents."""
     
@@ -81,6 +102,10 @@ class MemoryStore:
             self.working_memory = redis_memory
         return self.working_memory
     
+    def forget_working_memory(self) -> None:
+        """Drop the in-process copy of working memory, leaving the Redis copy."""
+        self.working_memory = {}
+    
     def clear_working_memory(self) -> bool:
         """Clear working memory."""
         self.working_memory = {}
@@ -101,6 +126,16 @@ class WellnessAgent(Agent, ABC):
     - Structured communication protocols
     """
     
+    # Admission priority for this agent's LLM calls (see LLMScheduler)
+    llm_priority = LLMPriority.PLAN
+    
+    # Inputs that affect this agent's proposal, used for cache fingerprints.
+    # None means the proposal is only cached per user on the full inputs.
+    cache_fingerprint_fields: Optional[Tuple[FingerprintField, ...]] = None
+    
+    # Every domain prompt includes the user's recent plans
+    _common_fingerprint_fields = (FingerprintField('shared_state.historical_context'),)
+    
     def __init__(
         self,
         agent_name: str,
@@ -157,7 +192,7 @@ class WellnessAgent(Agent, ABC):
             saved_state_path=f"data/agent_states/{agent_name}_state.json",
             user_name="wellsync_system",
             retry_attempts=config.agent_retry_attempts,
-            context_length=200000,
+            context_length=config.agent_context_length,
             **kwargs
         )
         
@@ -172,6 +207,7 @@ class WellnessAgent(Agent, ABC):
         
         self.domain_constraints = {}
         self.session_id = None
+        self._pending_side_effects: set = set()
         
         # Initialize working memory
         self.memory.update_working_memory({
@@ -223,23 +259,14 @@ class WellnessAgent(Agent, ABC):
             Structured proposal with confidence, reasoning, and constraints
         """
         try:
-            # Update domain constraints
-            self.domain_constraints.update(constraints)
-            
-            # Get learning context (fatigue, compliance, etc.)
-            learning_context = {}
-            if user_data.get('user_id'):
-                learning_context = self.learning_manager.get_learning_context(user_data['user_id'])
-            
-            # Build wellness-specific prompt with learning context
-            # We pass learning_context as part of user_data or a separate arg depending on implementation
-            # For backward compatibility, we'll inject it into kwargs-like structure or modify user_data
-            user_data_with_learning = user_data.copy()
-            user_data_with_learning['learning_context'] = learning_context
+            prompt = self._prepare_wellness_prompt(user_data, constraints, shared_state)
             
-            prompt = self.build_wellness_prompt(user_data_with_learning, constraints, shared_state)
-            
-            # Generate response using Swarms Agent
+            # Wait for quota, then generate response using Swarms Agent
+            get_llm_scheduler().acquire_sync(
+                self._config.llm_model,
+                estimate_tokens(self.system_prompt + prompt, self._config.agent_max_tokens),
+                self.llm_priority
+            )
             response = self.run(prompt)
             
             # Parse and validate response
@@ -251,54 +278,252 @@ class WellnessAgent(Agent, ABC):
             return parsed_response
             
         except Exception as e:
-            # Use ErrorManager for standardized handling
-            from wellsync_ai.utils.error_manager import get_error_manager
+            return self._build_error_proposal(e, user_data, constraints)
+    
+    async def aprocess_wellness_request(
+        self, 
+        user_data: Dict[str, Any], 
+        constraints: Dict[str, Any],
+        shared_state: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of process_wellness_request.
+        
+        Calls LiteLLM's async completion directly instead of the blocking
+        Swarms run loop, so no OS thread is held while waiting on the model.
+        Memory writes are handed to a small background executor and do not
+        delay the returned proposal; they carry this request's session id
+        and payload, so a pool check-in that resets the agent cannot
+        redirect them.
+        """
+        try:
+            prompt = await asyncio.to_thread(
+                self._prepare_wellness_prompt, user_data, constraints, shared_state
+            )
             
-            # Context for the error
-            error_context = {
-                'user_id': user_data.get('user_id'),
-                'domain': self.domain,
-                'session_id': self.session_id,
-                'input_constraints': constraints
-            }
+            response = await self._acall_llm(prompt)
+            parsed_response = self.parse_wellness_response(response)
             
-            # Process error
-            error_info = get_error_manager().handle_error(e, f"Agent-{self.agent_name}", error_context)
+            self._schedule_side_effect(
+                self._record_interaction,
+                self.session_id,
+                self._build_interaction(user_data, constraints, parsed_response)
+            )
             
-            # Return standardized error proposal
-            return {
-                'agent_name': self.agent_name,
-                'domain': self.domain,
-                'is_error': True,
-                'error_details': error_info,
-                'error': error_info['message'],
-                'confidence': 0.0,
-                'proposal': None,
-                'timestamp': datetime.now().isoformat(),
-                'reasoning': f"Agent {self.agent_name} encountered an error: {error_info['message']}"
-            }
+            return parsed_response
+            
+        except Exception as e:
+            return await asyncio.to_thread(self._build_error_proposal, e, user_data, constraints)
+    
+    def _prepare_wellness_prompt(
+        self,
+        user_data: Dict[str, Any],
+        constraints: Dict[str, Any],
+        shared_state: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Apply constraints, gather learning context and build the domain prompt."""
+        # Update domain constraints
+        self.domain_constraints.update(constraints)
+        
+        # Get learning context (fatigue, compliance, etc.)
+        learning_context = {}
+        if user_data.get('user_id'):
+            learning_context = self.learning_manager.get_learning_context(user_data['user_id'])
+        
+        # Build wellness-specific prompt with learning context
+        # We pass learning_context as part of user_data or a separate arg depending on implementation
+        # For backward compatibility, we'll inject it into kwargs-like structure or modify user_data
+        user_data_with_learning = user_data.copy()
+        user_data_with_learning['learning_context'] = learning_context
+        
+        return self.build_wellness_prompt(user_data_with_learning, constraints, shared_state)
+    
+    async def _acall_llm(self, prompt: str) -> str:
+        """
+        Call the configured model through litellm.acompletion.
+        
+        Every attempt is admitted by the shared LLMScheduler. On a rate limit
+        the model is put into backoff and the next configured fallback model
+        is tried; once all models are backing off, the scheduler delays the
+        next round instead of failing immediately. Timeouts, connection
+        errors and 5xx responses also move on to the next model, as the
+        Swarms retry loop does on the sync path.
+        """
+        import litellm
+        
+        # Worth retrying on another model (unlike auth or bad-request errors)
+        transient_errors = (
+            litellm.Timeout,
+            litellm.APIConnectionError,
+            litellm.InternalServerError,
+            litellm.ServiceUnavailableError,
+        )
+        scheduler = get_llm_scheduler()
+        models = [self._config.llm_model] + [
+            m for m in self.fallback_models if m != self._config.llm_model
+        ]
+        messages = [
+            {'role': 'system', 'content': self.system_prompt},
+            {'role': 'user', 'content': prompt}
+        ]
+        estimated = estimate_tokens(self.system_prompt + prompt, self._config.agent_max_tokens)
+        
+        last_error: Optional[Exception] = None
+        for _ in range(max(1, self._config.agent_retry_attempts)):
+            for index, model_name in enumerate(models):
+                # Prefer a fallback that is not backing off over waiting on this one
+                if index < len(models) - 1 and scheduler.is_blocked(model_name):
+                    continue
+                
+                await scheduler.acquire(model_name, estimated, self.llm_priority)
+                try:
+                    response = await litellm.acompletion(
+                        model=model_name,
+                        messages=messages,
+                        temperature=self._config.agent_temperature,
+                        max_tokens=self._config.agent_max_tokens,
+                        api_key=self._api_key
+                    )
+                except litellm.RateLimitError as e:
+                    scheduler.report_rate_limited(model_name, _retry_after_seconds(e))
+                    last_error = e
+                    continue
+                except transient_errors as e:
+                    last_error = e
+                    continue
+                
+                scheduler.report_success(model_name)
+                self.current_model_index = index
+                return response.choices[0].message.content or ""
+        
+        raise last_error or RuntimeError("No LLM models configured")
+    
+    def _schedule_side_effect(self, func, *args) -> None:
+        """
+        Run a blocking memory/DB write in the background without awaiting it.
+        
+        Submitted straight to the executor rather than through the event
+        loop, so completion does not depend on the loop that scheduled it
+        (asyncio.run closes it as soon as the workflow returns). Arguments
+        must be plain values, not read back from the agent later.
+        """
+        future = _side_effect_executor.submit(func, *args)
+        self._pending_side_effects.add(future)
+        future.add_done_callback(self._finish_side_effect)
+    
+    def _finish_side_effect(self, future: Future) -> None:
+        self._pending_side_effects.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            import structlog
+            structlog.get_logger().warning(
+                f"Agent {self.agent_name} background memory write failed",
+                error=str(future.exception())
+            )
+    
+    def wait_for_side_effects(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for this agent's background memory writes to finish.
+        
+        Returns:
+            True if none are left pending
+        """
+        pending = list(self._pending_side_effects)
+        if not pending:
+            return True
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+    
+    def _build_error_proposal(
+        self,
+        error: Exception,
+        user_data: Dict[str, Any],
+        constraints: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Log an agent failure and return the standardized error proposal."""
+        # Use ErrorManager for standardized handling
+        from wellsync_ai.utils.error_manager import get_error_manager
+        
+        # Context for the error
+        error_context = {
+            'user_id': user_data.get('user_id'),
+            'domain': self.domain,
+            'session_id': self.session_id,
+            'input_constraints': constraints
+        }
+        
+        # Process error
+        error_info = get_error_manager().handle_error(error, f"Agent-{self.agent_name}", error_context)
+        
+        # Return standardized error proposal
+        return {
+            'agent_name': self.agent_name,
+            'domain': self.domain,
+            'is_error': True,
+            'error_details': error_info,
+            'error': error_info['message'],
+            'confidence': 0.0,
+            'proposal': None,
+            'timestamp': datetime.now().isoformat(),
+            'reasoning': f"Agent {self.agent_name} encountered an error: {error_info['message']}"
+        }
             
+    def cache_fingerprint(
+        self,
+        user_data: Dict[str, Any],
+        constraints: Dict[str, Any],
+        shared_state: Optional[Dict[str, Any]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the canonical cache fingerprint for a request.
+        
+        Returns:
+            (scope, fingerprint). Scope is 'shared' when the declared fields
+            fully describe the proposal, so it can be reused across users,
+            and 'user' when the fingerprint is keyed to user_id.
+        """
+        sources = {
+            'user_profile': user_data,
+            'constraints': constraints,
+            'shared_state': shared_state or {}
+        }
+        
+        if self.cache_fingerprint_fields is None:
+            fields = (FingerprintField('user_profile'), FingerprintField('constraints'))
+            scope = 'user'
+        else:
+            fields = self.cache_fingerprint_fields
+            scope = 'shared' if self._config.agent_cache_share_across_users else 'user'
+        
+        fingerprint = build_fingerprint((*fields, *self._common_fingerprint_fields), sources)
+        fingerprint['domain'] = self.domain
+        if scope == 'user':
+            fingerprint['user_id'] = user_data.get('user_id')
+        return scope, fingerprint
+    
     def _format_historical_context(self, history: List[Dict[str, Any]]) -> str:
-        """Format historical wellness plans for the prompt."""
+        """Format historical wellness plans for the prompt, within AGENT_HISTORY_MAX_TOKENS."""
         if not history:
             return "No previous wellness plans found for this user."
             
         formatted = "### USER HISTORY (Recent Plans & Feedback):\n"
+        # Split the budget evenly so older plans are not crowded out by the first
+        per_plan_tokens = max(MIN_SECTION_TOKENS, self._config.agent_history_max_tokens // len(history))
         for i, entry in enumerate(history, 1):
             timestamp = entry.get('timestamp', 'Unknown date')
             plan = entry.get('plan_data', {})
             confidence = entry.get('confidence', 'N/A')
             
-            # Try to extract a summary or the whole plan
-            summary = ""
+            if isinstance(plan, str):
+                try:
+                    plan = json_codec.loads(plan)
+                except ValueError:
+                    pass
+            
+            # Prefer this agent's own domain within a unified plan
             if isinstance(plan, dict):
-                # If it's a domain-specific proposal within a unified plan
-                if self.domain in plan:
-                    summary = json.dumps(plan[self.domain], indent=2)
-                else:
-                    summary = json.dumps(plan, indent=2)[:500] + "..."
+                summary = compact_json(plan.get(self.domain, plan), max_tokens=per_plan_tokens)
             else:
-                summary = str(plan)[:500] + "..."
+                summary = truncate_to_tokens(str(plan), per_plan_tokens)
                 
             formatted += f"\n--- Plan {i} ({timestamp}) ---\n"
             formatted += f"Confidence: {confidence}\n"
@@ -410,22 +635,33 @@ class WellnessAgent(Agent, ABC):
         response: Dict[str, Any]
     ) -> None:
         """Store the interaction in agent memory."""
-        interaction_data = {
+        self._record_interaction(self.session_id, self._build_interaction(user_data, constraints, response))
+    
+    def _build_interaction(
+        self,
+        user_data: Dict[str, Any],
+        constraints: Dict[str, Any],
+        response: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Snapshot one request/response pair for agent memory."""
+        return {
             'interaction_type': 'wellness_request',
-            'user_data': user_data,
-            'constraints': constraints,
-            'agent_response': response,
+            'user_data': dict(user_data),
+            'constraints': dict(constraints),
+            'agent_response': dict(response),
             'timestamp': datetime.now().isoformat()
         }
-        
-        if self.session_id:
-            self.memory.store_episodic_memory(self.session_id, interaction_data)
+    
+    def _record_interaction(self, session_id: Optional[str], interaction_data: Dict[str, Any]) -> None:
+        """Write an interaction snapshot to episodic and working memory."""
+        if session_id:
+            self.memory.store_episodic_memory(session_id, interaction_data)
         
         # Update working memory with latest interaction
         self.memory.update_working_memory({
             'last_interaction': interaction_data,
-            'last_response_confidence': response.get('confidence', 0.0),
-            'active_constraints': constraints
+            'last_response_confidence': interaction_data['agent_response'].get('confidence', 0.0),
+            'active_constraints': interaction_data['constraints']
         })
     
     def update_domain_knowledge(self, knowledge_type: str, data: Dict[str, Any]) -> None:
@@ -453,10 +689,23 @@ class WellnessAgent(Agent, ABC):
             'health_check_timestamp': datetime.now().isoformat()
         }
     
-    def reset_agent_state(self) -> None:
-        """Reset agent to clean state."""
+    def reset_state(self) -> None:
+        """
+        Drop per-request state held on this instance.
+        
+        Called by the AgentPool on checkout and check-in so a pooled agent
+        never carries one user's trackers into another user's request.
+        Subclasses extend it for their own per-user attributes. Persisted
+        memory (episodic/semantic rows, the Redis working memory copy) is
+        left alone.
+        """
         self.session_id = None
         self.domain_constraints = {}
+        self.memory.forget_working_memory()
+    
+    def reset_agent_state(self) -> None:
+        """Reset agent to clean state."""
+        self.reset_state()
         self.memory.clear_working_memory()
         
         # Log reset event
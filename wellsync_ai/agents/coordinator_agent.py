@@ -6,13 +6,13 @@ proposal collection and validation logic, and weighted constraint
 satisfaction problem solving for multi-objective optimization.
 """
 
-import json
 import math
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
 from wellsync_ai.agents.base_agent import WellnessAgent
 from wellsync_ai.data.shared_state import AgentProposal
 from wellsync_ai.agents.recovery_prioritization import (
@@ -192,6 +192,11 @@ CRITICAL RULES:
         self.recovery_priority_multiplier = 2.0  # Extra weight for recovery constraints
         self.sustainability_factor = 0.8  # Preference for sustainable vs. aggressive plans
     
+    def reset_state(self) -> None:
+        """Drop per-request state, including the conflict resolution history."""
+        super().reset_state()
+        self.conflict_resolution_history = []
+    
     def build_wellness_prompt(
         self, 
         user_data: Dict[str, Any], 
@@ -207,33 +212,50 @@ CRITICAL RULES:
         conflicts_detected = self._detect_conflicts(agent_proposals, constraints)
         constraint_analysis = self._analyze_constraints(agent_proposals, constraints)
         
-        # Summarize proposals to fit within context limits
+        # Summarize proposals to fit within context limits; together they may use
+        # half the prompt budget, split evenly so one verbose proposal cannot
+        # crowd out the others
         summarized_proposals = self._summarize_proposals(agent_proposals)
+        proposal_tokens = max(
+            FIELD_MAX_TOKENS,
+            self._config.agent_prompt_max_tokens // 2 // max(1, len(summarized_proposals))
+        )
+        proposals_text = "\n".join(
+            f"- {agent}: {compact_json(proposal, proposal_tokens)}"
+            for agent, proposal in summarized_proposals.items()
+        )
         
-        # Build comprehensive coordination prompt
-        prompt = f"""
-COORDINATION REQUEST
-
+        # Build comprehensive coordination prompt within the token budget
+        prompt = PromptBuilder()
+        prompt.add("COORDINATION REQUEST", PromptPriority.REQUIRED)
+        prompt.add(f"""
 AGENT PROPOSALS TO COORDINATE:
-{json.dumps(summarized_proposals, indent=2)}
-
+{proposals_text}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 USER CONSTRAINTS:
-{json.dumps(constraints, indent=2)}
-
+{compact_json(constraints)}
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 CONFLICTS DETECTED:
-{json.dumps([conflict.to_dict() for conflict in conflicts_detected], indent=2)}
-
+{compact_json([conflict.to_dict() for conflict in conflicts_detected])}
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 CONSTRAINT ANALYSIS:
-{json.dumps(constraint_analysis, indent=2)}
-
+{compact_json(constraint_analysis, FIELD_MAX_TOKENS)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 OPTIMIZATION CONTEXT:
 - Total agents proposing: {len(agent_proposals)}
 - Hard constraints count: {len([c for c in constraint_analysis.get('constraints', []) if c.get('type') == 'hard'])}
 - Soft constraints count: {len([c for c in constraint_analysis.get('constraints', []) if c.get('type') == 'soft'])}
 - Recovery priority active: {self._is_recovery_priority_active(agent_proposals)}
-
-{self._format_historical_context(shared_state.get('historical_context', []) if shared_state else [])}
-
+""", PromptPriority.MEDIUM)
+        prompt.add(
+            self._format_historical_context(shared_state.get('historical_context', []) if shared_state else []),
+            PromptPriority.LOW
+        )
+        prompt.add("""
 COORDINATION TASK:
 Generate a unified wellness plan that resolves all detected conflicts while:
 1. Respecting the constraint hierarchy (safety > hard > soft > preferences)
@@ -244,9 +266,9 @@ Generate a unified wellness plan that resolves all detected conflicts while:
 
 Apply multi-objective optimization to balance competing demands.
 Explain your reasoning for conflict resolution strategies and trade-off decisions.
-"""
+""", PromptPriority.REQUIRED)
         
-        return prompt
+        return prompt.render()
 
     def _summarize_proposals(self, agent_proposals: Dict[str, Any]) -> Dict[str, Any]:
         """Summarize agent proposals to reduce token usage."""
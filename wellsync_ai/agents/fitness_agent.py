@@ -6,12 +6,13 @@ training load calculation, overtraining detection logic, and
 constraint handling for time and equipment limitations.
 """
 
-import json
 import math
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.fingerprint import FingerprintField
 from wellsync_ai.data.database import get_database_manager
 
 
@@ -23,6 +24,20 @@ class FitnessAgent(WellnessAgent):
     handle time and equipment constraints, and coordinate energy
     demands with other wellness domains.
     """
+
+    # Inputs read by build_wellness_prompt and its recovery/risk helpers
+    cache_fingerprint_fields = (
+        FingerprintField('user_profile.fitness_level'),
+        FingerprintField('user_profile.goals.fitness'),
+        FingerprintField('user_profile.fitness_history'),
+        FingerprintField('user_profile.wellness_scores'),
+        FingerprintField('user_profile.recent_data.sleep'),
+        FingerprintField('user_profile.hrv_data'),
+        FingerprintField('user_profile.constraints.equipment', unordered=True),
+        FingerprintField('constraints.time_available'),
+        FingerprintField('constraints.equipment', unordered=True),
+        FingerprintField('shared_state.agent_proposals.SleepAgent'),
+    )
     
     def __init__(self, confidence_threshold: float = 0.7):
         """Initialize FitnessAgent with domain-specific configuration."""
@@ -93,6 +108,12 @@ CRITICAL: Never recommend exercises that require unavailable equipment. Always p
         self.overtraining_threshold = 80  # Training load threshold for overtraining risk
         self.deload_threshold = 0.20  # 20% increase triggers deload consideration
     
+    def reset_state(self) -> None:
+        """Drop per-request state, including the user's training load trackers."""
+        super().reset_state()
+        self.training_load_history = []
+        self.overtraining_indicators = {}
+    
     def build_wellness_prompt(
         self, 
         user_data: Dict[str, Any], 
@@ -118,30 +139,36 @@ CRITICAL: Never recommend exercises that require unavailable equipment. Always p
         current_training_load = self._calculate_training_load(fitness_history)
         overtraining_risk = self._assess_overtraining_risk(user_data, current_training_load)
         
-        # Build comprehensive prompt
-        prompt = f"""
-WORKOUT PLANNING REQUEST
-
+        # Build comprehensive prompt within the token budget
+        prompt = PromptBuilder()
+        prompt.add("WORKOUT PLANNING REQUEST", PromptPriority.REQUIRED)
+        prompt.add(f"""
 USER PROFILE:
 - Current fitness level: {current_fitness_level}
-- Fitness goals: {json.dumps(goals, indent=2)}
-- Recent workout history: {json.dumps(fitness_history, indent=2)}
-
+- Fitness goals: {compact_json(goals)}
+- Recent workout history: {compact_json(fitness_history, FIELD_MAX_TOKENS)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 CONSTRAINTS TO RESPECT:
-- Time available: {json.dumps(time_constraints, indent=2)}
+- Time available: {compact_json(time_constraints)}
 - Equipment available: {equipment_available}
-- Recovery constraints: {json.dumps(recovery_constraints, indent=2)}
-
+- Recovery constraints: {compact_json(recovery_constraints)}
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 CURRENT TRAINING METRICS:
 - Training load score: {current_training_load}
 - Overtraining risk: {overtraining_risk}
 - Training load history: {self.training_load_history[-7:] if self.training_load_history else []}
-
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 RECOVERY SIGNALS:
 {self._format_recovery_signals(user_data, shared_state)}
-
-{self._format_historical_context(shared_state.get('historical_context', []) if shared_state else [])}
-
+""", PromptPriority.MEDIUM)
+        prompt.add(
+            self._format_historical_context(shared_state.get('historical_context', []) if shared_state else []),
+            PromptPriority.LOW
+        )
+        prompt.add("""
 TASK: Design a sustainable workout plan that:
 1. Respects all time and equipment constraints
 2. Progresses toward fitness goals appropriately
@@ -151,9 +178,9 @@ TASK: Design a sustainable workout plan that:
 
 Consider the user's training history, current recovery status, and constraint limitations.
 Explain your reasoning for intensity choices, exercise selection, and progression strategy.
-"""
+""", PromptPriority.REQUIRED)
         
-        return prompt
+        return prompt.render()
     
     def _calculate_training_load(self, fitness_history: Dict[str, Any]) -> float:
         """
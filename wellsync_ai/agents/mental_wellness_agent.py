@@ -6,12 +6,13 @@ adherence pattern monitoring, cognitive load assessment, and
 plan complexity adjustment recommendations.
 """
 
-import json
 import math
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.fingerprint import FingerprintField
 from wellsync_ai.data.database import get_database_manager
 
 
@@ -23,6 +24,18 @@ class MentalWellnessAgent(WellnessAgent):
     detecting decision fatigue, and adjusting plan complexity during high-stress
     periods to maintain long-term engagement and sustainable wellness habits.
     """
+
+    # Inputs read by build_wellness_prompt and its adherence/stress helpers
+    cache_fingerprint_fields = (
+        FingerprintField('user_profile.wellness_history'),
+        FingerprintField('user_profile.stress_indicators'),
+        FingerprintField('user_profile.life_context'),
+        FingerprintField('user_profile.mental_health'),
+        FingerprintField('constraints.time_available'),
+        FingerprintField('constraints.current_stressors', unordered=True),
+        FingerprintField('constraints.support_systems'),
+        FingerprintField('shared_state.agent_proposals'),
+    )
     
     def __init__(self, confidence_threshold: float = 0.7):
         """Initialize MentalWellnessAgent with domain-specific configuration."""
@@ -128,6 +141,14 @@ CRITICAL: Always prioritize mental health and sustainable motivation over short-
         self.preference_fatigue_window = 21  # Days to check for repeated patterns
         self.variety_threshold = 0.3  # Minimum variety ratio to avoid fatigue
     
+    def reset_state(self) -> None:
+        """Drop per-request state, including the user's adherence and stress trackers."""
+        super().reset_state()
+        self.adherence_history = []
+        self.motivation_indicators = {}
+        self.stress_patterns = {}
+        self.cognitive_load_metrics = {}
+    
     def build_wellness_prompt(
         self, 
         user_data: Dict[str, Any], 
@@ -155,42 +176,52 @@ CRITICAL: Always prioritize mental health and sustainable motivation over short-
         cognitive_load = self._calculate_cognitive_load(agent_proposals, user_data)
         stress_analysis = self._analyze_stress_patterns(stress_indicators, life_context)
         
-        # Build comprehensive prompt
-        prompt = f"""
-MENTAL WELLNESS AND MOTIVATION ASSESSMENT REQUEST
-
+        # Build comprehensive prompt within the token budget
+        prompt = PromptBuilder()
+        prompt.add("MENTAL WELLNESS AND MOTIVATION ASSESSMENT REQUEST", PromptPriority.REQUIRED)
+        prompt.add(f"""
 USER PROFILE:
-- Current life context: {json.dumps(life_context, indent=2)}
-- Mental health baseline: {json.dumps(mental_health_data, indent=2)}
-- Stress indicators: {json.dumps(stress_indicators, indent=2)}
-
+- Current life context: {compact_json(life_context)}
+- Mental health baseline: {compact_json(mental_health_data)}
+- Stress indicators: {compact_json(stress_indicators)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ADHERENCE ANALYSIS:
-{json.dumps(adherence_analysis, indent=2)}
-
+{compact_json(adherence_analysis)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 MOTIVATION ASSESSMENT:
-{json.dumps(motivation_assessment, indent=2)}
-
+{compact_json(motivation_assessment)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 COGNITIVE LOAD ANALYSIS:
-{json.dumps(cognitive_load, indent=2)}
-
+{compact_json(cognitive_load)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 STRESS PATTERN ANALYSIS:
-{json.dumps(stress_analysis, indent=2)}
-
+{compact_json(stress_analysis)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 CURRENT PLAN COMPLEXITY:
-{json.dumps(current_plan_complexity, indent=2)}
-
-{self._format_historical_context(shared_state.get('historical_context', []) if shared_state else [])}
-
+{compact_json(current_plan_complexity)}
+""", PromptPriority.MEDIUM)
+        prompt.add(
+            self._format_historical_context(shared_state.get('historical_context', []) if shared_state else []),
+            PromptPriority.LOW
+        )
+        prompt.add(f"""
 OTHER AGENT PROPOSALS:
-- Fitness Agent: {json.dumps(agent_proposals.get('FitnessAgent', {}), indent=2)}
-- Nutrition Agent: {json.dumps(agent_proposals.get('NutritionAgent', {}), indent=2)}
-- Sleep Agent: {json.dumps(agent_proposals.get('SleepAgent', {}), indent=2)}
-
+- Fitness Agent: {compact_json(agent_proposals.get('FitnessAgent', {}), FIELD_MAX_TOKENS)}
+- Nutrition Agent: {compact_json(agent_proposals.get('NutritionAgent', {}), FIELD_MAX_TOKENS)}
+- Sleep Agent: {compact_json(agent_proposals.get('SleepAgent', {}), FIELD_MAX_TOKENS)}
+""", PromptPriority.LOW)
+        prompt.add(f"""
 CONSTRAINTS TO CONSIDER:
 - Time availability: {constraints.get('time_available', {})}
 - Life stressors: {constraints.get('current_stressors', [])}
 - Support systems: {constraints.get('support_systems', {})}
-
+""", PromptPriority.REQUIRED)
+        prompt.add("""
 TASK: Optimize mental wellness and motivation by:
 1. Assessing current motivation level and adherence trends
 2. Evaluating cognitive load from all wellness recommendations
@@ -202,9 +233,9 @@ TASK: Optimize mental wellness and motivation by:
 Consider the user's current stress level, life context, and cognitive capacity.
 Balance wellness goals with mental health and sustainable motivation.
 Explain your reasoning for complexity adjustments and motivation strategies.
-"""
+""", PromptPriority.REQUIRED)
         
-        return prompt
+        return prompt.render()
     
     def _analyze_adherence_patterns(self, wellness_history: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -6,12 +6,13 @@ budget constraint handling, food substitution algorithms, and
 nutrient adequacy validation and meal timing optimization.
 """
 
-import json
 import math
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.fingerprint import FingerprintField
 from wellsync_ai.data.database import get_database_manager
 
 
@@ -23,6 +24,21 @@ class NutritionAgent(WellnessAgent):
     within budget constraints, handle food availability and dietary
     restrictions, and coordinate energy demands with fitness goals.
     """
+
+    # Inputs read by build_wellness_prompt; body metrics are bucketed since
+    # they only feed coarse calorie and protein estimates
+    cache_fingerprint_fields = (
+        FingerprintField('user_profile.dietary_preferences'),
+        FingerprintField('user_profile.goals.nutrition'),
+        FingerprintField('user_profile.nutrition_history'),
+        FingerprintField('user_profile.weight_kg', bucket=2.5),
+        FingerprintField('user_profile.height_cm', bucket=5),
+        FingerprintField('user_profile.age', bucket=5),
+        FingerprintField('user_profile.sex'),
+        FingerprintField('constraints.budget'),
+        FingerprintField('constraints.meal_prep_time'),
+        FingerprintField('shared_state.agent_proposals.FitnessAgent'),
+    )
     
     def __init__(self, confidence_threshold: float = 0.7):
         """Initialize NutritionAgent with domain-specific configuration."""
@@ -134,35 +150,43 @@ CRITICAL: Never exceed budget constraints. Always provide substitutions for unav
         nutritional_needs = self._calculate_nutritional_needs(user_data, fitness_demands)
         budget_analysis = self._analyze_budget_constraints(budget_constraints, nutritional_needs)
         
-        # Build comprehensive prompt
-        prompt = f"""
-MEAL PLANNING REQUEST
-
+        # Build comprehensive prompt within the token budget
+        prompt = PromptBuilder()
+        prompt.add("MEAL PLANNING REQUEST", PromptPriority.REQUIRED)
+        prompt.add(f"""
 USER PROFILE:
-- Dietary preferences: {json.dumps(dietary_preferences, indent=2)}
-- Nutrition goals: {json.dumps(goals, indent=2)}
-- Recent nutrition history: {json.dumps(nutrition_history, indent=2)}
-
+- Dietary preferences: {compact_json(dietary_preferences)}
+- Nutrition goals: {compact_json(goals)}
+- Recent nutrition history: {compact_json(nutrition_history, FIELD_MAX_TOKENS)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 CONSTRAINTS TO RESPECT:
-- Budget available: {json.dumps(budget_constraints, indent=2)}
-- Meal prep time: {json.dumps(time_constraints, indent=2)}
+- Budget available: {compact_json(budget_constraints)}
+- Meal prep time: {compact_json(time_constraints)}
 - Dietary restrictions: {dietary_preferences.get('restrictions', [])}
 - Food allergies: {dietary_preferences.get('allergies', [])}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 NUTRITIONAL REQUIREMENTS:
-{json.dumps(nutritional_needs, indent=2)}
-
+{compact_json(nutritional_needs)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 FITNESS COORDINATION:
-{json.dumps(fitness_demands, indent=2)}
-
+{compact_json(fitness_demands, FIELD_MAX_TOKENS)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 BUDGET ANALYSIS:
-{json.dumps(budget_analysis, indent=2)}
-
+{compact_json(budget_analysis)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 FOOD AVAILABILITY:
 {self._get_seasonal_availability_info()}
-
-{self._format_historical_context(shared_state.get('historical_context', []) if shared_state else [])}
-
+""", PromptPriority.LOW)
+        prompt.add(
+            self._format_historical_context(shared_state.get('historical_context', []) if shared_state else []),
+            PromptPriority.LOW
+        )
+        prompt.add("""
 TASK: Design a nutritionally adequate meal plan that:
 1. Meets all nutritional requirements within budget constraints
 2. Respects dietary preferences and restrictions
@@ -173,9 +197,9 @@ TASK: Design a nutritionally adequate meal plan that:
 
 Consider seasonal food availability, bulk purchasing opportunities, and meal prep efficiency.
 Explain your reasoning for food choices, portion sizes, and meal timing decisions.
-"""
+""", PromptPriority.REQUIRED)
         
-        return prompt
+        return prompt.render()
     
     def _calculate_nutritional_needs(self, user_data: Dict[str, Any], fitness_demands: Dict[str, Any]) -> Dict[str, Any]:
         """
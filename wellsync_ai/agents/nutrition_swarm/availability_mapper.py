@@ -5,11 +5,12 @@ Converts real-world food availability into feasible meal options.
 Handles hostel mess menus, cafeteria options, and local availability.
 """
 
-import json
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.llm_scheduler import LLMPriority
 
 
 class AvailabilityMapper(WellnessAgent):
@@ -23,6 +24,8 @@ class AvailabilityMapper(WellnessAgent):
     - Cooking access considerations
     """
     
+    llm_priority = LLMPriority.SWARM_WORKER
+    
     SYSTEM_PROMPT = """You are an Availability Mapper for a nutrition planning system.
 
 Your role is to convert real-world food availability into actionable meal options.
@@ -152,29 +155,34 @@ You ONLY suggest meals that are actually feasible given the user's access constr
         current_hour = datetime.now().hour
         upcoming_meal = self._get_upcoming_meal(current_hour)
         
-        prompt = f"""
+        prompt = PromptBuilder()
+        prompt.add(f"""
 ## User's Food Access Context
 - Location Type: {location_type}
 - Has Kitchen Access: {cooking_access}
 - Available Cooking Time: {cooking_time} minutes
 - Current Time: {datetime.now().strftime('%H:%M')}
 - Next Meal: {upcoming_meal}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 ## Today's Available Options
 ### Mess/Cafeteria Menu (if applicable):
-{json.dumps(todays_menu, indent=2) if todays_menu else "Not provided - use typical options for " + location_type}
+{compact_json(todays_menu, FIELD_MAX_TOKENS) if todays_menu else "Not provided - use typical options for " + location_type}
 
 ### Nearby Food Sources:
-{json.dumps(nearby_options, indent=2) if nearby_options else "Standard options for " + location_type + " setting"}
-
+{compact_json(nearby_options, FIELD_MAX_TOKENS) if nearby_options else "Standard options for " + location_type + " setting"}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ## User Constraints
 - Dietary Restrictions: {user_data.get('dietary_restrictions', [])}
 - Budget per Meal: ₹{constraints.get('meal_budget', 100)}
 - Time Constraints: {constraints.get('time_constraints', 'flexible')}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 ## Previous Meals Today (avoid repetition):
-{json.dumps(shared_state.get('meals_today', []) if shared_state else [], indent=2)}
-
+{compact_json(shared_state.get('meals_today', []) if shared_state else [], FIELD_MAX_TOKENS)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 ## Task
 Map the available food options and generate feasible meal candidates for {upcoming_meal}.
 For each meal, consider:
@@ -185,8 +193,8 @@ For each meal, consider:
 5. Avoid items eaten recently
 
 Respond with strict JSON format as specified in your system prompt.
-"""
-        return prompt
+""", PromptPriority.REQUIRED)
+        return prompt.render()
 
     def _get_upcoming_meal(self, hour: int) -> str:
         """Determine the upcoming meal based on time of day."""
@@ -5,11 +5,12 @@ Computes budget utilization, cost-per-nutrient heuristics,
 and produces constraint feasibility reports with recommended substitutions.
 """
 
-import json
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.llm_scheduler import LLMPriority
 
 
 class ConstraintBudgetAnalyst(WellnessAgent):
@@ -23,6 +24,8 @@ class ConstraintBudgetAnalyst(WellnessAgent):
     - Recommends substitutions for budget optimization
     """
     
+    llm_priority = LLMPriority.SWARM_WORKER
+    
     SYSTEM_PROMPT = """You are a Budget & Constraint Analyst for a nutrition planning system.
 
 Your role is to analyze financial constraints against nutritional requirements and provide
@@ -144,7 +147,8 @@ actionable budget optimization recommendations.
         # Calculate cost-per-nutrient for available budget
         remaining = daily_budget - spent_today
         
-        prompt = f"""
+        prompt = PromptBuilder()
+        prompt.add(f"""
 ## Current Budget State
 - Daily Budget: ₹{daily_budget}
 - Spent Today: ₹{spent_today}
@@ -160,10 +164,12 @@ actionable budget optimization recommendations.
 ## User Preferences
 - Dietary Restrictions: {user_data.get('dietary_restrictions', [])}
 - Food Allergies: {user_data.get('allergies', [])}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 ## Available Food Options (if provided)
-{json.dumps(shared_state.get('available_foods', []) if shared_state else [], indent=2)}
-
+{compact_json(shared_state.get('available_foods', []) if shared_state else [], FIELD_MAX_TOKENS)}
+""", PromptPriority.MEDIUM)
+        prompt.add("""
 ## Task
 Analyze the budget constraints and provide:
 1. Budget utilization analysis
@@ -173,8 +179,8 @@ Analyze the budget constraints and provide:
 5. Overall feasibility score (0.0 to 1.0) for meeting nutritional goals within budget
 
 Respond with strict JSON format as specified in your system prompt.
-"""
-        return prompt
+""", PromptPriority.REQUIRED)
+        return prompt.render()
 
     def calculate_cost_per_protein(self, food_item: str) -> float:
         """Calculate cost per gram of protein for a food item."""
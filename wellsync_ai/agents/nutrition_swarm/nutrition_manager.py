@@ -5,11 +5,11 @@ The manager agent that coordinates all nutrition worker agents,
 makes final meal decisions, and handles failure recovery policies.
 """
 
-import json
 import asyncio
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
 from wellsync_ai.agents.base_agent import WellnessAgent
 from wellsync_ai.agents.nutrition_swarm.constraint_budget_analyst import ConstraintBudgetAnalyst
 from wellsync_ai.agents.nutrition_swarm.availability_mapper import AvailabilityMapper
@@ -142,45 +142,51 @@ You coordinate four worker agents and synthesize their analyses into a final mea
         # Get worker analyses (these would be from actual runs)
         worker_reports = shared_state.get('worker_reports', {}) if shared_state else {}
         
-        prompt = f"""
+        prompt = PromptBuilder()
+        prompt.add(f"""
 ## User Context
 - User: {user_data.get('name', 'User')}
 - Goals: {user_data.get('goals', ['general_wellness'])}
 - Activity Level: {user_data.get('activity_level', 'moderate')}
 - Dietary Restrictions: {user_data.get('dietary_restrictions', [])}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 ## Current State
 - Current Time: {datetime.now().strftime('%H:%M')}
 - Budget Remaining: ₹{constraints.get('daily_budget', 500) - self.current_state['budget']['spent_today']}
 - Meals Eaten Today: {len(self.current_state['meals_today'])}
-
+""", PromptPriority.HIGH)
+        # Each worker report is capped on its own so none crowds out the others
+        prompt.add(f"""
 ## Worker Agent Reports
 
 ### Budget Analyst Report:
-{json.dumps(worker_reports.get('budget', {'status': 'awaiting_analysis'}), indent=2)}
+{compact_json(worker_reports.get('budget', {'status': 'awaiting_analysis'}), FIELD_MAX_TOKENS)}
 
 ### Availability Mapper Report:
-{json.dumps(worker_reports.get('availability', {'status': 'awaiting_analysis'}), indent=2)}
+{compact_json(worker_reports.get('availability', {'status': 'awaiting_analysis'}), FIELD_MAX_TOKENS)}
 
 ### Preference Modeler Report:
-{json.dumps(worker_reports.get('preferences', {'status': 'awaiting_analysis'}), indent=2)}
+{compact_json(worker_reports.get('preferences', {'status': 'awaiting_analysis'}), FIELD_MAX_TOKENS)}
 
 ### Timing Advisor Report:
-{json.dumps(worker_reports.get('timing', {'status': 'awaiting_analysis'}), indent=2)}
-
+{compact_json(worker_reports.get('timing', {'status': 'awaiting_analysis'}), FIELD_MAX_TOKENS)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ## Constraints to Honor
 - Daily Budget: ₹{constraints.get('daily_budget', 500)}
 - Protein Target: {constraints.get('protein_target', 100)}g
 - Calorie Range: {constraints.get('calorie_min', 1800)}-{constraints.get('calorie_max', 2200)} kcal
-
+""", PromptPriority.REQUIRED)
+        prompt.add("""
 ## Task
 Synthesize the worker reports and make a final meal decision.
 Consider all constraints, resolve any conflicts, and apply recovery policies if needed.
 Always cite which policy influenced your decision.
 
 Respond with strict JSON format as specified in your system prompt.
-"""
-        return prompt
+""", PromptPriority.REQUIRED)
+        return prompt.render()
 
     async def run_hierarchical_decision(
         self,
@@ -205,7 +211,7 @@ Respond with strict JSON format as specified in your system prompt.
         enriched_state['worker_reports'] = worker_reports
         
         # Step 3: Run manager decision
-        decision = self.process_wellness_request(user_data, constraints, enriched_state)
+        decision = await self.aprocess_wellness_request(user_data, constraints, enriched_state)
         
         # Step 4: Update internal state
         self._update_state(decision)
@@ -220,60 +226,41 @@ Respond with strict JSON format as specified in your system prompt.
         constraints: Dict[str, Any],
         shared_state: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Collect analyses from all worker agents."""
-        
-        reports = {}
-        
-        # Run workers (could be parallel with asyncio.gather in production)
-        try:
-            # Budget Analysis
-            logger.info("Running Budget Analyst")
-            budget_result = await asyncio.to_thread(
-                self.budget_analyst.process_wellness_request,
-                user_data, constraints, shared_state
-            )
-            reports['budget'] = budget_result.get('proposal', budget_result)
-        except Exception as e:
-            logger.error("Budget Analyst failed", error=str(e))
-            reports['budget'] = {'error': str(e), 'confidence': 0}
+        """
+        Collect analyses from all worker agents concurrently.
         
-        try:
-            # Availability Mapping
-            logger.info("Running Availability Mapper")
-            availability_result = await asyncio.to_thread(
-                self.availability_mapper.process_wellness_request,
-                user_data, constraints, shared_state
-            )
-            reports['availability'] = availability_result.get('proposal', availability_result)
-        except Exception as e:
-            logger.error("Availability Mapper failed", error=str(e))
-            reports['availability'] = {'error': str(e), 'confidence': 0}
+        Each worker gets its own deadline; a worker that misses it is
+        reported as awaiting_analysis so the manager can still decide
+        on the partial set of reports.
+        """
+        workers = {
+            'budget': ('Budget Analyst', self.budget_analyst),
+            'availability': ('Availability Mapper', self.availability_mapper),
+            'preferences': ('Preference Modeler', self.preference_modeler),
+            'timing': ('Timing Advisor', self.timing_advisor)
+        }
+        timeout = self._config.swarm_worker_timeout_seconds
         
-        try:
-            # Preference Analysis
-            logger.info("Running Preference Modeler")
-            preference_result = await asyncio.to_thread(
-                self.preference_modeler.process_wellness_request,
-                user_data, constraints, shared_state
-            )
-            reports['preferences'] = preference_result.get('proposal', preference_result)
-        except Exception as e:
-            logger.error("Preference Modeler failed", error=str(e))
-            reports['preferences'] = {'error': str(e), 'confidence': 0}
+        async def run_worker(label: str, worker: WellnessAgent) -> Dict[str, Any]:
+            logger.info(f"Running {label}")
+            try:
+                result = await asyncio.wait_for(
+                    worker.aprocess_wellness_request(user_data, constraints, shared_state),
+                    timeout=timeout
+                )
+                return result.get('proposal', result)
+            except asyncio.TimeoutError:
+                logger.warning(f"{label} missed its deadline", timeout_seconds=timeout)
+                return {'status': 'awaiting_analysis', 'reason': f'timed out after {timeout}s', 'confidence': 0}
+            except Exception as e:
+                logger.error(f"{label} failed", error=str(e))
+                return {'error': str(e), 'confidence': 0}
         
-        try:
-            # Timing Advice
-            logger.info("Running Timing Advisor")
-            timing_result = await asyncio.to_thread(
-                self.timing_advisor.process_wellness_request,
-                user_data, constraints, shared_state
-            )
-            reports['timing'] = timing_result.get('proposal', timing_result)
-        except Exception as e:
-            logger.error("Timing Advisor failed", error=str(e))
-            reports['timing'] = {'error': str(e), 'confidence': 0}
+        results = await asyncio.gather(*(
+            run_worker(label, worker) for label, worker in workers.values()
+        ))
         
-        return reports
+        return dict(zip(workers.keys(), results))
 
     def _update_state(self, decision: Dict[str, Any]) -> None:
         """Update internal state after decision."""
@@ -5,12 +5,13 @@ Tracks food repetition, user rejections, preference drift,
 and outputs penalties, cooldown lists, and safe defaults.
 """
 
-import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from collections import defaultdict
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.llm_scheduler import LLMPriority
 
 
 class PreferenceFatigueModeler(WellnessAgent):
@@ -24,6 +25,8 @@ class PreferenceFatigueModeler(WellnessAgent):
     - Cooldown lists and safe default recommendations
     """
     
+    llm_priority = LLMPriority.SWARM_WORKER
+    
     SYSTEM_PROMPT = """You are a Preference & Fatigue Modeler for a nutrition planning system.
 
 Your role is to track user food preferences, detect fatigue from repetition,
@@ -149,18 +152,22 @@ and maintain cooldown lists to ensure meal variety and user satisfaction.
         # Calculate frequency stats
         frequency = self._calculate_frequency(recent_meals)
         
-        prompt = f"""
+        prompt = PromptBuilder()
+        prompt.add(f"""
 ## User Preference Data
 
 ### Recent Meal History (Last 21 meals):
-{json.dumps(recent_meals, indent=2)}
-
+{compact_json(recent_meals, FIELD_MAX_TOKENS)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ### Frequency Analysis (Last 7 days):
-{json.dumps(frequency, indent=2)}
-
+{compact_json(frequency)}
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ### Rejection History:
-{json.dumps(rejections, indent=2)}
-
+{compact_json(rejections, FIELD_MAX_TOKENS)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 ### Explicit Preferences:
 - Favorites: {favorites}
 - Dislikes: {dislikes}
@@ -171,7 +178,8 @@ and maintain cooldown lists to ensure meal variety and user satisfaction.
 - Variety Preference: {user_data.get('variety_preference', 'moderate')}  # low, moderate, high
 
 ### Today's Date: {datetime.now().strftime('%Y-%m-%d')}
-
+""", PromptPriority.REQUIRED)
+        prompt.add("""
 ## Task
 Analyze the user's food preferences and fatigue levels:
 1. Identify items with high repetition fatigue
@@ -181,8 +189,8 @@ Analyze the user's food preferences and fatigue levels:
 5. Calculate penalty adjustments for meal scoring
 
 Respond with strict JSON format as specified in your system prompt.
-"""
-        return prompt
+""", PromptPriority.REQUIRED)
+        return prompt.render()
 
     def _calculate_frequency(self, meals: List[Dict[str, Any]]) -> Dict[str, int]:
         """Calculate food item frequency from meal history."""
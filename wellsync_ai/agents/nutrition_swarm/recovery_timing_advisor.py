@@ -5,11 +5,12 @@ Uses workload and sleep signals to recommend meal timing
 and digestion load considerations. Stays in wellness scope.
 """
 
-import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.llm_scheduler import LLMPriority
 
 
 class RecoveryTimingAdvisor(WellnessAgent):
@@ -23,6 +24,8 @@ class RecoveryTimingAdvisor(WellnessAgent):
     - Sleep-aware dinner timing
     """
     
+    llm_priority = LLMPriority.SWARM_WORKER
+    
     SYSTEM_PROMPT = """You are a Recovery & Timing Advisor for a nutrition planning system.
 
 Your role is to recommend optimal meal timing and digestion considerations
@@ -147,31 +150,37 @@ based on the user's activity, sleep, and recovery signals.
         # Recovery info from fitness agent
         recovery_status = shared_state.get('recovery_status', 'normal') if shared_state else 'normal'
         
-        prompt = f"""
+        prompt = PromptBuilder()
+        prompt.add(f"""
 ## Current State
 - Current Time: {current_time}
 - Current Energy Level: {current_energy}
 - Recovery Status: {recovery_status}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 ## Activity Schedule
 - Workout Time: {workout_time if workout_time else 'Not scheduled today'}
 - Workout Duration: {workout_duration} minutes
 - Workout Intensity: {workout_intensity}
 - Other Activities: {activity_schedule.get('other_activities', 'None specified')}
-
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ## Sleep Information
 - Usual Bedtime: {bedtime}
 - Usual Wake Time: {wake_time}
 - Last Night Quality: {last_night_quality}
 - Hours Slept: {hours_slept}
-
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 ## Meals Already Eaten Today:
-{json.dumps(shared_state.get('meals_today', []) if shared_state else [], indent=2)}
-
+{compact_json(shared_state.get('meals_today', []) if shared_state else [], FIELD_MAX_TOKENS)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 ## User Preferences
 - Prefers Eating: {user_data.get('eating_speed', 'moderate')}
 - Digestion Sensitivity: {user_data.get('digestion_sensitivity', 'normal')}
-
+""", PromptPriority.MEDIUM)
+        prompt.add("""
 ## Task
 Based on the user's activity, sleep, and current state:
 1. Recommend optimal timing for the next meal
@@ -183,8 +192,8 @@ Based on the user's activity, sleep, and current state:
 REMEMBER: Stay within wellness scope. No medical advice.
 
 Respond with strict JSON format as specified in your system prompt.
-"""
-        return prompt
+""", PromptPriority.REQUIRED)
+        return prompt.render()
 
     def get_optimal_meal_time(
         self,
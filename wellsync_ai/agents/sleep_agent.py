@@ -6,14 +6,18 @@ sleep debt calculation, circadian rhythm optimization, and
 recovery constraint generation for other agents.
 """
 
-import json
 import math
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Tuple
 
 from wellsync_ai.agents.base_agent import WellnessAgent
+from wellsync_ai.utils.prompt_budget import FIELD_MAX_TOKENS, PromptBuilder, PromptPriority, compact_json
+from wellsync_ai.utils.fingerprint import FingerprintField
 from wellsync_ai.data.database import get_database_manager
 
+# Starting nightly sleep need before it is personalized
+DEFAULT_SLEEP_NEED_HOURS = 8.0
+
 
 class SleepAgent(WellnessAgent):
     """
@@ -23,6 +27,18 @@ class SleepAgent(WellnessAgent):
     detecting sleep debt, and providing recovery constraints to other
     wellness domains to prevent overtraining and burnout.
     """
+
+    # Inputs read by build_wellness_prompt and the schedule helpers
+    cache_fingerprint_fields = (
+        FingerprintField('user_profile.sleep_history'),
+        FingerprintField('user_profile.sleep_preferences'),
+        FingerprintField('user_profile.chronotype'),
+        FingerprintField('constraints.work_schedule'),
+        FingerprintField('constraints.sleep_environment'),
+        FingerprintField('constraints.social_schedule'),
+        FingerprintField('shared_state.agent_proposals.FitnessAgent.training_load_score'),
+        FingerprintField('shared_state.recent_data.stress'),
+    )
     
     def __init__(self, confidence_threshold: float = 0.7):
         """Initialize SleepAgent with domain-specific configuration."""
@@ -105,7 +121,7 @@ CRITICAL: Always prioritize recovery over performance goals. Sleep is non-negoti
         self.sleep_debt_history = []
         self.circadian_markers = {}
         self.recovery_indicators = {}
-        self.sleep_need_baseline = 8.0  # Default 8 hours, personalized over time
+        self.sleep_need_baseline = DEFAULT_SLEEP_NEED_HOURS  # Personalized over time
         
         # Sleep debt calculation parameters
         self.max_sleep_debt = 10.0  # Maximum trackable sleep debt (hours)
@@ -118,6 +134,14 @@ CRITICAL: Always prioritize recovery over performance goals. Sleep is non-negoti
         self.light_exposure_window = 60  # Minutes for morning light exposure
         self.melatonin_onset_buffer = 120  # Minutes before natural melatonin onset
     
+    def reset_state(self) -> None:
+        """Drop per-request state, including the user's sleep debt and circadian trackers."""
+        super().reset_state()
+        self.sleep_debt_history = []
+        self.circadian_markers = {}
+        self.recovery_indicators = {}
+        self.sleep_need_baseline = DEFAULT_SLEEP_NEED_HOURS
+    
     def build_wellness_prompt(
         self, 
         user_data: Dict[str, Any], 
@@ -147,38 +171,46 @@ CRITICAL: Always prioritize recovery over performance goals. Sleep is non-negoti
         circadian_alignment = self._assess_circadian_alignment(sleep_history, work_schedule)
         recovery_status = self._assess_recovery_status(sleep_history, fitness_load, stress_indicators)
         
-        # Build comprehensive prompt
-        prompt = f"""
-SLEEP AND RECOVERY ASSESSMENT REQUEST
-
+        # Build comprehensive prompt within the token budget
+        prompt = PromptBuilder()
+        prompt.add("SLEEP AND RECOVERY ASSESSMENT REQUEST", PromptPriority.REQUIRED)
+        prompt.add(f"""
 USER PROFILE:
-- Sleep preferences: {json.dumps(sleep_preferences, indent=2)}
-- Recent sleep history: {json.dumps(sleep_history, indent=2)}
+- Sleep preferences: {compact_json(sleep_preferences)}
+- Recent sleep history: {compact_json(sleep_history, FIELD_MAX_TOKENS)}
 - Individual sleep need: {self.sleep_need_baseline} hours
-
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 CONSTRAINTS TO RESPECT:
-- Work schedule: {json.dumps(work_schedule, indent=2)}
-- Sleep environment: {json.dumps(environmental_constraints, indent=2)}
+- Work schedule: {compact_json(work_schedule)}
+- Sleep environment: {compact_json(environmental_constraints)}
 - Social commitments: {constraints.get('social_schedule', {})}
-
+""", PromptPriority.REQUIRED)
+        prompt.add(f"""
 CURRENT SLEEP METRICS:
 - Sleep debt: {sleep_debt:.1f} hours
 - Circadian alignment: {circadian_alignment}
 - Recovery status: {recovery_status}
 - Sleep debt history: {self.sleep_debt_history[-7:] if self.sleep_debt_history else []}
-
+""", PromptPriority.HIGH)
+        prompt.add(f"""
 FITNESS COORDINATION:
 - Current training load: {fitness_load}
 - Recovery demands: {self._assess_recovery_demands(fitness_load)}
-
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 STRESS INDICATORS:
-{json.dumps(stress_indicators, indent=2)}
-
+{compact_json(stress_indicators)}
+""", PromptPriority.MEDIUM)
+        prompt.add(f"""
 CIRCADIAN MARKERS:
-{json.dumps(self.circadian_markers, indent=2)}
-
-{self._format_historical_context(shared_state.get('historical_context', []) if shared_state else [])}
-
+{compact_json(self.circadian_markers)}
+""", PromptPriority.LOW)
+        prompt.add(
+            self._format_historical_context(shared_state.get('historical_context', []) if shared_state else []),
+            PromptPriority.LOW
+        )
+        prompt.add("""
 TASK: Optimize sleep and recovery by:
 1. Calculating accurate sleep debt and recovery needs
 2. Recommending optimal sleep schedule within constraints
@@ -190,9 +222,9 @@ TASK: Optimize sleep and recovery by:
 Consider work schedule limitations, social commitments, and individual chronotype.
 Prioritize recovery protection while maintaining practical feasibility.
 Explain your reasoning for sleep timing, duration, and constraint decisions.
-"""
+""", PromptPriority.REQUIRED)
         
-        return prompt
+        return prompt.render()
     
     def _calculate_sleep_debt(self, sleep_history: Dict[str, Any]) -> float:
         """
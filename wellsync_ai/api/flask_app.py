@@ -122,6 +122,21 @@ def create_flask_app() -> Flask:
     db_manager = get_database_manager()
     redis_manager = get_redis_manager()
     
+    # Warm up the agent pool so the first plan request doesn't pay agent construction
+    if config.agent_pool_warmup:
+        try:
+            from wellsync_ai.workflows.agent_pool import warm_up_agent_pool
+            warm_up_agent_pool()
+        except Exception as e:
+            logger.warning("Agent pool warm-up failed, agents will be built on demand", error=str(e))
+    
+    # Configure the chat model clients once instead of on every /chat message
+    try:
+        from wellsync_ai.utils.llm import warm_up_chat_clients
+        warm_up_chat_clients()
+    except Exception as e:
+        logger.warning("Chat client warm-up failed, clients will be built on demand", error=str(e))
+    
     # Request context setup
     @app.before_request
     def before_request():
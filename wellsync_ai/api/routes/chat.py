@@ -1,17 +1,46 @@
-from flask import Blueprint, jsonify, g, request
+from flask import Blueprint, Response, jsonify, g, request, stream_with_context
 from datetime import datetime
 import structlog
 from typing import Dict, Any
 
-from wellsync_ai.api.utils import validate_json_request, WellnessAPIError
+from wellsync_ai.api.utils import validate_json_request, format_sse
+from wellsync_ai.utils import json_codec
 from wellsync_ai.utils.chat_context import ChatContext
-from wellsync_ai.utils.llm import GoogleGeminiChat
-from wellsync_ai.utils.llm_config import LLMConfig
+from wellsync_ai.utils.llm import get_chat_client_pool
+from wellsync_ai.utils.plan_digest import get_plan_digest
 # Fallback response imports if needed, but likely handled inside logic
 
 logger = structlog.get_logger()
 chat_bp = Blueprint('chat', __name__)
 
+
+def _build_context_string(user_id: str, context_data: Dict[str, Any], chat_context: ChatContext) -> str:
+    """Build the LLM context: request context, latest plan digest and the conversation so far."""
+    sections = []
+    if context_data:
+        sections.append(f"User Context: {json_codec.dumps(context_data, default=str)}")
+
+    # Cached digest of the latest wellness plan (no DB query on a cache hit)
+    plan = get_plan_digest(user_id)
+    if plan['digest']:
+        sections.append(f"Current wellness plan (from {plan['plan_date']}):\n{plan['digest']}")
+
+    conversation = chat_context.get_context_string()
+    if conversation:
+        sections.append(f"Conversation so far:\n{conversation}")
+    return "\n\n".join(sections)
+
+
+def _fallback_response(message: str) -> str:
+    """Canned reply used when no chat model can answer."""
+    q = message.lower()
+    if any(word in q for word in ['water', 'drink', 'hydration']):
+        return "Stay hydrated! 8 glasses a day."
+    elif any(word in q for word in ['hurt', 'pain']):
+        return "Please consult a doctor for pain."
+    return "I'm having trouble connecting to my brain right now. Please try again."
+
+
 @chat_bp.route('/chat', methods=['POST'])
 @validate_json_request(required_fields=['message', 'user_id'])
 def chat_with_ai(request_data: Dict[str, Any]):
@@ -58,40 +87,10 @@ def chat_with_ai(request_data: Dict[str, Any]):
         # Initialize Chat Context
         chat_context = ChatContext(user_id)
         
-        # 1. Fetch User History from Database (Context Awareness)
-        from wellsync_ai.data.database import get_database_manager
-        db_manager = get_database_manager()
-        
-        # Get recent wellness plans to understand user's current regime
-        recent_plans = db_manager.get_user_history(user_id, limit=1)
-        
-        db_context = {}
-        if recent_plans:
-            latest_plan = recent_plans[0]
-            # safely extract plan details
-            plan_data = latest_plan.get('plan_data', {})
-            if isinstance(plan_data, str):
-                import json
-                try:
-                    plan_data = json.loads(plan_data)
-                except:
-                    pass
-            
-            db_context['latest_wellness_plan'] = plan_data
-            db_context['plan_date'] = latest_plan.get('timestamp')
-            
-            logger.info("Injected database context into chat", user_id=user_id)
-
-        # Merge with request context (request context takes precedence if keys collide, but we nest them)
-        full_context = {
-            "initial_context": context_data,
-            "database_context": db_context
-        }
-
-        # Config
-        config = LLMConfig()
-        # Initialize Gemini Chat
-        chat_agent = GoogleGeminiChat(config)
+        context_str = _build_context_string(user_id, context_data, chat_context)
+
+        # Process-wide Gemini clients with health tracking and model fallback
+        chat_agent = get_chat_client_pool()
         
         # Get response
         # Note: In original code, we had fallback logic. I should replicate it.
@@ -104,8 +103,6 @@ def chat_with_ai(request_data: Dict[str, Any]):
              # I need to verify exact method signature from Step 1324
              # Step 1324: response = chat_agent.generate_response(user_input, context_str)
              
-             # Construct context string
-             context_str = f"User Context: {full_context}"
              response_text = chat_agent.generate_response(message, context_str)
              
         except Exception as e:
@@ -114,13 +111,13 @@ def chat_with_ai(request_data: Dict[str, Any]):
             # I will implement a simplified fallback here or copy the exact one if I viewed it.
             # Step 1324 showed custom fallback logic.
             
-            q = message.lower()
-            if any(word in q for word in ['water', 'drink', 'hydration']):
-                 response_text = "Stay hydrated! 8 glasses a day."
-            elif any(word in q for word in ['hurt', 'pain']):
-                 response_text = "Please consult a doctor for pain."
-            else:
-                 response_text = "I'm having trouble connecting to my brain right now. Please try again."
+            response_text = _fallback_response(message)
+
+        # Record the turn so follow-up messages keep their context (any worker)
+        chat_context.add_messages([
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": response_text}
+        ])
 
         return jsonify({
             'success': True,
@@ -135,3 +132,84 @@ def chat_with_ai(request_data: Dict[str, Any]):
             'success': False,
             'error': str(e)
         }), 500
+
+
+@chat_bp.route('/chat/stream', methods=['POST'])
+@validate_json_request(required_fields=['message', 'user_id'])
+def stream_chat_with_ai(request_data: Dict[str, Any]):
+    """
+    Stream a Chat Response
+    ---
+    tags:
+      - Chat
+    summary: Chat with the AI Wellness Coach, streamed token by token
+    description: |
+      Same as /chat, but the reply is sent as Server-Sent Events while the
+      model generates it. Events:
+      - token: {"text": "..."} for each chunk of the reply
+      - error: {"error": "..."} if the model fails after tokens were sent
+      - done: {"response": "<full reply>", "timestamp": "...", "request_id": "..."}
+      The full reply is saved to the chat history once the stream ends.
+    produces:
+      - text/event-stream
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - message
+            - user_id
+          properties:
+            message:
+              type: string
+            user_id:
+              type: string
+            context:
+              type: object
+    responses:
+      200:
+        description: Event stream of response tokens
+    """
+    user_id = request_data['user_id']
+    message = request_data['message']
+    request_id = g.request_id
+
+    logger.info("Streaming chat request received", user_id=user_id, request_id=request_id)
+
+    chat_context = ChatContext(user_id)
+    context_str = _build_context_string(user_id, request_data.get('context', {}), chat_context)
+
+    def generate():
+        parts = []
+        try:
+            for text in get_chat_client_pool().stream_response(message, context_str):
+                parts.append(text)
+                yield format_sse('token', {'text': text})
+        except Exception as e:
+            logger.error(f"LLM stream fail: {e}", request_id=request_id)
+            if parts:
+                # The client already has a partial reply; another one can't be spliced on
+                yield format_sse('error', {'error': 'Response interrupted'})
+            else:
+                parts.append(_fallback_response(message))
+                yield format_sse('token', {'text': parts[0]})
+
+        response_text = "".join(parts)
+        # Record the finished turn so follow-up messages keep their context (any worker)
+        chat_context.add_messages([
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": response_text}
+        ])
+        yield format_sse('done', {
+            'response': response_text,
+            'timestamp': datetime.now().isoformat(),
+            'request_id': request_id
+        })
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -77,6 +77,11 @@ def submit_feedback(request_data: Dict[str, Any]):
             request_id=g.request_id
         )
         
+        if not accepted:
+            # A rejected plan must not be rebuilt from the same cached proposals
+            from wellsync_ai.workflows.wellness_orchestrator import invalidate_user_proposals
+            invalidate_user_proposals(user_id)
+        
         return jsonify({
             'success': True,
             'feedback_id': feedback_id,
@@ -3,6 +3,9 @@ from datetime import datetime
 import structlog
 from wellsync_ai.data.database import get_database_manager
 from wellsync_ai.data.redis_client import get_redis_manager
+from wellsync_ai.data.shared_state import get_shared_state_manager
+from wellsync_ai.utils.cache_manager import get_cache_manager
+from wellsync_ai.utils.redis_pool import get_pool_stats
 
 logger = structlog.get_logger()
 health_bp = Blueprint('health', __name__)
@@ -91,10 +94,15 @@ def health_check():
             'services': {
                 'database': {
                     'status': 'healthy' if db_status else 'unhealthy',
-                    'type': 'supabase' if db_manager.use_supabase else 'sqlite'
+                    'type': 'supabase' if db_manager.use_supabase else 'sqlite',
+                    'pool': db_manager.get_pool_stats(),
+                    'write_behind': db_manager.get_write_behind_stats()
                 },
                 'redis': 'healthy' if redis_status else 'fallback'
-            }
+            },
+            'cache': get_cache_manager().get_stats(),
+            'redis_pools': get_pool_stats(),
+            'shared_states': get_shared_state_manager().get_stats()
         }
         
         status_code = 200 if health_status['status'] == 'healthy' else 503
@@ -225,6 +233,9 @@ def get_agents_status():
         except ImportError:
             pass  # Swarm not yet fully integrated
         
+        from wellsync_ai.workflows.agent_pool import get_agent_pool
+        from wellsync_ai.utils.llm import get_chat_client_pool
+        
         response_data = {
             'success': True,
             'timestamp': datetime.now().isoformat(),
@@ -232,7 +243,9 @@ def get_agents_status():
             'agents': agents_status,
             'total_agents': len(agents_status),
             'healthy_agents': healthy_count,
-            'swarm_architecture': 'hierarchical'
+            'swarm_architecture': 'hierarchical',
+            'agent_pool': get_agent_pool().get_pool_stats(),
+            'chat_models': get_chat_client_pool().get_stats()
         }
         
         return jsonify(response_data), 200
@@ -1,16 +1,71 @@
-from flask import Blueprint, jsonify, g, request
+from flask import Blueprint, Response, jsonify, g, request, stream_with_context
 from datetime import datetime
-import asyncio
 import structlog
 from typing import Dict, Any
 
-from wellsync_ai.api.utils import validate_json_request, validate_user_data, WellnessAPIError
+from wellsync_ai.api.utils import validate_json_request, validate_user_data, WellnessAPIError, format_sse
 from wellsync_ai.data.database import get_database_manager
+from wellsync_ai.data.redis_client import get_redis_manager
 from wellsync_ai.data.shared_state import create_shared_state, get_shared_state
 
 logger = structlog.get_logger()
 wellness_bp = Blueprint('wellness', __name__)
 
+
+def _is_async_request(request_data: Dict[str, Any]) -> bool:
+    """Job mode is requested with ?async=true or {"async": true} in the body."""
+    if request.args.get('async', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return bool(request_data.get('async', False))
+
+
+def _prepare_plan_state(request_data: Dict[str, Any], endpoint: str):
+    """Create or load the shared state for a plan request and log the request."""
+    # Extract inputs
+    user_profile = request_data['user_profile']
+    constraints = request_data['constraints']
+    recent_data = request_data.get('recent_data', {})
+    goals = request_data.get('goals', {})
+    
+    db_manager = get_database_manager()
+
+    # Create or get shared state
+    state_id = request_data.get('state_id')
+    if state_id:
+        shared_state = get_shared_state(state_id)
+        if not shared_state:
+            raise WellnessAPIError(
+                f"Shared state not found: {state_id}",
+                status_code=404,
+                error_code="STATE_NOT_FOUND"
+            )
+    else:
+        shared_state = create_shared_state(user_profile.get('user_id'))
+    
+    # Update shared state (one commit for the profile and all recent data)
+    with shared_state.batch():
+        shared_state.update_user_profile({
+            **user_profile,
+            'goals': goals,
+            'constraints': constraints
+        })
+        
+        if recent_data:
+            for data_type, data in recent_data.items():
+                shared_state.update_recent_data(data_type, data)
+    
+    # Log request
+    db_manager.log_api_request(
+        endpoint=endpoint,
+        method='POST',
+        request_data=request_data,
+        request_id=g.request_id,
+        user_id=user_profile.get('user_id', 'anonymous')
+    )
+    
+    return shared_state
+
+
 @wellness_bp.route('/wellness-plan', methods=['POST'])
 @validate_json_request(required_fields=['user_profile', 'constraints'])
 @validate_user_data
@@ -47,9 +102,18 @@ def generate_wellness_plan(request_data: Dict[str, Any]):
             recent_data:
               type: object
               description: Optional recent data (cravings, soreness, etc.)
+            async:
+              type: boolean
+              description: Queue the workflow and return immediately (poll GET /wellness-plan/{state_id})
+      - in: query
+        name: async
+        type: boolean
+        description: Same as the async body field
     responses:
       200:
         description: Wellness plan generated successfully
+      202:
+        description: Wellness plan job queued
       400:
         description: Invalid request data
       500:
@@ -62,73 +126,50 @@ def generate_wellness_plan(request_data: Dict[str, Any]):
             user_id=request_data.get('user_profile', {}).get('user_id', 'anonymous')
         )
         
-        # Extract inputs
         user_profile = request_data['user_profile']
-        constraints = request_data['constraints']
-        recent_data = request_data.get('recent_data', {})
-        goals = request_data.get('goals', {})
-        
-        db_manager = get_database_manager()
-
-        # Create or get shared state
-        state_id = request_data.get('state_id')
-        if state_id:
-            shared_state = get_shared_state(state_id)
-            if not shared_state:
-                raise WellnessAPIError(
-                    f"Shared state not found: {state_id}",
-                    status_code=404,
-                    error_code="STATE_NOT_FOUND"
-                )
-        else:
-            shared_state = create_shared_state(user_profile.get('user_id'))
-        
-        # Update shared state
-        shared_state.update_user_profile({
-            **user_profile,
-            'goals': goals,
-            'constraints': constraints
-        })
-        
-        if recent_data:
-            for data_type, data in recent_data.items():
-                shared_state.update_recent_data(data_type, data)
-        
-        # Log request
-        db_manager.log_api_request(
-            endpoint='/wellness-plan',
-            method='POST',
-            request_data=request_data,
-            request_id=g.request_id,
-            user_id=user_profile.get('user_id', 'anonymous')
-        )
+        shared_state = _prepare_plan_state(request_data, endpoint='/wellness-plan')
         
         # EXECUTE WORKFLOW
         # Local import to avoid circular dependencies
-        from wellsync_ai.workflows.wellness_orchestrator import WellnessWorkflowOrchestrator
-        
-        orchestrator = WellnessWorkflowOrchestrator()
+        from wellsync_ai.workflows.agent_pool import AgentPoolExhausted
+        from wellsync_ai.workflows.plan_jobs import run_plan_workflow, get_plan_job_runner
         
-        # Run async workflow
-        result = asyncio.run(orchestrator.execute_workflow(shared_state.state_id))
+        # Job mode: return immediately and let the background pool run the workflow
+        if _is_async_request(request_data):
+            queued = get_plan_job_runner().submit(
+                shared_state.state_id,
+                user_profile.get('user_id'),
+                request_id=g.request_id
+            )
+            
+            logger.info(
+                "Wellness plan job queued",
+                request_id=g.request_id,
+                state_id=shared_state.state_id,
+                already_running=not queued
+            )
+            
+            return jsonify({
+                'success': True,
+                'timestamp': datetime.now().isoformat(),
+                'request_id': g.request_id,
+                'state_id': shared_state.state_id,
+                'status': 'queued' if queued else 'running',
+                'status_url': f"/wellness-plan/{shared_state.state_id}"
+            }), 202
         
-        if not result:
+        try:
+            result = run_plan_workflow(shared_state.state_id, user_profile.get('user_id'))
+        except AgentPoolExhausted as e:
             raise WellnessAPIError(
-                "Workflow execution failed",
-                status_code=500,
-                error_code="WORKFLOW_FAILED"
+                f"All wellness agents are busy, please retry: {e.message}",
+                status_code=503,
+                error_code="AGENT_POOL_EXHAUSTED"
             )
         
         # Extract the unified plan from the workflow result
         unified_plan = result.get('plan', {})
         
-        # Store plan in database
-        db_manager.store_wellness_plan(
-            user_id=user_profile.get('user_id'),
-            plan_data=unified_plan,
-            confidence=unified_plan.get('confidence', 0.85)
-        )
-        
         response_data = {
             'success': True,
             'timestamp': datetime.now().isoformat(),
@@ -160,6 +201,82 @@ def generate_wellness_plan(request_data: Dict[str, Any]):
             error_code="GENERATION_FAILED"
         )
 
+@wellness_bp.route('/wellness-plan/stream', methods=['POST'])
+@validate_json_request(required_fields=['user_profile', 'constraints'])
+@validate_user_data
+def stream_wellness_plan(request_data: Dict[str, Any]):
+    """
+    Stream Wellness Plan
+    ---
+    tags:
+      - Wellness Plan
+    summary: Generate a wellness plan and stream results as Server-Sent Events
+    description: >
+      Accepts the same body as POST /wellness-plan. Emits a `proposal` event as
+      each domain agent finishes, then a `plan` event with the coordinated plan
+      (or an `error` event), followed by `done`.
+    produces:
+      - text/event-stream
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - user_profile
+            - constraints
+    responses:
+      200:
+        description: Event stream of agent proposals and the unified plan
+      400:
+        description: Invalid request data
+      409:
+        description: A plan is already being generated for this state_id
+    """
+    logger.info(
+        "Wellness plan stream started",
+        request_id=g.request_id,
+        user_id=request_data.get('user_profile', {}).get('user_id', 'anonymous')
+    )
+    
+    from wellsync_ai.workflows.plan_jobs import PlanJobInFlight, get_plan_job_runner
+    
+    def plan_in_progress(state_id: str) -> WellnessAPIError:
+        return WellnessAPIError(
+            f"A wellness plan is already being generated for state {state_id}; "
+            f"poll /wellness-plan/{state_id}",
+            status_code=409,
+            error_code="PLAN_IN_PROGRESS"
+        )
+    
+    runner = get_plan_job_runner()
+    # Refuse before touching the state: the running job is reading it
+    if request_data.get('state_id') and runner.is_running(request_data['state_id']):
+        raise plan_in_progress(request_data['state_id'])
+    
+    user_id = request_data['user_profile'].get('user_id')
+    shared_state = _prepare_plan_state(request_data, endpoint='/wellness-plan/stream')
+    state_id = shared_state.state_id
+    request_id = g.request_id
+    
+    try:
+        # Still checked atomically here, for a job started since
+        events = runner.stream(state_id, user_id, request_id=request_id)
+    except PlanJobInFlight:
+        raise plan_in_progress(state_id)
+    
+    def generate():
+        yield format_sse('state', {'state_id': state_id, 'request_id': request_id})
+        for event, payload in events:
+            yield format_sse(event, payload)
+        yield format_sse('done', {'state_id': state_id})
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @wellness_bp.route('/wellness-plan/<state_id>', methods=['GET'])
 def get_wellness_plan_status(state_id: str):
     """
@@ -186,7 +303,14 @@ def get_wellness_plan_status(state_id: str):
             state_id=state_id
         )
         
-        shared_state = get_shared_state(state_id)
+        # Per-agent progress published by the orchestrator / job runner.
+        # Read before the state: a job that completes in between then shows
+        # as still running rather than completed with a stale plan.
+        workflow_status = get_redis_manager().get_workflow_status(state_id) or {}
+        
+        # The job may have run in another worker process, so a copy cached
+        # in this one is reloaded if a newer version was committed
+        shared_state = get_shared_state(state_id, refresh=True)
         if not shared_state:
             raise WellnessAPIError(
                 f"Wellness plan not found: {state_id}",
@@ -194,14 +318,17 @@ def get_wellness_plan_status(state_id: str):
                 error_code="WELLNESS_PLAN_NOT_FOUND"
             )
         
-        state_data = shared_state.get_state_data()
+        state_data = shared_state.view()
+        
+        status = workflow_status.get('status') or state_data.get('workflow_status', 'unknown')
         
         response_data = {
             'success': True,
             'timestamp': datetime.now().isoformat(),
             'request_id': g.request_id,
             'state_id': state_id,
-            'status': state_data.get('workflow_status', 'unknown'),
+            'status': status,
+            'progress': workflow_status.get('data') or {},
             'user_profile': state_data.get('user_profile'),
             'current_plans': state_data.get('current_plans', {}),
             'constraint_violations': state_data.get('constraint_violations', []),
@@ -209,6 +336,10 @@ def get_wellness_plan_status(state_id: str):
             'state_summary': shared_state.get_state_summary()
         }
         
+        if status == 'completed':
+            unified_plan = state_data.get('recent_data', {}).get('unified_plan', {})
+            response_data['plan'] = unified_plan.get('data', {})
+        
         return jsonify(response_data), 200
         
     except WellnessAPIError:
@@ -272,6 +403,12 @@ def submit_wellness_plan_feedback(state_id: str, request_data: Dict[str, Any]):
         
         db_manager.store_user_feedback(state_id=state_id, feedback=feedback, request_id=g.request_id)
         
+        # The next plan for this user should not reuse proposals made before the feedback
+        from wellsync_ai.workflows.wellness_orchestrator import invalidate_user_proposals
+        user_id = (shared_state.view().get('user_profile') or {}).get('user_id')
+        if user_id:
+            invalidate_user_proposals(user_id)
+        
         return jsonify({
             'success': True, 
             'message': 'Feedback received',
@@ -5,6 +5,8 @@ from datetime import datetime
 import structlog
 import traceback
 
+from wellsync_ai.utils import json_codec
+
 logger = structlog.get_logger()
 
 class WellnessAPIError(Exception):
@@ -92,3 +94,10 @@ def validate_user_data(f):
         return f(*args, **kwargs)
     
     return decorated_function
+
+
+def format_sse(event: str, payload: Dict[str, Any]) -> str:
+    """Encode one Server-Sent Event frame."""
+    if event == 'keepalive':
+        return ": keepalive\n\n"
+    return f"event: {event}\ndata: {json_codec.dumps(payload, default=str)}\n\n"
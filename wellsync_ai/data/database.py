@@ -1,6 +1,9 @@
+import atexit
 import sqlite3
-import json
 import logging
+import queue
+import threading
+import time
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from contextlib import contextmanager
@@ -12,11 +15,231 @@ except Exception:
     SUPABASE_AVAILABLE = False
 
 from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils import compression, json_codec
+from wellsync_ai.data.migrations import apply_migrations, get_schema_version
 
 config = get_config()
 logger = logging.getLogger(__name__)
 
 
+# Append-only tables routed through the write-behind queue: (columns, JSON columns)
+WRITE_BEHIND_TABLES = {
+    'system_logs': (
+        ('level', 'message', 'component', 'data', 'timestamp', 'created_at'),
+        {'data'}
+    ),
+    'agent_memory': (
+        ('agent_name', 'memory_type', 'session_id', 'data', 'timestamp', 'created_at'),
+        {'data'}
+    ),
+    'api_requests': (
+        ('request_id', 'endpoint', 'method', 'user_id', 'request_data', 'response_status',
+         'response_data', 'duration_ms', 'timestamp', 'created_at'),
+        {'request_data', 'response_data'}
+    ),
+}
+
+
+def _insert_sql(table: str) -> str:
+    columns, _ = WRITE_BEHIND_TABLES[table]
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+def _encode_row(table: str, row: Dict[str, Any]) -> tuple:
+    """Order a row's values by column and encode the JSON columns (SQLite)."""
+    columns, json_columns = WRITE_BEHIND_TABLES[table]
+    return tuple(
+        _encode_json(row.get(col)) if col in json_columns and row.get(col) is not None
+        else row.get(col)
+        for col in columns
+    )
+
+
+def _encode_json(value: Any) -> Any:
+    """JSON-encode a value for a SQLite column, compressing large payloads to a BLOB."""
+    return compression.compress(json_codec.dumps(value))
+
+
+def _decode_json(value: Any) -> Any:
+    """Decode a JSON column written by _encode_json or stored as plain text."""
+    return json_codec.loads(compression.decompress(value))
+
+
+def _text_row(row: sqlite3.Row, *json_columns: str) -> Dict[str, Any]:
+    """A row as a dict, with compressed JSON columns restored to their text form."""
+    data = dict(row)
+    for col in json_columns:
+        data[col] = compression.decompress_text(data[col])
+    return data
+
+
+def _supabase_row(table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Supabase stores JSON natively and fills created_at itself."""
+    columns, _ = WRITE_BEHIND_TABLES[table]
+    return {col: row.get(col) for col in columns if col != 'created_at'}
+
+
+def _row_times() -> Dict[str, str]:
+    """Event-time columns, so deferred rows keep their original ordering."""
+    now = datetime.now()
+    return {
+        'timestamp': now.isoformat(),
+        # Same format and UTC basis as SQLite's CURRENT_TIMESTAMP default
+        'created_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+class SQLiteConnectionPool:
+    """
+    Thread-safe pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to ``size`` and configured once for
+    WAL journaling with synchronous=NORMAL, so readers never block the
+    writer and commits skip the per-transaction fsync of rollback-journal
+    mode. Because connections outlive a single call, sqlite3's per-connection
+    prepared statement cache is actually reused across requests.
+    """
+
+    def __init__(self, db_path: str, size: int = 8, timeout: float = 10.0):
+        self.db_path = db_path
+        # Every connection to ':memory:' is a separate database
+        self.size = 1 if db_path == ":memory:" else max(1, size)
+        self.timeout = timeout
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._waits = 0
+        self._discarded = 0
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; uncommitted work is rolled back on return."""
+        conn = self._acquire()
+        healthy = True
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            healthy = self._rollback(conn)
+            raise
+        finally:
+            if healthy and conn.in_transaction:
+                healthy = self._rollback(conn)
+            self._release(conn, healthy)
+
+    def close_all(self) -> None:
+        """Close idle connections (borrowed ones are closed when returned)."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool utilisation counters."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+                'waits': self._waits,
+                'discarded': self._discarded
+            }
+
+    def _acquire(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+                break
+            except queue.Empty:
+                pass
+
+            conn = self._try_create()
+            if conn is not None:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise sqlite3.OperationalError(
+                    f"No SQLite connection available after {self.timeout}s"
+                )
+            if not waited:
+                waited = True
+                with self._lock:
+                    self._waits += 1
+            try:
+                # Short waits so a slot freed by a discarded connection is noticed
+                conn = self._idle.get(timeout=min(remaining, 0.1))
+                break
+            except queue.Empty:
+                continue
+
+        with self._lock:
+            self._in_use += 1
+        return conn
+
+    def _release(self, conn: sqlite3.Connection, healthy: bool) -> None:
+        with self._lock:
+            self._in_use -= 1
+            if not healthy:
+                self._created -= 1
+                self._discarded += 1
+        if healthy:
+            self._idle.put(conn)
+        else:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def _try_create(self) -> Optional[sqlite3.Connection]:
+        """Reserve a slot and open a configured connection, or None if the pool is full."""
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=config.sqlite_busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=config.sqlite_statement_cache_size
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(config.sqlite_busy_timeout_ms)}")
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size=-{int(config.sqlite_cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size={int(config.sqlite_mmap_size_bytes)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @staticmethod
+    def _rollback(conn: sqlite3.Connection) -> bool:
+        """Roll back an open transaction; False means the connection is unusable."""
+        try:
+            conn.rollback()
+            return True
+        except sqlite3.Error:
+            return False
+
+
 class DatabaseManager:
     """Manages Supabase (Cloud) or SQLite (Local) operations for WellSync AI."""
     
@@ -31,137 +254,104 @@ class DatabaseManager:
                 self.db_path = db_path
             else:
                 self.db_path = config.database_url.replace("sqlite:///", "")
+            self._pool = SQLiteConnectionPool(
+                self.db_path,
+                size=config.sqlite_pool_size,
+                timeout=config.sqlite_pool_timeout_seconds
+            )
             print("[DB] DatabaseManager initialized with SQLite")
+        
+        self.write_behind_enabled = config.db_write_behind_enabled
+        self._write_behind = None
+        self._write_behind_lock = threading.Lock()
     
     def initialize_database(self):
-        """Initialize local database if using SQLite. Supabase schema is handled via migration tools."""
+        """
+        Bring the local SQLite schema up to date by applying pending migrations.
+        Supabase schema is handled via the SQL files in migrations/.
+        """
         if self.use_supabase:
             return
             
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Shared states table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS shared_states (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    data TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Agent memory table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS agent_memory (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_name TEXT NOT NULL,
-                    memory_type TEXT NOT NULL,
-                    session_id TEXT,
-                    data TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # User profiles table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_profiles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT UNIQUE NOT NULL,
-                    profile_data TEXT NOT NULL,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Wellness plans table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS wellness_plans (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id TEXT NOT NULL,
-                    plan_data TEXT NOT NULL,
-                    confidence REAL,
-                    timestamp TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # System logs table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS system_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    level TEXT NOT NULL,
-                    message TEXT NOT NULL,
-                    component TEXT,
-                    data TEXT,
-                    timestamp TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # API requests table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS api_requests (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    request_id TEXT UNIQUE NOT NULL,
-                    endpoint TEXT NOT NULL,
-                    method TEXT NOT NULL,
-                    user_id TEXT,
-                    request_data TEXT,
-                    response_status INTEGER,
-                    response_data TEXT,
-                    duration_ms REAL,
-                    timestamp TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # User feedback table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_feedback (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    state_id TEXT NOT NULL,
-                    request_id TEXT,
-                    feedback_data TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            conn.commit()
-            print("[DB] Config missing, using in-memory fallback")
+            applied = apply_migrations(conn)
+            version = get_schema_version(conn)
+        
+        if applied:
+            print(f"[DB] Applied schema migrations {applied}, now at version {version}")
+    
+    def get_schema_version(self) -> Optional[int]:
+        """Get the applied SQLite schema version (None when using Supabase)."""
+        if self.use_supabase:
+            return None
+        with self.get_connection() as conn:
+            return get_schema_version(conn)
     
     @contextmanager
     def get_connection(self):
-        """Get a database connection (SQLite only)."""
+        """Borrow a pooled database connection (SQLite only)."""
         if self.use_supabase:
             raise RuntimeError("DatabaseManager is using Supabase; get_connection is for SQLite only.")
         
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+        with self._pool.connection() as conn:
             yield conn
-        finally:
-            conn.close()
     
-    def store_shared_state(self, state_data: Dict[str, Any]) -> Any:
-        """Store shared state data."""
+    def get_pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Get SQLite connection pool counters (None when using Supabase)."""
+        if self.use_supabase:
+            return None
+        return self._pool.get_stats()
+    
+    def close(self) -> None:
+        """Flush queued writes and close pooled SQLite connections."""
+        if self._write_behind is not None:
+            self._write_behind.close()
+        if not self.use_supabase:
+            self._pool.close_all()
+    
+    def store_shared_state(self, state_data: Dict[str, Any], encoded: Optional[str] = None) -> Any:
+        """
+        Store (upsert) the snapshot of a shared state, keyed by its state_id.
+        
+        Args:
+            state_data: Full state document
+            encoded: Optional pre-serialized JSON of state_data (SQLite only)
+        """
+        timestamp = datetime.now().isoformat()
         if self.use_supabase:
-            response = self.supabase.table("shared_states").insert({
+            response = self.supabase.table("shared_states").upsert({
+                "state_id": state_data.get('state_id'),
                 "data": state_data,
-                "timestamp": datetime.now().isoformat()
-            }).execute()
+                "timestamp": timestamp
+            }, on_conflict="state_id").execute()
             return response.data[0]['id'] if response.data else None
             
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO shared_states (timestamp, data) VALUES (?, ?)",
-                (datetime.now().isoformat(), json.dumps(state_data))
+                """INSERT INTO shared_states (state_id, timestamp, data) VALUES (?, ?, ?)
+                   ON CONFLICT(state_id) DO UPDATE SET
+                       timestamp = excluded.timestamp,
+                       data = excluded.data,
+                       created_at = CURRENT_TIMESTAMP""",
+                (state_data.get('state_id'), timestamp,
+                 compression.compress(encoded or json_codec.dumps(state_data)))
             )
             conn.commit()
             return cursor.lastrowid
     
+    def get_shared_state(self, state_id: str) -> Optional[Dict[str, Any]]:
+        """Get the latest snapshot of a shared state by id."""
+        if self.use_supabase:
+            response = self.supabase.table("shared_states").select("data").eq("state_id", state_id).limit(1).execute()
+            return response.data[0]['data'] if response.data else None
+            
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT data FROM shared_states WHERE state_id = ?", (state_id,)
+            ).fetchone()
+            return _decode_json(row['data']) if row else None
+    
     def get_latest_shared_state(self) -> Optional[Dict[str, Any]]:
         """Get the most recent shared state."""
         if self.use_supabase:
@@ -174,32 +364,88 @@ class DatabaseManager:
                 "SELECT data FROM shared_states ORDER BY created_at DESC LIMIT 1"
             )
             row = cursor.fetchone()
-            return json.loads(row['data']) if row else None
-    
-    def store_agent_memory(self, agent_name: str, memory_type: str, 
-                          data: Dict[str, Any], session_id: Optional[str] = None) -> Any:
-        """Store agent memory data."""
+            return _decode_json(row['data']) if row else None
+
+    def append_shared_state_ops(self, state_id: str, version: int,
+                                ops: List[Dict[str, Any]]) -> Any:
+        """
+        Append one commit's worth of shared state ops.
+
+        Args:
+            state_id: Shared state identifier
+            version: State version after the ops are applied
+            ops: Ordered [{'path': [...], 'value': ...}] set-operations
+        """
+        timestamp = datetime.now().isoformat()
         if self.use_supabase:
-            response = self.supabase.table("agent_memory").insert({
-                "agent_name": agent_name,
-                "memory_type": memory_type,
-                "session_id": session_id,
-                "data": data,
-                "timestamp": datetime.now().isoformat()
+            response = self.supabase.table("shared_state_ops").insert({
+                "state_id": state_id,
+                "version": version,
+                "ops": ops,
+                "timestamp": timestamp
             }).execute()
             return response.data[0]['id'] if response.data else None
-            
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """INSERT INTO agent_memory 
-                   (agent_name, memory_type, session_id, data, timestamp) 
-                   VALUES (?, ?, ?, ?, ?)""",
-                (agent_name, memory_type, session_id, 
-                 json.dumps(data), datetime.now().isoformat())
+                "INSERT INTO shared_state_ops (state_id, version, ops, timestamp) VALUES (?, ?, ?, ?)",
+                (state_id, version, _encode_json(ops), timestamp)
             )
             conn.commit()
             return cursor.lastrowid
+
+    def get_shared_state_ops(self, state_id: str, after_version: int = 0) -> List[List[Dict[str, Any]]]:
+        """Get op batches newer than after_version, oldest first."""
+        if self.use_supabase:
+            response = self.supabase.table("shared_state_ops")\
+                .select("ops")\
+                .eq("state_id", state_id)\
+                .gt("version", after_version)\
+                .order("version")\
+                .execute()
+            return [row['ops'] for row in response.data]
+
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT ops FROM shared_state_ops WHERE state_id = ? AND version > ? ORDER BY version",
+                (state_id, after_version)
+            ).fetchall()
+            return [_decode_json(row['ops']) for row in rows]
+
+    def compact_shared_state_ops(self, state_id: str, up_to_version: int) -> int:
+        """Delete ops already folded into a snapshot at up_to_version."""
+        if self.use_supabase:
+            response = self.supabase.table("shared_state_ops")\
+                .delete()\
+                .eq("state_id", state_id)\
+                .lte("version", up_to_version)\
+                .execute()
+            return len(response.data or [])
+
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM shared_state_ops WHERE state_id = ? AND version <= ?",
+                (state_id, up_to_version)
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def store_agent_memory(self, agent_name: str, memory_type: str, 
+                          data: Dict[str, Any], session_id: Optional[str] = None) -> Any:
+        """
+        Store agent memory data.
+        
+        Goes through the write-behind queue when enabled (returns None);
+        otherwise inserts immediately and returns the row id.
+        """
+        return self._insert('agent_memory', {
+            'agent_name': agent_name,
+            'memory_type': memory_type,
+            'session_id': session_id,
+            'data': data,
+            **_row_times()
+        })
     
     def store_wellness_plan(self, user_id: str, plan_data: Dict[str, Any], 
                            confidence: float) -> Any:
@@ -219,7 +465,7 @@ class DatabaseManager:
                 """INSERT INTO wellness_plans 
                    (user_id, plan_data, confidence, timestamp) 
                    VALUES (?, ?, ?, ?)""",
-                (user_id, json.dumps(plan_data), confidence, datetime.now().isoformat())
+                (user_id, _encode_json(plan_data), confidence, datetime.now().isoformat())
             )
             conn.commit()
             return cursor.lastrowid
@@ -229,35 +475,18 @@ class DatabaseManager:
                        response_status: Optional[int] = None,
                        response_data: Optional[Dict[str, Any]] = None,
                        duration_ms: Optional[float] = None) -> Any:
-        """Log an API request."""
-        if self.use_supabase:
-            response = self.supabase.table("api_requests").insert({
-                "request_id": request_id,
-                "endpoint": endpoint,
-                "method": method,
-                "user_id": user_id,
-                "request_data": request_data,
-                "response_status": response_status,
-                "response_data": response_data,
-                "duration_ms": duration_ms,
-                "timestamp": datetime.now().isoformat()
-            }).execute()
-            return response.data[0]['id'] if response.data else None
-            
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO api_requests 
-                   (request_id, endpoint, method, user_id, request_data, 
-                    response_status, response_data, duration_ms, timestamp) 
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (request_id, endpoint, method, user_id,
-                 json.dumps(request_data), response_status,
-                 json.dumps(response_data) if response_data else None,
-                 duration_ms, datetime.now().isoformat())
-            )
-            conn.commit()
-            return cursor.lastrowid
+        """Log an API request (write-behind when enabled)."""
+        return self._insert('api_requests', {
+            'request_id': request_id,
+            'endpoint': endpoint,
+            'method': method,
+            'user_id': user_id,
+            'request_data': request_data,
+            'response_status': response_status,
+            'response_data': response_data,
+            'duration_ms': duration_ms,
+            **_row_times()
+        })
     
     def store_user_feedback(self, state_id: str, feedback: Dict[str, Any],
                            request_id: Optional[str] = None) -> Any:
@@ -273,11 +502,12 @@ class DatabaseManager:
             
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Left as plain JSON text: LearningManager matches on it with LIKE
             cursor.execute(
                 """INSERT INTO user_feedback 
                    (state_id, request_id, feedback_data, timestamp) 
                    VALUES (?, ?, ?, ?)""",
-                (state_id, request_id, json.dumps(feedback), datetime.now().isoformat())
+                (state_id, request_id, json_codec.dumps(feedback), datetime.now().isoformat())
             )
             conn.commit()
             return cursor.lastrowid
@@ -304,7 +534,7 @@ class DatabaseManager:
                    WHERE user_id = ? ORDER BY created_at DESC LIMIT ?""",
                 (user_id, limit)
             )
-            return [dict(row) for row in cursor.fetchall()]
+            return [_text_row(row, 'plan_data') for row in cursor.fetchall()]
 
     def get_agent_memory(self, agent_name: str, memory_type: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Retrieve historical agent memory/insights."""
@@ -330,36 +560,96 @@ class DatabaseManager:
                    ORDER BY created_at DESC LIMIT ?""",
                 (agent_name, memory_type, limit)
             )
-            return [dict(row) for row in cursor.fetchall()]
+            return [_text_row(row, 'data') for row in cursor.fetchall()]
     
     def log_system_event(self, level: str, message: str, component: Optional[str] = None, 
                          data: Optional[Dict[str, Any]] = None) -> Any:
-        """Log a system event to the database."""
-        timestamp = datetime.now().isoformat()
+        """Log a system event to the database (write-behind when enabled)."""
+        try:
+            return self._insert('system_logs', {
+                'level': level,
+                'message': message,
+                'component': component,
+                'data': data,
+                **_row_times()
+            })
+        except Exception as e:
+            logger.error(f"Error logging system event: {e}")
+            return None
+    
+    def write_batch(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert rows into one of the WRITE_BEHIND_TABLES in a single round trip.
+        
+        SQLite uses one executemany transaction; if it violates a constraint
+        (e.g. a duplicate api_requests.request_id) the rows are retried
+        individually so one bad row does not lose the batch.
+        
+        Returns:
+            Number of rows written
+        """
         if self.use_supabase:
+            self.supabase.table(table).insert([_supabase_row(table, row) for row in rows]).execute()
+            return len(rows)
+        
+        sql = _insert_sql(table)
+        values = [_encode_row(table, row) for row in rows]
+        
+        with self.get_connection() as conn:
             try:
-                response = self.supabase.table("system_logs").insert({
-                    "level": level,
-                    "message": message,
-                    "component": component,
-                    "data": data,
-                    "timestamp": timestamp
-                }).execute()
-                return response.data[0]['id'] if response.data else None
-            except Exception as e:
-                logger.error(f"Error logging system event to Supabase: {e}")
-                return None
-                
+                conn.executemany(sql, values)
+                conn.commit()
+                return len(values)
+            except sqlite3.IntegrityError:
+                conn.rollback()
+            
+            written = 0
+            for value in values:
+                try:
+                    conn.execute(sql, value)
+                    written += 1
+                except sqlite3.IntegrityError as e:
+                    logger.warning(f"Skipping {table} row: {e}")
+            conn.commit()
+            return written
+    
+    def flush_writes(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued write-behind rows to reach the database."""
+        if not self.write_behind_enabled:
+            return True
+        return self._get_write_behind().flush(timeout)
+    
+    def get_write_behind_stats(self) -> Optional[Dict[str, Any]]:
+        """Get write-behind queue counters (None when disabled)."""
+        if not self.write_behind_enabled:
+            return None
+        return self._get_write_behind().get_stats()
+    
+    def _get_write_behind(self):
+        """Start this manager's write-behind queue on first use; it is flushed at exit."""
+        if self._write_behind is None:
+            with self._write_behind_lock:
+                if self._write_behind is None:
+                    from wellsync_ai.data.write_behind import WriteBehindQueue
+                    self._write_behind = WriteBehindQueue(self)
+                    atexit.register(self._write_behind.close)
+        return self._write_behind
+    
+    def _insert(self, table: str, row: Dict[str, Any]) -> Any:
+        """Queue an append-only row, or write it now when write-behind is off."""
+        if self.write_behind_enabled:
+            self._get_write_behind().enqueue(table, row)
+            return None
+        
+        if self.use_supabase:
+            response = self.supabase.table(table).insert(_supabase_row(table, row)).execute()
+            return response.data[0]['id'] if response.data else None
+        
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """INSERT INTO system_logs (level, message, component, data, timestamp) 
-                   VALUES (?, ?, ?, ?, ?)""",
-                (level, message, component, json.dumps(data) if data else None, timestamp)
-            )
+            cursor = conn.execute(_insert_sql(table), _encode_row(table, row))
             conn.commit()
             return cursor.lastrowid
-            
+    
     def health_check(self) -> bool:
         """Check database health."""
         if self.use_supabase:
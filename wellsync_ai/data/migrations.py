@@ -0,0 +1,203 @@
+"""
+Versioned schema migrations for the SQLite backend of WellSync AI.
+
+Each migration runs once, in order, inside its own transaction, and is
+recorded in the schema_migrations table (mirrored in PRAGMA user_version).
+The Supabase schema is versioned the same way under migrations/.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A numbered, forward-only schema change."""
+    version: int
+    description: str
+    statements: Tuple[str, ...]
+
+
+MIGRATIONS: Tuple[Migration, ...] = (
+    Migration(1, "Baseline tables", (
+        """
+        CREATE TABLE IF NOT EXISTS shared_states (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            data TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS agent_memory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            agent_name TEXT NOT NULL,
+            memory_type TEXT NOT NULL,
+            session_id TEXT,
+            data TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS user_profiles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT UNIQUE NOT NULL,
+            profile_data TEXT NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS wellness_plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id TEXT NOT NULL,
+            plan_data TEXT NOT NULL,
+            confidence REAL,
+            timestamp TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS system_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            level TEXT NOT NULL,
+            message TEXT NOT NULL,
+            component TEXT,
+            data TEXT,
+            timestamp TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS api_requests (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            request_id TEXT UNIQUE NOT NULL,
+            endpoint TEXT NOT NULL,
+            method TEXT NOT NULL,
+            user_id TEXT,
+            request_data TEXT,
+            response_status INTEGER,
+            response_data TEXT,
+            duration_ms REAL,
+            timestamp TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS user_feedback (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            state_id TEXT NOT NULL,
+            request_id TEXT,
+            feedback_data TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    )),
+    Migration(2, "Composite indexes for history and agent memory lookups", (
+        # get_user_history: WHERE user_id = ? ORDER BY created_at DESC LIMIT ?
+        "CREATE INDEX IF NOT EXISTS idx_wellness_plans_user_created "
+        "ON wellness_plans(user_id, created_at DESC)",
+        # get_agent_memory: WHERE agent_name = ? AND memory_type = ? ORDER BY created_at DESC LIMIT ?
+        "CREATE INDEX IF NOT EXISTS idx_agent_memory_agent_type_created "
+        "ON agent_memory(agent_name, memory_type, created_at DESC)",
+        # get_latest_shared_state: ORDER BY created_at DESC LIMIT 1
+        "CREATE INDEX IF NOT EXISTS idx_shared_states_created "
+        "ON shared_states(created_at DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_user_feedback_state ON user_feedback(state_id)",
+        "ANALYZE",
+    )),
+    Migration(3, "Shared state op log", (
+        # One row per SharedState commit: the coalesced set-ops since the
+        # previous commit. Rows up to the latest snapshot are compacted away.
+        """
+        CREATE TABLE IF NOT EXISTS shared_state_ops (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            state_id TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            ops TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_shared_state_ops_state_version "
+        "ON shared_state_ops(state_id, version)",
+    )),
+    Migration(4, "Key shared_states by state_id", (
+        "ALTER TABLE shared_states ADD COLUMN state_id TEXT",
+        "UPDATE shared_states SET state_id = json_extract(data, '$.state_id')",
+        # Keep only the newest snapshot per state; later writes upsert it
+        """
+        DELETE FROM shared_states
+        WHERE state_id IS NOT NULL
+          AND id NOT IN (SELECT MAX(id) FROM shared_states GROUP BY state_id)
+        """,
+        # get_shared_state: WHERE state_id = ?
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_shared_states_state_id "
+        "ON shared_states(state_id)",
+    )),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the highest applied migration version (0 for a new database)."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'"
+    ).fetchone()
+    if not exists:
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection, target_version: Optional[int] = None) -> List[int]:
+    """
+    Apply pending migrations up to target_version (default: latest).
+
+    BEGIN IMMEDIATE serializes concurrent workers starting against the
+    same file; each re-checks the version once it holds the write lock.
+
+    Returns:
+        Versions applied by this call
+    """
+    target = LATEST_VERSION if target_version is None else target_version
+    applied: List[int] = []
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+    for migration in MIGRATIONS:
+        if migration.version > target:
+            break
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if migration.version <= get_schema_version(conn):
+                conn.rollback()
+                continue
+
+            for statement in migration.statements:
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)",
+                (migration.version, migration.description, datetime.now().isoformat())
+            )
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        applied.append(migration.version)
+
+    return applied
@@ -10,7 +10,6 @@ Explicit state tracking for the nutrition decision loop:
 - Targets: loose macros/quality goals
 """
 
-import json
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict, field
@@ -18,6 +17,7 @@ from enum import Enum
 
 from wellsync_ai.data.database import get_database_manager
 from wellsync_ai.data.redis_client import get_redis_manager
+from wellsync_ai.utils import json_codec
 
 
 class BudgetCycleType(Enum):
@@ -263,15 +263,18 @@ class NutritionState:
         state_dict = self.to_dict()
         
         try:
+            # Encode once for both stores
+            encoded = json_codec.dumps(state_dict)
+            
             # Save to Redis for real-time access
             self.redis_manager.set_shared_state(
                 self.state_id,
-                state_dict,
+                encoded,
                 ttl=86400  # 24 hours
             )
             
             # Save to SQLite for persistence
-            self.db_manager.store_shared_state(state_dict)
+            self.db_manager.store_shared_state(state_dict, encoded=encoded)
             
             return True
         except Exception as e:
@@ -295,17 +298,17 @@ class NutritionState:
     def _load_from_dict(self, data: Dict[str, Any]) -> None:
         """Load state from dictionary."""
         if 'budget' in data:
-            self.budget = BudgetState(**data['budget'])
+            self.budget = json_codec.from_dict(BudgetState, data['budget'])
         if 'availability' in data:
-            self.availability = AvailabilityState(**data['availability'])
+            self.availability = json_codec.from_dict(AvailabilityState, data['availability'])
         if 'history' in data:
-            self.history = MealHistoryState(**data['history'])
+            self.history = json_codec.from_dict(MealHistoryState, data['history'])
         if 'execution' in data:
-            self.execution = ExecutionState(**data['execution'])
+            self.execution = json_codec.from_dict(ExecutionState, data['execution'])
         if 'signals' in data:
-            self.signals = SignalsState(**data['signals'])
+            self.signals = json_codec.from_dict(SignalsState, data['signals'])
         if 'targets' in data:
-            self.targets = NutritionalTargets(**data['targets'])
+            self.targets = json_codec.from_dict(NutritionalTargets, data['targets'])
 
 
 def get_nutrition_state(user_id: str) -> NutritionState:
@@ -5,13 +5,17 @@ Handles Redis connections for real-time state sharing
 and working memory across agents.
 """
 
-import json
 import redis
-from typing import Dict, Any, Optional, List
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Union
 from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils import compression, json_codec
+from wellsync_ai.utils.redis_pool import get_pool_stats, get_redis_client
 
 config = get_config()
 
+SCAN_BATCH_SIZE = 500
+
 
 class RedisManager:
     """Manages Redis operations with in-memory fallback."""
@@ -19,6 +23,7 @@ class RedisManager:
     def __init__(self, redis_url: Optional[str] = None):
         self.redis_url = redis_url or config.redis_url
         self._client = None
+        self._binary_client = None
         self._use_redis = True
         self._in_memory_store = {}
         
@@ -37,23 +42,42 @@ class RedisManager:
     
     @property
     def client(self) -> Optional[redis.Redis]:
-        """Get Redis client with lazy initialization."""
+        """Get Redis client (backed by the shared pool) with lazy initialization."""
         if not self._use_redis:
             return None
             
         if self._client is None:
             try:
-                self._client = redis.from_url(
-                    self.redis_url,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5
-                )
+                self._client = get_redis_client(self.redis_url)
             except Exception:
                 self._use_redis = False
                 return None
         return self._client
     
+    @property
+    def binary_client(self) -> Optional[redis.Redis]:
+        """Client without response decoding, for values that may be compressed."""
+        if not self._use_redis:
+            return None
+            
+        if self._binary_client is None:
+            try:
+                self._binary_client = get_redis_client(self.redis_url, decode_responses=False)
+            except Exception:
+                self._use_redis = False
+                return None
+        return self._binary_client
+    
+    @staticmethod
+    def _encode_value(data: Union[Dict[str, Any], str]) -> Union[str, bytes]:
+        """JSON-encode (unless already encoded) and compress large values."""
+        return compression.compress(data if isinstance(data, str) else json_codec.dumps(data))
+    
+    @staticmethod
+    def _decode_value(data: Optional[Union[str, bytes]]) -> Optional[Dict[str, Any]]:
+        """Decode a value written by _encode_value, or a legacy plain JSON one."""
+        return json_codec.loads(compression.decompress(data)) if data else None
+    
     def test_connection(self) -> bool:
         """Test Redis connection."""
         if not self._use_redis:
@@ -66,16 +90,17 @@ class RedisManager:
             self._use_redis = False
             return False
     
-    def set_shared_state(self, key: str, data: Dict[str, Any], 
+    def set_shared_state(self, key: str, data: Union[Dict[str, Any], str], 
                         ttl: Optional[int] = None) -> bool:
-        """Set shared state data with optional TTL."""
+        """Set shared state data (a dict, or its JSON encoding) with optional TTL."""
+        payload = self._encode_value(data)
         if self._use_redis:
             try:
                 ttl = ttl or config.redis_memory_ttl_seconds
                 self.client.setex(
                     f"shared_state:{key}",
                     ttl,
-                    json.dumps(data)
+                    payload
                 )
                 return True
             except Exception as e:
@@ -83,22 +108,20 @@ class RedisManager:
                 self._use_redis = False
         
         # Fallback
-        self._in_memory_store[f"shared_state:{key}"] = json.dumps(data)
+        self._in_memory_store[f"shared_state:{key}"] = payload
         return True
     
     def get_shared_state(self, key: str) -> Optional[Dict[str, Any]]:
         """Get shared state data."""
         if self._use_redis:
             try:
-                data = self.client.get(f"shared_state:{key}")
-                return json.loads(data) if data else None
+                return self._decode_value(self.binary_client.get(f"shared_state:{key}"))
             except Exception as e:
                 print(f"Redis get failed, falling back: {e}")
                 self._use_redis = False
         
         # Fallback
-        data = self._in_memory_store.get(f"shared_state:{key}")
-        return json.loads(data) if data else None
+        return self._decode_value(self._in_memory_store.get(f"shared_state:{key}"))
     
     def set_agent_working_memory(self, agent_name: str, data: Dict[str, Any], 
                                 ttl: Optional[int] = None) -> bool:
@@ -109,7 +132,7 @@ class RedisManager:
                 self.client.setex(
                     f"agent_memory:{agent_name}",
                     ttl,
-                    json.dumps(data)
+                    self._encode_value(data)
                 )
                 return True
             except Exception as e:
@@ -117,28 +140,26 @@ class RedisManager:
                 self._use_redis = False
         
         # Fallback
-        self._in_memory_store[f"agent_memory:{agent_name}"] = json.dumps(data)
+        self._in_memory_store[f"agent_memory:{agent_name}"] = self._encode_value(data)
         return True
     
     def get_agent_working_memory(self, agent_name: str) -> Optional[Dict[str, Any]]:
         """Get agent working memory."""
         if self._use_redis:
             try:
-                data = self.client.get(f"agent_memory:{agent_name}")
-                return json.loads(data) if data else None
+                return self._decode_value(self.binary_client.get(f"agent_memory:{agent_name}"))
             except Exception as e:
                 print(f"Redis get failed, falling back: {e}")
                 self._use_redis = False
         
         # Fallback
-        data = self._in_memory_store.get(f"agent_memory:{agent_name}")
-        return json.loads(data) if data else None
+        return self._decode_value(self._in_memory_store.get(f"agent_memory:{agent_name}"))
     
     def publish_agent_message(self, channel: str, message: Dict[str, Any]) -> bool:
         """Publish message to agent communication channel."""
         if self._use_redis:
             try:
-                self.client.publish(channel, json.dumps(message))
+                self.client.publish(channel, json_codec.dumps(message))
                 return True
             except Exception as e:
                 print(f"Redis publish failed: {e}")
@@ -162,7 +183,7 @@ class RedisManager:
         """Set workflow execution status."""
         status_data = {
             'status': status,
-            'timestamp': json.dumps(data) if data else None,
+            'timestamp': datetime.now().isoformat(),
             'data': data
         }
         
@@ -171,7 +192,7 @@ class RedisManager:
                 self.client.setex(
                     f"workflow:{workflow_id}",
                     config.workflow_timeout_seconds,
-                    json.dumps(status_data)
+                    self._encode_value(status_data)
                 )
                 return True
             except Exception as e:
@@ -179,22 +200,20 @@ class RedisManager:
                 self._use_redis = False
         
         # Fallback
-        self._in_memory_store[f"workflow:{workflow_id}"] = json.dumps(status_data)
+        self._in_memory_store[f"workflow:{workflow_id}"] = self._encode_value(status_data)
         return True
     
     def get_workflow_status(self, workflow_id: str) -> Optional[Dict[str, Any]]:
         """Get workflow execution status."""
         if self._use_redis:
             try:
-                data = self.client.get(f"workflow:{workflow_id}")
-                return json.loads(data) if data else None
+                return self._decode_value(self.binary_client.get(f"workflow:{workflow_id}"))
             except Exception as e:
                 print(f"Redis get failed, falling back: {e}")
                 self._use_redis = False
         
         # Fallback
-        data = self._in_memory_store.get(f"workflow:{workflow_id}")
-        return json.loads(data) if data else None
+        return self._decode_value(self._in_memory_store.get(f"workflow:{workflow_id}"))
     
     def clear_expired_data(self) -> int:
         """Clear expired data."""
@@ -209,19 +228,40 @@ class RedisManager:
                 
                 cleared_count = 0
                 for pattern in patterns:
-                    keys = self.client.keys(pattern)
-                    for key in keys:
-                        ttl = self.client.ttl(key)
-                        if ttl == -1:  # No expiration set
-                            self.client.expire(key, config.redis_memory_ttl_seconds)
-                        elif ttl == -2:  # Key doesn't exist
-                            cleared_count += 1
+                    # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+                    batch = []
+                    for key in self.client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                        batch.append(key)
+                        if len(batch) >= SCAN_BATCH_SIZE:
+                            cleared_count += self._sweep_ttls(batch)
+                            batch = []
+                    if batch:
+                        cleared_count += self._sweep_ttls(batch)
                 return cleared_count
             except Exception as e:
                 print(f"Failed to clear expired data from Redis: {e}")
                 self._use_redis = False
         return 0 # Simplified cleanup for fallback
     
+    def _sweep_ttls(self, keys: List[str]) -> int:
+        """
+        Give keys without a TTL the default one, in two pipelined round trips.
+        
+        Returns the number of keys that expired since they were scanned.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        ttls = pipe.execute()
+        
+        pipe = self.client.pipeline(transaction=False)
+        for key, ttl in zip(keys, ttls):
+            if ttl == -1:  # No expiration set
+                pipe.expire(key, config.redis_memory_ttl_seconds)
+        if len(pipe):
+            pipe.execute()
+        return sum(1 for ttl in ttls if ttl == -2)  # Key doesn't exist
+    
     def health_check(self) -> bool:
         """Perform health check."""
         return self._use_redis or isinstance(self._in_memory_store, dict)
@@ -235,7 +275,8 @@ class RedisManager:
                     'connected': True,
                     'mode': 'redis',
                     'redis_version': info.get('redis_version'),
-                    'used_memory': info.get('used_memory_human')
+                    'used_memory': info.get('used_memory_human'),
+                    'pools': get_pool_stats()
                 }
             except Exception:
                 self._use_redis = False
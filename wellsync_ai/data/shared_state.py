@@ -4,18 +4,32 @@ Shared state management for WellSync AI system.
 Implements the SharedState class for inter-agent communication,
 Redis integration for real-time state sharing, and SQLite 
 persistence for historical data storage.
+
+Durable storage is delta-based: each commit appends the changed paths to
+an op log (shared_state_ops) and a full snapshot is written to
+shared_states only every ``shared_state_snapshot_interval`` commits, at
+which point the older ops are compacted away. Mutations made inside
+``SharedState.batch()`` are coalesced into a single commit.
 """
 
-import json
+import logging
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass, asdict
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Tuple, Union
+from dataclasses import dataclass, fields
 from enum import Enum
 
 from wellsync_ai.data.database import get_database_manager
 from wellsync_ai.data.redis_client import get_redis_manager
 from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils import json_codec
+
+logger = logging.getLogger(__name__)
 
 
 class StateType(Enum):
@@ -28,6 +42,27 @@ class StateType(Enum):
     WORKFLOW_STATUS = "workflow_status"
 
 
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ and a shallow to_dict().
+    
+    Equivalent to dataclass(slots=True), which needs Python 3.10. Slotted
+    records drop the per-instance __dict__, and to_dict() avoids the
+    recursive deep copy that dataclasses.asdict makes of nested payloads.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    namespace['to_dict'] = lambda self: {name: getattr(self, name) for name in names}
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+@_slotted
 @dataclass
 class ConstraintViolation:
     """Represents a constraint violation in the system."""
@@ -40,6 +75,7 @@ class ConstraintViolation:
     resolution_strategy: Optional[str] = None
 
 
+@_slotted
 @dataclass
 class UserProfile:
     """User profile data structure."""
@@ -52,6 +88,7 @@ class UserProfile:
     updated_at: str
 
 
+@_slotted
 @dataclass
 class AgentProposal:
     """Agent proposal data structure."""
@@ -66,6 +103,18 @@ class AgentProposal:
     session_id: Optional[str] = None
 
 
+def apply_state_ops(state_data: Dict[str, Any], ops: List[Dict[str, Any]]) -> None:
+    """Replay set-operations ({'path': [...], 'value': ...}) onto a state dict."""
+    for op in ops:
+        path = op['path']
+        target = state_data
+        for key in path[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[path[-1]] = op['value']
+
+
 class SharedState:
     """
     Manages shared state across all wellness agents.
@@ -73,8 +122,18 @@ class SharedState:
     Provides real-time state sharing via Redis and persistent
     storage via SQLite for inter-agent communication and
     coordination.
+    
+    The JSON encoding of each top-level section is cached and only
+    re-encoded after that section changes, so commits and size estimates
+    do not re-serialize untouched plans and proposals.
     """
     
+    __slots__ = (
+        'state_id', 'db_manager', 'redis_manager', 'config', '_state_data',
+        '_encoded', '_pending_ops', '_batch_depth', '_commits_since_snapshot',
+        '_has_snapshot', '_commit_lock'
+    )
+    
     def __init__(self, state_id: Optional[str] = None):
         """
         Initialize SharedState manager.
@@ -104,6 +163,16 @@ class SharedState:
             }
         }
         
+        # Cached JSON per top-level key; a missing entry means dirty
+        self._encoded: Dict[str, str] = {}
+        
+        # Ops not yet committed, keyed by path so repeated writes coalesce
+        self._pending_ops: Dict[Tuple[str, ...], Any] = {}
+        self._batch_depth = 0
+        self._commits_since_snapshot = 0
+        self._has_snapshot = False
+        self._commit_lock = threading.RLock()
+        
         # Load existing state if state_id provided
         if state_id:
             self._load_state()
@@ -131,7 +200,7 @@ class SharedState:
             )
             
             # Update state
-            self._state_data['user_profile'] = asdict(user_profile)
+            self._set(('user_profile',), user_profile.to_dict())
             self._update_metadata()
             
             # Persist to both Redis and SQLite
@@ -155,13 +224,10 @@ class SharedState:
             Success status
         """
         try:
-            if 'recent_data' not in self._state_data:
-                self._state_data['recent_data'] = {}
-            
-            self._state_data['recent_data'][data_type] = {
+            self._set(('recent_data', data_type), {
                 'data': data,
                 'updated_at': datetime.now().isoformat()
-            }
+            })
             
             self._update_metadata()
             self._persist_state()
@@ -184,14 +250,11 @@ class SharedState:
             Success status
         """
         try:
-            if 'current_plans' not in self._state_data:
-                self._state_data['current_plans'] = {}
-            
-            self._state_data['current_plans'][domain] = {
+            self._set(('current_plans', domain), {
                 'plan': plan_data,
                 'updated_at': datetime.now().isoformat(),
                 'status': 'active'
-            }
+            })
             
             self._update_metadata()
             self._persist_state()
@@ -213,14 +276,16 @@ class SharedState:
             Success status
         """
         try:
-            if 'constraint_violations' not in self._state_data:
-                self._state_data['constraint_violations'] = []
-            
-            violation_dict = asdict(violation)
-            self._state_data['constraint_violations'].append(violation_dict)
-            
-            # Keep only recent violations (last 30 days)
-            self._cleanup_old_violations()
+            violation_dict = violation.to_dict()
+            # The list is modified in place, so keep to_json() out until _set
+            with self._commit_lock:
+                if 'constraint_violations' not in self._state_data:
+                    self._state_data['constraint_violations'] = []
+                self._state_data['constraint_violations'].append(violation_dict)
+                
+                # Keep only recent violations (last 30 days)
+                self._cleanup_old_violations()
+                self._set(('constraint_violations',), self._state_data['constraint_violations'])
             
             self._update_metadata()
             self._persist_state()
@@ -242,11 +307,7 @@ class SharedState:
             Success status
         """
         try:
-            if 'agent_proposals' not in self._state_data:
-                self._state_data['agent_proposals'] = {}
-            
-            proposal_dict = asdict(proposal)
-            self._state_data['agent_proposals'][proposal.agent_id] = proposal_dict
+            self._set(('agent_proposals', proposal.agent_id), proposal.to_dict())
             
             self._update_metadata()
             self._persist_state()
@@ -269,12 +330,12 @@ class SharedState:
             Success status
         """
         try:
-            self._state_data['workflow_status'] = status
+            self._set(('workflow_status',), status)
             
             if metadata:
-                if 'workflow_metadata' not in self._state_data:
-                    self._state_data['workflow_metadata'] = {}
-                self._state_data['workflow_metadata'].update(metadata)
+                workflow_metadata = dict(self._state_data.get('workflow_metadata') or {})
+                workflow_metadata.update(metadata)
+                self._set(('workflow_metadata',), workflow_metadata)
             
             self._update_metadata()
             self._persist_state()
@@ -299,11 +360,37 @@ class SharedState:
             return self._state_data.get(state_type.value, {})
         return self._state_data.copy()
     
+    def view(self) -> Mapping[str, Any]:
+        """
+        Read-only view of the live state, without copying.
+        
+        Nested values are shared with the state and must not be modified;
+        use get_state_data() for a copy that callers may extend.
+        """
+        return MappingProxyType(self._state_data)
+    
+    def to_json(self) -> str:
+        """
+        Serialize the state, re-encoding only sections changed since the last call.
+        
+        Holds the commit lock, as _set does, so a section cannot be updated
+        (and its cached encoding dropped) between encoding and caching it.
+        """
+        with self._commit_lock:
+            parts = []
+            for key, value in list(self._state_data.items()):
+                encoded = self._encoded.get(key)
+                if encoded is None:
+                    encoded = json_codec.dumps(value)
+                    self._encoded[key] = encoded
+                parts.append(f"{json_codec.dumps(key)}: {encoded}")
+            return "{" + ", ".join(parts) + "}"
+    
     def get_user_profile(self) -> Optional[UserProfile]:
         """Get user profile from shared state."""
         profile_data = self._state_data.get('user_profile')
         if profile_data:
-            return UserProfile(**profile_data)
+            return json_codec.from_dict(UserProfile, profile_data)
         return None
     
     def get_recent_data(self, data_type: Optional[str] = None) -> Dict[str, Any]:
@@ -347,7 +434,7 @@ class SharedState:
             List of ConstraintViolation objects
         """
         violations_data = self._state_data.get('constraint_violations', [])
-        violations = [ConstraintViolation(**v) for v in violations_data]
+        violations = [json_codec.from_dict(ConstraintViolation, v) for v in violations_data]
         
         if resolved is not None:
             violations = [v for v in violations if v.resolved == resolved]
@@ -369,18 +456,18 @@ class SharedState:
         if agent_id:
             proposal_data = proposals_data.get(agent_id)
             if proposal_data:
-                return {agent_id: AgentProposal(**proposal_data)}
+                return {agent_id: json_codec.from_dict(AgentProposal, proposal_data)}
             return {}
         
         return {
-            agent_id: AgentProposal(**proposal_data)
+            agent_id: json_codec.from_dict(AgentProposal, proposal_data)
             for agent_id, proposal_data in proposals_data.items()
         }
     
     def clear_agent_proposals(self) -> bool:
         """Clear all agent proposals from shared state."""
         try:
-            self._state_data['agent_proposals'] = {}
+            self._set(('agent_proposals',), {})
             self._update_metadata()
             self._persist_state()
             return True
@@ -400,58 +487,183 @@ class SharedState:
             Success status
         """
         try:
-            violations = self._state_data.get('constraint_violations', [])
-            if 0 <= violation_index < len(violations):
+            with self._commit_lock:
+                violations = self._state_data.get('constraint_violations', [])
+                if not 0 <= violation_index < len(violations):
+                    return False
                 violations[violation_index]['resolved'] = True
                 violations[violation_index]['resolution_strategy'] = resolution_strategy
-                
-                self._update_metadata()
-                self._persist_state()
-                return True
-            return False
+                self._set(('constraint_violations',), violations)
+
+            self._update_metadata()
+            self._persist_state()
+            return True
             
         except Exception as e:
             self._log_error(f"Failed to resolve constraint violation: {str(e)}")
             return False
     
-    def _load_state(self) -> None:
-        """Load existing state from Redis or SQLite."""
+    @contextmanager
+    def batch(self):
+        """
+        Group mutations into a single commit.
+        
+        Updates inside the block are applied in memory immediately and
+        written to Redis and the op log once, when the outermost batch
+        exits (also on error, so partial progress is not lost).
+        """
+        self._batch_depth += 1
         try:
-            # Try Redis first for real-time data
-            redis_state = self.redis_manager.get_shared_state(self.state_id)
-            if redis_state:
-                self._state_data.update(redis_state)
-                return
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.commit()
+    
+    @property
+    def in_batch(self) -> bool:
+        """Whether a batch() block is open on this state."""
+        return self._batch_depth > 0
+    
+    def commit(self) -> bool:
+        """
+        Write pending changes: the full document to Redis, and either the
+        coalesced ops or (every snapshot interval) a compacted snapshot to
+        the database.
+        
+        Returns:
+            Success status
+        """
+        with self._commit_lock:
+            if not self._pending_ops:
+                return True
             
-            # Fallback to SQLite for persistent data
-            db_state = self.db_manager.get_latest_shared_state()
-            if db_state and db_state.get('state_id') == self.state_id:
-                self._state_data.update(db_state)
+            ops = [{'path': list(path), 'value': value} for path, value in self._pending_ops.items()]
+            ops.append({'path': ['timestamp'], 'value': self._state_data['timestamp']})
+            ops.append({'path': ['metadata'], 'value': self._state_data['metadata']})
+            version = self._state_data['metadata']['version']
+            self._pending_ops = {}
+            
+            try:
+                # Store in Redis for real-time access
+                encoded = self.to_json()
+                self.redis_manager.set_shared_state(
+                    self.state_id,
+                    encoded,
+                    ttl=self.config.redis_memory_ttl_seconds
+                )
+                
+                interval = max(1, self.config.shared_state_snapshot_interval)
+                if not self._has_snapshot or self._commits_since_snapshot + 1 >= interval:
+                    self.db_manager.store_shared_state(self._state_data, encoded=encoded)
+                    self.db_manager.compact_shared_state_ops(self.state_id, version)
+                    self._has_snapshot = True
+                    self._commits_since_snapshot = 0
+                else:
+                    self.db_manager.append_shared_state_ops(self.state_id, version, ops)
+                    self._commits_since_snapshot += 1
+                return True
+                
+            except Exception as e:
+                self._log_error(f"Failed to persist state: {str(e)}")
+                return False
+    
+    def _set(self, path: Tuple[str, ...], value: Any) -> None:
+        """Set a value in the state document and record it as a pending op."""
+        with self._commit_lock:
+            apply_state_ops(self._state_data, [{'path': list(path), 'value': value}])
+            self._encoded.pop(path[0], None)
+            
+            # A write to a path supersedes earlier writes beneath it
+            for pending in [p for p in self._pending_ops if p[:len(path)] == path]:
+                del self._pending_ops[pending]
+            self._pending_ops[path] = value
+    
+    def refresh(self) -> bool:
+        """
+        Pick up commits made by other processes.
+        
+        Another worker may be running the workflow for this state, so a
+        copy cached in this process goes stale. The stored document is
+        reloaded when its version is newer than this copy's; a copy with
+        uncommitted changes is left alone.
+        
+        Returns:
+            True if the state was reloaded
+        """
+        with self._commit_lock:
+            if self._batch_depth or self._pending_ops:
+                return False
+            try:
+                stored, replayed = self._read_stored_state()
+            except Exception as e:
+                self._log_error(f"Failed to refresh state: {str(e)}")
+                return False
+            
+            version = self._state_data['metadata'].get('version', 0)
+            if not stored or stored.get('metadata', {}).get('version', 0) <= version:
+                return False
+            
+            self._state_data.update(stored)
+            self._encoded.clear()
+            if replayed is not None:
+                self._has_snapshot = True
+                self._commits_since_snapshot = replayed
+            return True
+    
+    def _read_stored_state(self) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Read the committed document from Redis, or a snapshot plus op log replay.
+        
+        Returns:
+            (document or None, number of op batches replayed; None when read from Redis)
+        """
+        # Try Redis first for real-time data
+        # (the first commit from this process still writes a snapshot,
+        # since we cannot tell how far the database lags behind Redis)
+        redis_state = self.redis_manager.get_shared_state(self.state_id)
+        if redis_state:
+            return redis_state, None
+        
+        # Fallback to SQLite: snapshot plus the ops committed since
+        db_state = self.db_manager.get_shared_state(self.state_id)
+        if not db_state:
+            return None, None
+        op_batches = self.db_manager.get_shared_state_ops(
+            self.state_id, db_state.get('metadata', {}).get('version', 0)
+        )
+        for ops in op_batches:
+            apply_state_ops(db_state, ops)
+        return db_state, len(op_batches)
+    
+    def _load_state(self) -> None:
+        """Load existing state from Redis, or a snapshot plus op log replay."""
+        try:
+            stored, replayed = self._read_stored_state()
+            if stored:
+                self._state_data.update(stored)
+                if replayed is not None:
+                    self._has_snapshot = True
+                    self._commits_since_snapshot = replayed
                 
         except Exception as e:
             self._log_error(f"Failed to load state: {str(e)}")
+        finally:
+            self._encoded.clear()
     
     def _persist_state(self) -> None:
-        """Persist state to both Redis and SQLite."""
-        try:
-            # Store in Redis for real-time access
-            self.redis_manager.set_shared_state(
-                self.state_id,
-                self._state_data,
-                ttl=self.config.redis_memory_ttl_seconds
-            )
-            
-            # Store in SQLite for persistence
-            self.db_manager.store_shared_state(self._state_data)
-            
-        except Exception as e:
-            self._log_error(f"Failed to persist state: {str(e)}")
+        """Commit pending changes unless a batch is open."""
+        if self._batch_depth == 0:
+            self.commit()
     
     def _update_metadata(self) -> None:
         """Update state metadata."""
-        self._state_data['timestamp'] = datetime.now().isoformat()
-        self._state_data['metadata']['last_updated'] = datetime.now().isoformat()
-        self._state_data['metadata']['version'] += 1
+        with self._commit_lock:
+            self._state_data['timestamp'] = datetime.now().isoformat()
+            self._state_data['metadata']['last_updated'] = datetime.now().isoformat()
+            self._state_data['metadata']['version'] += 1
+            self._encoded.pop('timestamp', None)
+            self._encoded.pop('metadata', None)
     
     def _cleanup_old_violations(self) -> None:
         """Remove constraint violations older than 30 days."""
@@ -479,6 +691,24 @@ class SharedState:
             {'state_id': self.state_id}
         )
     
+    def estimate_size(self) -> int:
+        """
+        Approximate in-memory footprint, measured as serialized JSON bytes.
+        
+        Called by the manager's sweeper without holding the commit lock, so
+        sections are measured from cached encodings where present but fresh
+        encodings are never cached: one taken mid-update could outlive the
+        invalidation in _set and be written by the next commit.
+        """
+        cached = dict(self._encoded)
+        parts = []
+        for key, value in list(self._state_data.items()):
+            encoded = cached.get(key)
+            if encoded is None:
+                encoded = json_codec.dumps(value)
+            parts.append(f"{json_codec.dumps(key)}: {encoded}")
+        return len(("{" + ", ".join(parts) + "}").encode('utf-8'))
+    
     def get_state_summary(self) -> Dict[str, Any]:
         """Get summary of current shared state."""
         return {
@@ -497,12 +727,42 @@ class SharedState:
 class SharedStateManager:
     """
     Manager for multiple shared states and state lifecycle.
+    
+    Hydrated states are kept in a registry bounded by entry count, an
+    approximate byte budget and an idle TTL, evicting least-recently-used
+    first. Evicted states are reloaded from Redis or the database on the
+    next lookup. States with an open batch are never evicted, so there is
+    at most one live writer per state. A daemon thread sweeps idle states
+    and refreshes the size estimates every ``sweep_interval`` seconds.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_states: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        sweep_interval: Optional[float] = None
+    ):
+        config = get_config()
         self.db_manager = get_database_manager()
         self.redis_manager = get_redis_manager()
-        self._active_states = {}
+        self.max_states = max_states or config.shared_state_cache_size
+        self.max_bytes = max_bytes or config.shared_state_cache_max_mb * 1024 * 1024
+        self.idle_ttl = idle_ttl if idle_ttl is not None else config.shared_state_idle_ttl_seconds
+        self.sweep_interval = (
+            sweep_interval if sweep_interval is not None
+            else config.shared_state_sweep_interval_seconds
+        )
+        
+        self._active_states: "OrderedDict[str, SharedState]" = OrderedDict()
+        self._last_access: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
     
     def create_shared_state(self, user_id: Optional[str] = None) -> SharedState:
         """
@@ -526,62 +786,164 @@ class SharedStateManager:
                 'baseline_metrics': {}
             })
         
-        self._active_states[state.state_id] = state
+        self._remember(state)
         return state
     
-    def get_shared_state(self, state_id: str) -> Optional[SharedState]:
+    def get_shared_state(self, state_id: str, refresh: bool = False) -> Optional[SharedState]:
         """
         Get existing shared state by ID.
         
         Args:
             state_id: State identifier
+            refresh: Reload a registered state if another process committed
+                a newer version (for readers of states they do not write)
             
         Returns:
             SharedState instance or None
         """
-        if state_id in self._active_states:
-            return self._active_states[state_id]
+        with self._lock:
+            state = self._touch(state_id)
+            if state is not None:
+                self.stats['hits'] += 1
+            else:
+                self.stats['misses'] += 1
+        if state is not None:
+            if refresh:
+                state.refresh()
+            return state
         
         # Try to load from storage
         try:
             state = SharedState(state_id)
-            self._active_states[state_id] = state
-            return state
         except Exception:
             return None
+        
+        with self._lock:
+            # Another thread may have hydrated it meanwhile; keep the first
+            existing = self._touch(state_id)
+            if existing is not None:
+                return existing
+        self._remember(state)
+        return state
     
     def cleanup_expired_states(self) -> int:
         """
-        Clean up expired shared states.
+        Evict states idle for longer than the TTL and refresh size estimates.
+        
+        Called periodically by the sweeper thread; safe to call by hand.
         
         Returns:
             Number of states cleaned up
         """
-        cleaned_count = 0
-        expired_states = []
-        
-        for state_id, state in self._active_states.items():
-            state_data = state.get_state_data()
-            last_updated = datetime.fromisoformat(
-                state_data.get('metadata', {}).get('last_updated', datetime.now().isoformat())
-            )
-            
-            # Remove states older than retention period
-            if datetime.now() - last_updated > timedelta(days=7):
-                expired_states.append(state_id)
+        cutoff = time.monotonic() - self.idle_ttl
+        with self._lock:
+            expired = [
+                state_id for state_id, state in self._active_states.items()
+                if self._last_access[state_id] < cutoff and not state.in_batch
+            ]
+            for state_id in expired:
+                self._remove(state_id)
+            self.stats['expirations'] += len(expired)
+            states = list(self._active_states.values())
         
-        for state_id in expired_states:
-            del self._active_states[state_id]
-            cleaned_count += 1
+        # States grow as workflows run; re-measure outside the lock
+        sizes = {}
+        for state in states:
+            try:
+                sizes[state.state_id] = state.estimate_size()
+            except RuntimeError:
+                # Mutated mid-serialization; keep the previous estimate
+                continue
+        with self._lock:
+            for state_id, size in sizes.items():
+                if state_id in self._sizes:
+                    self._bytes += size - self._sizes[state_id]
+                    self._sizes[state_id] = size
+            self._evict_overflow()
         
-        return cleaned_count
+        return len(expired)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry size, memory estimate and eviction counters."""
+        with self._lock:
+            return {
+                'states': len(self._active_states),
+                'max_states': self.max_states,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'idle_ttl_seconds': self.idle_ttl,
+                'in_batch': sum(1 for state in self._active_states.values() if state.in_batch),
+                'sweeper_running': self._sweeper is not None and self._sweeper.is_alive(),
+                **self.stats
+            }
+    
+    def stop_sweeper(self, timeout: float = 5.0) -> None:
+        """Stop the background sweeper thread."""
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout)
+    
+    def _remember(self, state: SharedState) -> None:
+        """Add a state as most recently used and evict beyond the bounds."""
+        size = state.estimate_size()
+        with self._lock:
+            if state.state_id in self._active_states:
+                self._remove(state.state_id)
+            self._active_states[state.state_id] = state
+            self._last_access[state.state_id] = time.monotonic()
+            self._sizes[state.state_id] = size
+            self._bytes += size
+            self._evict_overflow()
+        self._ensure_sweeper()
+    
+    def _touch(self, state_id: str) -> Optional[SharedState]:
+        """Mark a registered state as just used (caller holds the lock)."""
+        state = self._active_states.get(state_id)
+        if state is not None:
+            self._active_states.move_to_end(state_id)
+            self._last_access[state_id] = time.monotonic()
+        return state
+    
+    def _evict_overflow(self) -> None:
+        """Evict least recently used states over the count or byte budget (caller holds the lock)."""
+        for state_id in list(self._active_states):
+            if len(self._active_states) <= self.max_states and self._bytes <= self.max_bytes:
+                break
+            if self._active_states[state_id].in_batch:
+                continue
+            self._remove(state_id)
+            self.stats['evictions'] += 1
+    
+    def _remove(self, state_id: str) -> None:
+        del self._active_states[state_id]
+        del self._last_access[state_id]
+        self._bytes -= self._sizes.pop(state_id, 0)
+    
+    def _ensure_sweeper(self) -> None:
+        if self.sweep_interval <= 0 or self._sweeper is not None:
+            return
+        with self._lock:
+            if self._sweeper is not None:
+                return
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop, name="shared-state-sweeper", daemon=True
+            )
+        self._sweeper.start()
+    
+    def _sweep_loop(self) -> None:
+        while not self._stop_sweeper.wait(self.sweep_interval):
+            try:
+                expired = self.cleanup_expired_states()
+                if expired:
+                    logger.info(f"Evicted {expired} idle shared states")
+            except Exception as e:
+                logger.error(f"Shared state sweep failed: {e}")
     
     def get_active_states_summary(self) -> List[Dict[str, Any]]:
         """Get summary of all active shared states."""
-        return [
-            state.get_state_summary()
-            for state in self._active_states.values()
-        ]
+        with self._lock:
+            states = list(self._active_states.values())
+        return [state.get_state_summary() for state in states]
 
 
 # Global shared state manager
@@ -598,6 +960,6 @@ def create_shared_state(user_id: Optional[str] = None) -> SharedState:
     return shared_state_manager.create_shared_state(user_id)
 
 
-def get_shared_state(state_id: str) -> Optional[SharedState]:
-    """Get existing shared state by ID."""
-    return shared_state_manager.get_shared_state(state_id)
\ No newline at end of file
+def get_shared_state(state_id: str, refresh: bool = False) -> Optional[SharedState]:
+    """Get existing shared state by ID (see SharedStateManager.get_shared_state)."""
+    return shared_state_manager.get_shared_state(state_id, refresh=refresh)
\ No newline at end of file
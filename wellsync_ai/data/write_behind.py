@@ -0,0 +1,207 @@
+"""
+Write-behind buffer for high-volume, append-only records.
+
+System logs, agent memory and API request records are queued and written
+by a background thread in batched transactions (executemany on SQLite,
+bulk inserts on Supabase), keeping disk and network latency off the
+request path. The queue is bounded: when it is full, producers wait
+briefly and then write their record synchronously, so load slows callers
+down instead of dropping data.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from wellsync_ai.utils.config import get_config
+
+logger = logging.getLogger(__name__)
+
+
+class _FlushMarker:
+    """Queue item that is acknowledged once everything before it is written."""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class WriteBehindQueue:
+    """
+    Bounded queue of pending inserts drained by a single writer thread.
+
+    Records are (table, row) pairs where row maps column names to Python
+    values; DatabaseManager.write_batch does the backend-specific encoding.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        max_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        enqueue_timeout: Optional[float] = None
+    ):
+        config = get_config()
+        self.db_manager = db_manager
+        self.max_size = max_size or config.db_write_behind_max_queue
+        self.batch_size = batch_size or config.db_write_behind_batch_size
+        self.flush_interval = (
+            flush_interval if flush_interval is not None
+            else config.db_write_behind_flush_interval_ms / 1000
+        )
+        self.enqueue_timeout = (
+            enqueue_timeout if enqueue_timeout is not None
+            else config.db_write_behind_enqueue_timeout_ms / 1000
+        )
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.max_size)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'failed': 0,
+            'sync_fallbacks': 0
+        }
+        # Held while putting onto the queue and while closing it, so nothing
+        # can be queued behind the shutdown sentinel
+        self._put_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, table: str, row: Dict[str, Any]) -> None:
+        """
+        Queue a row for insertion.
+
+        Blocks for up to enqueue_timeout when the queue is full, then falls
+        back to writing the row synchronously (backpressure, not loss). Rows
+        arriving once the queue is closed, or after the writer thread has
+        stopped, are written synchronously as well.
+        """
+        if self._put((table, row), self.enqueue_timeout):
+            self._count('enqueued')
+            return
+
+        self._count('sync_fallbacks')
+        self._write({table: [row]})
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything queued so far has been written.
+
+        Returns:
+            True once written, False if the timeout ran out first (including
+            while waiting for room in a full queue)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        marker = _FlushMarker()
+        if not self._put(marker, timeout):
+            return self._queue.empty()
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return marker.done.wait(remaining)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush pending rows and stop the writer thread."""
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._put_lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread.is_alive():
+                # Blocking: the sentinel must follow every queued row
+                self._queue.put(None)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth and write counters."""
+        with self._stats_lock:
+            return {
+                **self._stats,
+                'queue_depth': self._queue.qsize(),
+                'max_size': self.max_size
+            }
+
+    def _put(self, item: Any, timeout: Optional[float]) -> bool:
+        """
+        Queue an item unless closed or the writer has stopped.
+
+        Returns:
+            False if the item was not queued (closed, writer gone, or still
+            no room after timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._put_lock.acquire(timeout=-1 if timeout is None else timeout):
+            return False
+        try:
+            if self._closed or not self._thread.is_alive():
+                return False
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            self._queue.put(item, timeout=remaining)
+            return True
+        except queue.Full:
+            return False
+        finally:
+            self._put_lock.release()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch: List[Tuple[str, Dict[str, Any]]] = []
+            markers: List[_FlushMarker] = []
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+
+            while True:
+                if isinstance(item, _FlushMarker):
+                    markers.append(item)
+                elif item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+
+                # A flush request or shutdown writes what we have right away
+                if markers or stop or len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+                for table, row in batch:
+                    grouped[table].append(row)
+                self._write(grouped)
+
+            for marker in markers:
+                marker.done.set()
+            if stop:
+                return
+
+    def _write(self, grouped: Dict[str, List[Dict[str, Any]]]) -> None:
+        for table, rows in grouped.items():
+            try:
+                self.db_manager.write_batch(table, rows)
+                self._count('written', len(rows))
+                self._count('batches')
+            except Exception as e:
+                # Never let a bad batch kill the writer thread
+                self._count('failed', len(rows))
+                logger.error(f"Write-behind batch for {table} failed ({len(rows)} rows): {e}")
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[key] += amount
+
@@ -1,35 +1,215 @@
+import asyncio
+import copy
+import fnmatch
 import hashlib
 import json
 import logging
-from typing import Any, Optional, Dict
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional, Dict, Tuple, Iterable, List
 import redis
 import os
 from datetime import timedelta
 
+from wellsync_ai.utils import json_codec
+from wellsync_ai.utils.redis_pool import get_redis_client
+
 logger = logging.getLogger(__name__)
 
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Sorted sets of key -> expiry time; the former plain sets ("cache:tag:") expire on their own
+TAG_PREFIX = "cache:tags:"
+# Headroom added when a tag set's expiry has to move out to cover a new member
+TAG_EXPIRY_GRACE_SECONDS = 300
+LOCK_PREFIX = "cache:lock:"
+SCAN_BATCH_SIZE = 500
+
+
+# Delete a single-flight lock only if this process still owns it
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _batched(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class LocalLRUCache:
+    """
+    Bounded in-process cache tier (L1).
+
+    Entries are stored as serialized JSON so callers always get a fresh
+    copy, are evicted least-recently-used once either the entry or byte
+    budget is exceeded, and expire after their TTL.
+
+    on_remove, if given, is called (outside the lock) with each key that
+    leaves the cache other than by being overwritten, so owners can drop
+    their own bookkeeping for it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        on_remove: Optional[Callable[[str], None]] = None
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_remove = on_remove
+        self._entries: "OrderedDict[str, Tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+
+            serialized, expires_at, _ = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return serialized
+
+            self._remove(key)
+            self.stats['expirations'] += 1
+            self.stats['misses'] += 1
+        self._notify_removed([key])
+        return None
+
+    def set(self, key: str, serialized: str, ttl: float) -> bool:
+        """Store an entry. Returns False if it is larger than the whole cache."""
+        size = len(serialized.encode('utf-8'))
+        if size > self.max_bytes:
+            return False
+
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (serialized, time.monotonic() + ttl, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted.append(oldest)
+                self.stats['evictions'] += 1
+        self._notify_removed(evicted)
+        return key not in evicted
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+        self._notify_removed([key])
+        return True
+
+    def delete_matching(self, pattern: str) -> int:
+        """Delete keys matching a Redis-style glob pattern."""
+        with self._lock:
+            keys = [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]
+            for k in keys:
+                self._remove(k)
+        self._notify_removed(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+        self._notify_removed(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _notify_removed(self, keys: List[str]) -> None:
+        if self.on_remove:
+            for key in keys:
+                self.on_remove(key)
+
+
 class CacheManager:
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(CacheManager, cls).__new__(cls)
             cls._instance._initialize()
         return cls._instance
-    
+
     def _initialize(self):
         self.redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
         self.enabled = os.getenv("CACHE_ENABLED", "true").lower() == "true"
         self.default_ttl = int(os.getenv("CACHE_TTL", "3600"))  # 1 hour default
-        
+
+        # L1: bounded in-process tier in front of Redis (and the only tier in fallback mode)
+        self.l1_ttl = int(os.getenv("CACHE_L1_TTL", "300"))
+        self.local_cache = LocalLRUCache(
+            max_entries=int(os.getenv("CACHE_L1_MAX_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("CACHE_L1_MAX_BYTES", str(64 * 1024 * 1024))),
+            on_remove=self._forget_local_tags
+        )
+        # "auto" broadcasts invalidations only when gunicorn runs several
+        # workers (WEB_CONCURRENCY), each with its own L1; with pub/sub off, a
+        # worker may serve an entry invalidated elsewhere for up to l1_ttl
+        pubsub = os.getenv("CACHE_PUBSUB_INVALIDATION", "auto").lower()
+        if pubsub == "auto":
+            self.pubsub_enabled = int(os.getenv("WEB_CONCURRENCY", "1")) > 1
+        else:
+            self.pubsub_enabled = pubsub == "true"
+        self._instance_id = uuid.uuid4().hex
+        self._subscriber_thread = None
+        self.stats = {'l2_hits': 0, 'l2_misses': 0}
+        # Per-namespace (key prefix) lookup counters for hit-rate reporting
+        self._namespace_stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+        # Single-flight: in-flight computations per key, shared across event loops
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self.lock_ttl = int(os.getenv("CACHE_LOCK_TTL", "60"))
+        self.lock_poll_interval = float(os.getenv("CACHE_LOCK_POLL_INTERVAL", "0.1"))
+        self.single_flight_stats = {'computed': 0, 'coalesced': 0}
+        # Tag -> keys index (and key -> tags, to unindex evicted keys) for the
+        # in-memory fallback; Redis keeps tags in sorted sets
+        self._local_tags: Dict[str, set] = {}
+        self._local_key_tags: Dict[str, set] = {}
+        self._local_tags_lock = threading.Lock()
+
         self.redis_client = None
-        self.local_cache = {}
-        
+
         try:
             if self.enabled:
-                self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
+                # Shares RedisManager's bounded connection pool
+                self.redis_client = get_redis_client(self.redis_url)
                 self.redis_client.ping()
                 logger.info("CacheManager: Connected to Redis")
+                if self.pubsub_enabled:
+                    self._start_invalidation_listener()
         except Exception as e:
             logger.warning(f"CacheManager: Failed to connect to Redis, using in-memory fallback. Error: {e}")
             self.redis_client = None
@@ -37,7 +217,8 @@ class CacheManager:
     def generate_key(self, prefix: str, data: Dict[str, Any]) -> str:
         """Generate a consistent cache key based on data content."""
         try:
-            # Sort keys to ensure consistent ordering
+            # Sort keys to ensure consistent ordering. Deliberately the stdlib
+            # encoder: key hashes must not change with the JSON_CODEC setting.
             serialized = json.dumps(data, sort_keys=True)
             hash_val = hashlib.sha256(serialized.encode()).hexdigest()
             return f"{prefix}:{hash_val}"
@@ -46,59 +227,456 @@ class CacheManager:
             return f"{prefix}:{hashlib.sha256(str(data).encode()).hexdigest()}"
 
     def get(self, key: str) -> Optional[Any]:
-        """Retrieve item from cache."""
+        """Retrieve item from cache (L1 first, then Redis)."""
         if not self.enabled:
             return None
-            
+
         try:
+            serialized = self.local_cache.get(key)
+            if serialized is not None:
+                self._record_lookup(key, hit=True)
+                return json_codec.loads(serialized)
+
             if self.redis_client:
-                data = self.redis_client.get(key)
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get(key)
+                pipe.pttl(key)
+                data, pttl = pipe.execute()
                 if data:
-                    return json.loads(data)
-            else:
-                # Simple in-memory fallback (no generic TTL enforcement for simplicity in fallback)
-                return self.local_cache.get(key)
+                    self.stats['l2_hits'] += 1
+                    self._record_lookup(key, hit=True)
+                    self._fill_l1(key, data, pttl)
+                    return json_codec.loads(data)
+                self.stats['l2_misses'] += 1
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             return None
-            
+
+        self._record_lookup(key, hit=False)
         return None
 
-    def set(self, key: str, value: Any, ttl: int = None) -> bool:
-        """Store item in cache with TTL."""
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Retrieve several items at once: L1 first, then one MGET round trip
+        for the keys L1 did not have.
+
+        Returns:
+            The values found, by key (missing keys are absent)
+        """
+        if not self.enabled:
+            return {}
+
+        keys = list(keys)
+        found = {}
+        try:
+            missing = []
+            for key in keys:
+                serialized = self.local_cache.get(key)
+                if serialized is not None:
+                    found[key] = json_codec.loads(serialized)
+                else:
+                    missing.append(key)
+
+            if missing and self.redis_client:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.mget(missing)
+                for key in missing:
+                    pipe.pttl(key)
+                values, *pttls = pipe.execute()
+                for key, data, pttl in zip(missing, values, pttls):
+                    if data:
+                        self.stats['l2_hits'] += 1
+                        self._fill_l1(key, data, pttl)
+                        found[key] = json_codec.loads(data)
+                    else:
+                        self.stats['l2_misses'] += 1
+        except Exception as e:
+            logger.error(f"Cache get_many error: {e}")
+            return {}
+
+        for key in keys:
+            self._record_lookup(key, hit=key in found)
+        return found
+
+    def _fill_l1(self, key: str, serialized: str, pttl: Optional[int]) -> None:
+        """
+        Copy an L2 hit into L1, for no longer than the key has left in Redis.
+
+        pttl is Redis' remaining lifetime in milliseconds (negative when the
+        key has no expiry). Without the cap an entry read just before its
+        Redis expiry would be served from L1 for another full l1_ttl.
+        """
+        ttl = self.l1_ttl
+        if pttl is not None and pttl >= 0:
+            ttl = min(ttl, pttl / 1000)
+        if ttl > 0:
+            self.local_cache.set(key, serialized, ttl)
+
+    def set(self, key: str, value: Any, ttl: int = None, tags: Optional[Iterable[str]] = None) -> bool:
+        """
+        Store item in cache with TTL.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            ttl: Time to live in seconds
+            tags: Optional tags (e.g. "user:<id>", "agent:<name>") so the key can
+                later be dropped with invalidate_tags without scanning the keyspace
+        """
         if not self.enabled:
             return False
-            
+
         ttl = ttl or self.default_ttl
-        
+        tags = list(tags or [])
+
         try:
-            serialized_value = json.dumps(value)
+            serialized_value = json_codec.dumps(value)
             if self.redis_client:
-                self.redis_client.setex(key, timedelta(seconds=ttl), serialized_value)
+                now = time.time()
+                expires_at = now + ttl
+                pipe = self.redis_client.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.ttl(f"{TAG_PREFIX}{tag}")
+                pipe.setex(key, timedelta(seconds=ttl), serialized_value)
+                for tag in tags:
+                    tag_key = f"{TAG_PREFIX}{tag}"
+                    # Members are scored by expiry, so dead ones can be pruned here
+                    pipe.zadd(tag_key, {key: expires_at})
+                    pipe.zremrangebyscore(tag_key, '-inf', now)
+                tag_ttls = pipe.execute()[:len(tags)]
+                self._extend_tag_expiry(tags, tag_ttls, now, expires_at)
+                self.local_cache.set(key, serialized_value, min(ttl, self.l1_ttl))
+                self._publish_invalidation(key=key)
             else:
-                self.local_cache[key] = value
+                # Index first: if the entry is evicted straight away, on_remove unindexes it
+                self._remember_local_tags(key, tags)
+                if not self.local_cache.set(key, serialized_value, ttl):
+                    self._forget_local_tags(key)
             return True
         except Exception as e:
             logger.error(f"Cache set error: {e}")
             return False
 
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = None,
+        tags: Optional[Iterable[str]] = None,
+        should_cache: Optional[Callable[[Any], bool]] = None
+    ) -> Tuple[Any, str]:
+        """
+        Return the cached value for key, computing it at most once.
+
+        Concurrent callers in this process await the same in-flight
+        computation; callers in other processes wait on a short Redis lock
+        and pick up the value once the owner stores it.
+
+        Args:
+            key: Cache key
+            compute: Coroutine factory producing the value on a miss
+            ttl: Time to live for the stored value
+            tags: Tags passed through to set
+            should_cache: Predicate deciding whether a computed value is stored
+
+        Returns:
+            (value, source) where source is 'cache', 'coalesced' or 'computed'
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached, 'cache'
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            self.single_flight_stats['coalesced'] += 1
+            # Each waiter gets its own copy, like a cache read would
+            return copy.deepcopy(await asyncio.wrap_future(future)), 'coalesced'
+
+        try:
+            value, source = await self._compute_once(key, compute, ttl, tags, should_cache)
+            future.set_result(value)
+            return value, source
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    async def _compute_once(self, key, compute, ttl, tags, should_cache) -> Tuple[Any, str]:
+        """Compute under the cross-process lock, or wait for the process holding it."""
+        lock_key = f"{LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        locked = False
+
+        if self.enabled and self.redis_client:
+            deadline = time.monotonic() + self.lock_ttl
+            while True:
+                try:
+                    locked = bool(self.redis_client.set(lock_key, token, nx=True, ex=self.lock_ttl))
+                except Exception as e:
+                    logger.warning(f"Cache lock unavailable, computing without it: {e}")
+                    break
+                if locked:
+                    break
+
+                # Another process owns the computation; its result lands in the cache
+                await asyncio.sleep(self.lock_poll_interval)
+                cached = self.get(key)
+                if cached is not None:
+                    self.single_flight_stats['coalesced'] += 1
+                    return cached, 'coalesced'
+                if time.monotonic() >= deadline:
+                    break
+
+        try:
+            value = await compute()
+            self.single_flight_stats['computed'] += 1
+            if should_cache is None or should_cache(value):
+                self.set(key, value, ttl=ttl, tags=tags)
+            return value, 'computed'
+        finally:
+            if locked:
+                try:
+                    self.redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Cache lock release failed (expires in {self.lock_ttl}s): {e}")
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Invalidate every key stored under any of the given tags.
+
+        Costs O(number of tagged keys), not a walk of the whole keyspace.
+
+        Returns:
+            Number of keys invalidated
+        """
+        if not self.enabled or not tags:
+            return 0
+
+        try:
+            if self.redis_client:
+                tag_keys = [f"{TAG_PREFIX}{tag}" for tag in tags]
+                pipe = self.redis_client.pipeline(transaction=False)
+                for tag_key in tag_keys:
+                    # Members already expired need no unlinking
+                    pipe.zrangebyscore(tag_key, time.time(), '+inf')
+                keys = set().union(*pipe.execute())
+
+                pipe = self.redis_client.pipeline(transaction=False)
+                for batch in _batched(list(keys), SCAN_BATCH_SIZE):
+                    pipe.unlink(*batch)
+                pipe.unlink(*tag_keys)
+                pipe.execute()
+                self._publish_invalidation(keys=list(keys))
+            else:
+                with self._local_tags_lock:
+                    keys = set()
+                    for tag in tags:
+                        keys |= self._local_tags.pop(tag, set())
+
+            for key in keys:
+                self.local_cache.delete(key)
+            return len(keys)
+        except Exception as e:
+            logger.error(f"Cache tag invalidation error: {e}")
+            return 0
+
+    def add_tags(self, keys: Iterable[str], tags: Iterable[str]) -> int:
+        """
+        Add tags to entries already in the cache, keeping their existing ones.
+
+        For entries reused by callers other than the one that stored them
+        (e.g. a proposal shared across users), so invalidating any of the
+        callers drops the entry. Keys no longer cached are skipped.
+
+        Returns:
+            Number of keys tagged
+        """
+        keys = list(keys)
+        tags = list(tags)
+        if not self.enabled or not keys or not tags:
+            return 0
+
+        try:
+            if self.redis_client:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key in keys:
+                    pipe.pttl(key)
+                for tag in tags:
+                    pipe.ttl(f"{TAG_PREFIX}{tag}")
+                results = pipe.execute()
+                pttls, tag_ttls = results[:len(keys)], results[len(keys):]
+
+                now = time.time()
+                # Scored by the entry's own expiry, as set() does
+                members = {key: now + pttl / 1000 for key, pttl in zip(keys, pttls) if pttl > 0}
+                if not members:
+                    return 0
+                pipe = self.redis_client.pipeline(transaction=False)
+                for tag in tags:
+                    pipe.zadd(f"{TAG_PREFIX}{tag}", members)
+                pipe.execute()
+                self._extend_tag_expiry(tags, tag_ttls, now, max(members.values()))
+                return len(members)
+
+            with self._local_tags_lock:
+                # Only keys still in L1 are indexed (tagged entries always are)
+                tagged = [key for key in keys if key in self._local_key_tags]
+                for key in tagged:
+                    self._local_key_tags[key].update(tags)
+                    for tag in tags:
+                        self._local_tags.setdefault(tag, set()).add(key)
+            return len(tagged)
+        except Exception as e:
+            logger.error(f"Cache add_tags error: {e}")
+            return 0
+
+    def _extend_tag_expiry(self, tags: List[str], tag_ttls: List[int], now: float, expires_at: float) -> None:
+        """
+        Keep each tag set alive as long as its longest-lived member.
+
+        The set's expiry only moves when a new member outlives it, and then
+        with TAG_EXPIRY_GRACE_SECONDS of headroom so steady writes do not
+        cost an extra round trip each.
+        """
+        stale = [
+            f"{TAG_PREFIX}{tag}" for tag, tag_ttl in zip(tags, tag_ttls)
+            if tag_ttl < 0 or now + tag_ttl < expires_at
+        ]
+        if stale:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for tag_key in stale:
+                pipe.expireat(tag_key, int(expires_at + TAG_EXPIRY_GRACE_SECONDS))
+            pipe.execute()
+
+    def _remember_local_tags(self, key: str, tags: List[str]) -> None:
+        """Index a fallback-mode key under its tags (replacing its previous tags)."""
+        self._forget_local_tags(key)
+        if not tags:
+            return
+        with self._local_tags_lock:
+            self._local_key_tags[key] = set(tags)
+            for tag in tags:
+                self._local_tags.setdefault(tag, set()).add(key)
+
+    def _forget_local_tags(self, key: str) -> None:
+        """Unindex a key that left L1 (evicted, expired or deleted)."""
+        with self._local_tags_lock:
+            for tag in self._local_key_tags.pop(key, ()):
+                keys = self._local_tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._local_tags[tag]
+
     def invalidate_pattern(self, pattern: str):
-        """Invalidate keys matching a pattern."""
+        """
+        Invalidate keys matching a pattern.
+
+        Prefer invalidate_tags; this walks Redis incrementally with SCAN
+        so the server is never blocked the way KEYS would block it.
+        """
         if not self.enabled:
             return
 
         try:
+            self.local_cache.delete_matching(pattern)
             if self.redis_client:
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    self.redis_client.delete(*keys)
-            else:
-                # Simple prefix matching for local cache
-                keys_to_delete = [k for k in self.local_cache.keys() if k.startswith(pattern.replace('*', ''))]
-                for k in keys_to_delete:
-                    del self.local_cache[k]
+                batch = []
+                for key in self.redis_client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE):
+                    batch.append(key)
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        self.redis_client.unlink(*batch)
+                        batch = []
+                if batch:
+                    self.redis_client.unlink(*batch)
+                self._publish_invalidation(pattern=pattern)
         except Exception as e:
             logger.error(f"Cache invalidation error: {e}")
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-tier hit/miss, eviction and size counters."""
+        return {
+            'enabled': self.enabled,
+            'mode': 'redis' if self.redis_client else 'in-memory',
+            'l1': self.local_cache.get_stats(),
+            'l2': dict(self.stats),
+            'hit_rates': self.get_hit_rates(),
+            'single_flight': {**self.single_flight_stats, 'in_flight': len(self._inflight)},
+            'pubsub_invalidation': bool(self._subscriber_thread)
+        }
+
+    def get_hit_rates(self) -> Dict[str, Dict[str, Any]]:
+        """Get lookup hits, misses and hit rate per key namespace."""
+        with self._stats_lock:
+            return {
+                namespace: {
+                    **counts,
+                    'hit_rate': round(counts['hits'] / (counts['hits'] + counts['misses']), 4)
+                }
+                for namespace, counts in self._namespace_stats.items()
+            }
+
+    def _record_lookup(self, key: str, hit: bool) -> None:
+        """Count a lookup against its namespace (the key minus its final hash segment)."""
+        namespace = key.rsplit(':', 1)[0]
+        with self._stats_lock:
+            counts = self._namespace_stats.setdefault(namespace, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def _publish_invalidation(
+        self,
+        key: Optional[str] = None,
+        pattern: Optional[str] = None,
+        keys: Optional[List[str]] = None
+    ) -> None:
+        """Tell other workers to drop their L1 copy of a key, key list or pattern."""
+        if not (self.pubsub_enabled and self.redis_client):
+            return
+        try:
+            self.redis_client.publish(INVALIDATION_CHANNEL, json_codec.dumps({
+                'origin': self._instance_id,
+                'key': key,
+                'keys': keys,
+                'pattern': pattern
+            }))
+        except Exception as e:
+            logger.warning(f"Cache invalidation publish failed: {e}")
+
+    def _start_invalidation_listener(self) -> None:
+        """Subscribe to invalidation messages from other workers in a daemon thread."""
+        # A dedicated connection: it blocks for the life of the process, so it
+        # must neither hold a pool slot nor be subject to the pool's read timeout
+        subscriber = redis.from_url(self.redis_url, decode_responses=True)
+        pubsub = subscriber.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(INVALIDATION_CHANNEL)
+
+        def listen():
+            for message in pubsub.listen():
+                try:
+                    payload = json_codec.loads(message['data'])
+                    if payload.get('origin') == self._instance_id:
+                        continue
+                    if payload.get('key'):
+                        self.local_cache.delete(payload['key'])
+                    for key in payload.get('keys') or []:
+                        self.local_cache.delete(key)
+                    if payload.get('pattern'):
+                        self.local_cache.delete_matching(payload['pattern'])
+                except Exception as e:
+                    logger.warning(f"Cache invalidation message ignored: {e}")
+
+        self._subscriber_thread = threading.Thread(
+            target=listen, name="cache-invalidation", daemon=True
+        )
+        self._subscriber_thread.start()
+
 def get_cache_manager():
     return CacheManager()
@@ -1,37 +1,204 @@
-from typing import List, Dict, Any
+"""
+Chat history for the /chat coach.
+
+Each user's recent messages live in a Redis list (``chat:history:<user_id>``)
+so every worker sees the same conversation. When the list reaches twice
+CHAT_HISTORY_WINDOW messages, the older half is folded into a rolling
+summary (``chat:summary:<user_id>``) that is trimmed to
+CHAT_SUMMARY_MAX_TOKENS, oldest lines first. Both keys expire after
+CHAT_HISTORY_TTL_SECONDS without activity. The prompt context is
+therefore bounded: the summary plus at most two windows of recent turns.
+
+Without Redis the same structure is kept in process memory.
+"""
+
+import logging
+import re
+import threading
 import time
+from typing import Any, Dict, List, Optional
+
+import redis
+
+from wellsync_ai.data.redis_client import get_redis_manager
+from wellsync_ai.utils import json_codec
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.llm_scheduler import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+HISTORY_PREFIX = "chat:history:"
+SUMMARY_PREFIX = "chat:summary:"
+# Characters of each compacted message kept in the summary
+SUMMARY_LINE_CHARS = 200
+COMPACT_RETRIES = 3
+
+
+def summarize_messages(summary: str, messages: List[Dict[str, Any]], max_tokens: int) -> str:
+    """
+    Fold messages into a rolling summary of at most max_tokens.
+
+    Each message becomes one "role: text" line, clipped to
+    SUMMARY_LINE_CHARS; the oldest lines are dropped first when over budget.
+    """
+    lines = summary.splitlines() if summary else []
+    for message in messages:
+        text = re.sub(r"\s+", " ", str(message.get('content', ''))).strip()
+        if len(text) > SUMMARY_LINE_CHARS:
+            text = text[:SUMMARY_LINE_CHARS - 3].rstrip() + "..."
+        lines.append(f"{message.get('role', 'user')}: {text}")
+
+    while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return "\n".join(lines)
+
 
 class ChatContext:
     """
     Manages chat context and history for a user.
-    Currently uses in-memory storage, but can be extended to Redis/DB.
+
+    Backed by Redis when available, with an in-process fallback.
     """
-    
-    # Simple in-memory storage for hackathon usage
-    _memory_storage: Dict[str, List[Dict[str, Any]]] = {}
-    
+
+    # Fallback storage when Redis is unavailable: user_id -> {messages, summary, expires_at}
+    _memory_storage: Dict[str, Dict[str, Any]] = {}
+    _memory_lock = threading.Lock()
+
     def __init__(self, user_id: str):
         self.user_id = user_id
-        if user_id not in self._memory_storage:
-            self._memory_storage[user_id] = []
-            
+        self.config = get_config()
+        self.window = self.config.chat_history_window
+        self.ttl = self.config.chat_history_ttl_seconds
+        self.summary_max_tokens = self.config.chat_summary_max_tokens
+        self.history_key = f"{HISTORY_PREFIX}{user_id}"
+        self.summary_key = f"{SUMMARY_PREFIX}{user_id}"
+        self.redis_client = get_redis_manager().client
+
     def add_message(self, role: str, content: str):
         """Add a message to the history."""
-        self._memory_storage[self.user_id].append({
-            "role": role,
-            "content": content,
-            "timestamp": time.time()
-        })
-        
+        self.add_messages([{"role": role, "content": content}])
+
+    def add_messages(self, messages: List[Dict[str, str]]):
+        """Append several messages (e.g. a user turn and its reply) in one round trip."""
+        now = time.time()
+        entries = [{"role": m["role"], "content": m["content"], "timestamp": now} for m in messages]
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.rpush(self.history_key, *[json_codec.dumps(entry) for entry in entries])
+                pipe.expire(self.history_key, self.ttl)
+                pipe.expire(self.summary_key, self.ttl)
+                length = pipe.execute()[0]
+                if length >= 2 * self.window:
+                    self._compact_redis()
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Chat history write failed, using in-memory fallback: {e}")
+                self.redis_client = None
+
+        with self._memory_lock:
+            record = self._memory_record(create=True)
+            record["messages"].extend(entries)
+            if len(record["messages"]) >= 2 * self.window:
+                cut = len(record["messages"]) - self.window
+                record["summary"] = summarize_messages(
+                    record["summary"], record["messages"][:cut], self.summary_max_tokens
+                )
+                del record["messages"][:cut]
+
     def get_history(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent chat history."""
-        return self._memory_storage[self.user_id][-limit:]
-        
+        if self.redis_client:
+            try:
+                return [json_codec.loads(item) for item in self.redis_client.lrange(self.history_key, -limit, -1)]
+            except redis.RedisError as e:
+                logger.warning(f"Chat history read failed, using in-memory fallback: {e}")
+                self.redis_client = None
+
+        with self._memory_lock:
+            record = self._memory_record()
+            return list(record["messages"][-limit:]) if record else []
+
+    def get_summary(self) -> str:
+        """Get the rolling summary of turns older than the recent window."""
+        if self.redis_client:
+            try:
+                return self.redis_client.get(self.summary_key) or ""
+            except redis.RedisError as e:
+                logger.warning(f"Chat summary read failed, using in-memory fallback: {e}")
+                self.redis_client = None
+
+        with self._memory_lock:
+            record = self._memory_record()
+            return record["summary"] if record else ""
+
     def get_context_string(self) -> str:
-        """Format history as a context string for the LLM."""
-        history = self.get_history()
-        return "\n".join([f"{msg['role']}: {msg['content']}" for msg in history])
-        
+        """Format the summary and recent history as a context string for the LLM."""
+        if self.redis_client:
+            try:
+                pipe = self.redis_client.pipeline(transaction=False)
+                pipe.get(self.summary_key)
+                pipe.lrange(self.history_key, -2 * self.window, -1)
+                summary, items = pipe.execute()
+                history = [json_codec.loads(item) for item in items]
+            except redis.RedisError:
+                summary, history = self.get_summary(), self.get_history(2 * self.window)
+        else:
+            summary, history = self.get_summary(), self.get_history(2 * self.window)
+
+        recent = "\n".join([f"{msg['role']}: {msg['content']}" for msg in history])
+        if summary:
+            return f"Earlier in this conversation:\n{summary}\n\nRecent messages:\n{recent}"
+        return recent
+
     def clear_history(self):
         """Clear user history."""
-        self._memory_storage[self.user_id] = []
+        if self.redis_client:
+            try:
+                self.redis_client.delete(self.history_key, self.summary_key)
+            except redis.RedisError as e:
+                logger.warning(f"Chat history clear failed: {e}")
+        with self._memory_lock:
+            self._memory_storage.pop(self.user_id, None)
+
+    def _compact_redis(self) -> None:
+        """
+        Move all but the newest window of messages into the summary.
+
+        Optimistic transaction: if another worker appends or compacts
+        meanwhile, retry; after COMPACT_RETRIES the next append tries again.
+        """
+        for _ in range(COMPACT_RETRIES):
+            with self.redis_client.pipeline() as pipe:
+                try:
+                    pipe.watch(self.history_key, self.summary_key)
+                    length = pipe.llen(self.history_key)
+                    cut = length - self.window
+                    if cut <= 0:
+                        return
+                    old = [json_codec.loads(item) for item in pipe.lrange(self.history_key, 0, cut - 1)]
+                    summary = summarize_messages(pipe.get(self.summary_key) or "", old, self.summary_max_tokens)
+
+                    pipe.multi()
+                    pipe.ltrim(self.history_key, cut, -1)
+                    pipe.set(self.summary_key, summary, ex=self.ttl)
+                    pipe.execute()
+                    return
+                except redis.WatchError:
+                    continue
+
+    def _memory_record(self, create: bool = False) -> Optional[Dict[str, Any]]:
+        """Fallback record for this user (caller holds _memory_lock); expired ones are dropped."""
+        now = time.time()
+        record = self._memory_storage.get(self.user_id)
+        if record and record["expires_at"] <= now:
+            del self._memory_storage[self.user_id]
+            record = None
+        if record is None and create:
+            # Opportunistically drop other users' expired conversations
+            for user_id in [u for u, r in self._memory_storage.items() if r["expires_at"] <= now]:
+                del self._memory_storage[user_id]
+            record = self._memory_storage[self.user_id] = {"messages": [], "summary": ""}
+        if record is not None and create:
+            record["expires_at"] = now + self.ttl
+        return record
@@ -0,0 +1,191 @@
+"""
+Transparent compression for large stored payloads.
+
+JSON values at or above COMPRESSION_MIN_BYTES are compressed before they
+are written to Redis or SQLite and prefixed with a small header: the magic
+bytes ``\\x00WZ`` followed by a one-byte algorithm id. JSON text never
+starts with a NUL byte, so rows and keys written before compression was
+enabled (and small values written since) read back unchanged.
+
+zstd (``zstandard``) and lz4 (``lz4``) are used when installed; zlib from
+the standard library is always available. Decompression dispatches on the
+header rather than on configuration, so switching COMPRESSION_ALGORITHM
+never makes existing data unreadable.
+"""
+
+import logging
+import threading
+import zlib
+from typing import Dict, Optional, Type, Union
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+from wellsync_ai.utils.config import get_config
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"\x00WZ"
+HEADER_SIZE = len(MAGIC) + 1
+
+Payload = Union[str, bytes, bytearray, memoryview]
+
+
+class Compressor:
+    """zlib compressor; the always-available baseline."""
+
+    name = "zlib"
+    algorithm_id = b"d"
+    level = 6
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class ZstdCompressor(Compressor):
+    """zstd: better ratio than zlib at several times the speed."""
+
+    name = "zstd"
+    algorithm_id = b"z"
+    level = 3
+
+    def compress(self, data: bytes) -> bytes:
+        # zstandard compressor objects are not safe to share across threads
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+class Lz4Compressor(Compressor):
+    """lz4 frames: lowest CPU cost, somewhat larger output than zstd."""
+
+    name = "lz4"
+    algorithm_id = b"4"
+    level = 0
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data, compression_level=self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4.frame.decompress(data)
+
+
+# Every known format, so headers can be recognised even when the library is missing
+_FORMATS: Dict[bytes, str] = {
+    Compressor.algorithm_id: Compressor.name,
+    ZstdCompressor.algorithm_id: ZstdCompressor.name,
+    Lz4Compressor.algorithm_id: Lz4Compressor.name,
+}
+
+_COMPRESSORS: Dict[str, Type[Compressor]] = {"zlib": Compressor}
+if ZSTD_AVAILABLE:
+    _COMPRESSORS["zstd"] = ZstdCompressor
+if LZ4_AVAILABLE:
+    _COMPRESSORS["lz4"] = Lz4Compressor
+
+_decoders: Dict[bytes, Compressor] = {}
+_compressor: Optional[Compressor] = None
+_min_bytes: Optional[int] = None
+_lock = threading.Lock()
+
+
+def register_compressor(name: str, compressor_class: Type[Compressor]) -> None:
+    """Make a compressor selectable with COMPRESSION_ALGORITHM / set_compressor."""
+    _COMPRESSORS[name] = compressor_class
+    _FORMATS[compressor_class.algorithm_id] = name
+
+
+def available_compressors() -> Dict[str, Type[Compressor]]:
+    """Registered compressors by name."""
+    return dict(_COMPRESSORS)
+
+
+def set_compressor(name: str, min_bytes: Optional[int] = None) -> Optional[Compressor]:
+    """
+    Switch the process-wide compressor.
+
+    'auto' picks zstd, then lz4, then zlib; 'none' disables compression
+    for new writes (compressed data is still read).
+    """
+    global _compressor, _min_bytes
+    if name == "auto":
+        name = next(n for n in ("zstd", "lz4", "zlib") if n in _COMPRESSORS)
+    elif name != "none" and name not in _COMPRESSORS:
+        logger.warning(f"Compression algorithm '{name}' is not available, using zlib")
+        name = "zlib"
+    with _lock:
+        _compressor = None if name == "none" else _COMPRESSORS[name]()
+        _min_bytes = get_config().compression_min_bytes if min_bytes is None else min_bytes
+    return _compressor
+
+
+def get_compressor() -> Optional[Compressor]:
+    """Get the compressor for new writes, chosen from config on first use."""
+    if _min_bytes is None:
+        return set_compressor(get_config().compression_algorithm)
+    return _compressor
+
+
+def is_compressed(data: Optional[Payload]) -> bool:
+    """Whether data carries the compression header."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return isinstance(data, (bytes, bytearray)) and data[:len(MAGIC)] == MAGIC
+
+
+def compress(data: Union[str, bytes]) -> Union[str, bytes]:
+    """
+    Compress an encoded payload if it is large enough to be worth it.
+
+    Returns the input unchanged below the size threshold, when compression
+    is disabled, or when the compressed form would not be smaller.
+    """
+    compressor = get_compressor()
+    if compressor is None or len(data) < _min_bytes:
+        return data
+    raw = data.encode("utf-8") if isinstance(data, str) else data
+    packed = MAGIC + compressor.algorithm_id + compressor.compress(raw)
+    return packed if len(packed) < len(raw) else data
+
+
+def decompress(data: Payload) -> Union[str, bytes]:
+    """Undo compress(); payloads without the header are returned as-is."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if not is_compressed(data):
+        return data
+    algorithm_id = bytes(data[len(MAGIC):HEADER_SIZE])
+    return _decoder(algorithm_id).decompress(bytes(data[HEADER_SIZE:]))
+
+
+def decompress_text(data: Optional[Payload]) -> Optional[str]:
+    """decompress() to text, for callers that expect the JSON string."""
+    if data is None:
+        return None
+    data = decompress(data)
+    return data if isinstance(data, str) else bytes(data).decode("utf-8")
+
+
+def _decoder(algorithm_id: bytes) -> Compressor:
+    decoder = _decoders.get(algorithm_id)
+    if decoder is None:
+        name = _FORMATS.get(algorithm_id)
+        if name is None:
+            raise ValueError(f"Unknown compression format {algorithm_id!r}")
+        if name not in _COMPRESSORS:
+            raise ValueError(f"Payload is {name}-compressed but {name} is not installed")
+        decoder = _decoders[algorithm_id] = _COMPRESSORS[name]()
+    return decoder
@@ -38,6 +38,27 @@ class WellSyncConfig(BaseSettings):
         """Get list of fallback models to try when rate limited."""
         return [m.strip() for m in self.llm_fallback_models.split(",") if m.strip()]
     
+    # Provider rate limits as "provider:requests_per_min:tokens_per_min", comma-separated
+    llm_rate_limits: str = Field(
+        "gemini:60:1000000,openai:500:200000,groq:30:6000,anthropic:50:40000",
+        env="LLM_RATE_LIMITS"
+    )
+    llm_requests_per_minute: int = Field(60, env="LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: int = Field(200000, env="LLM_TOKENS_PER_MINUTE")
+    llm_max_backoff_seconds: int = Field(60, env="LLM_MAX_BACKOFF_SECONDS")
+    
+    def get_llm_rate_limits(self) -> dict:
+        """Parse LLM_RATE_LIMITS into {provider: (requests_per_min, tokens_per_min)}."""
+        limits = {}
+        for entry in self.llm_rate_limits.split(","):
+            parts = [p.strip() for p in entry.split(":")]
+            if len(parts) == 3 and parts[0]:
+                try:
+                    limits[parts[0].lower()] = (int(parts[1]), int(parts[2]))
+                except ValueError:
+                    continue
+        return limits
+    
     # Recommended Model Options (2025):
     # - Gemini: gemini/gemini-3-flash-preview (Fastest), gemini/gemini-2.5-flash (Reliable)
     # - Groq: groq/llama-3-70b-8192 (Open Source alternative)
@@ -47,6 +68,32 @@ class WellSyncConfig(BaseSettings):
     database_url: str = Field("sqlite:///data/databases/wellsync.db", env="DATABASE_URL")
     redis_url: str = Field("redis://localhost:6379/0", env="REDIS_URL")
     
+    # Shared Redis connection pool (RedisManager and CacheManager)
+    redis_max_connections: int = Field(50, env="REDIS_MAX_CONNECTIONS")
+    redis_pool_timeout_seconds: float = Field(5.0, env="REDIS_POOL_TIMEOUT_SECONDS")
+    
+    # SQLite Connection Pool Configuration
+    sqlite_pool_size: int = Field(8, env="SQLITE_POOL_SIZE")
+    sqlite_pool_timeout_seconds: float = Field(10.0, env="SQLITE_POOL_TIMEOUT_SECONDS")
+    sqlite_busy_timeout_ms: int = Field(5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_cache_size_kb: int = Field(16384, env="SQLITE_CACHE_SIZE_KB")
+    sqlite_mmap_size_bytes: int = Field(268435456, env="SQLITE_MMAP_SIZE_BYTES")
+    sqlite_statement_cache_size: int = Field(256, env="SQLITE_STATEMENT_CACHE_SIZE")
+    
+    # JSON codec for state, cache and DB payloads: auto (orjson if installed), orjson or stdlib
+    json_codec: str = Field("auto", env="JSON_CODEC")
+    
+    # Compression of large Redis/SQLite payloads: auto (zstd, lz4, then zlib), zstd, lz4, zlib or none
+    compression_algorithm: str = Field("auto", env="COMPRESSION_ALGORITHM")
+    compression_min_bytes: int = Field(1024, env="COMPRESSION_MIN_BYTES")
+    
+    # Write-behind buffer for logs, agent memory and API request records
+    db_write_behind_enabled: bool = Field(True, env="DB_WRITE_BEHIND_ENABLED")
+    db_write_behind_max_queue: int = Field(10000, env="DB_WRITE_BEHIND_MAX_QUEUE")
+    db_write_behind_batch_size: int = Field(500, env="DB_WRITE_BEHIND_BATCH_SIZE")
+    db_write_behind_flush_interval_ms: int = Field(200, env="DB_WRITE_BEHIND_FLUSH_INTERVAL_MS")
+    db_write_behind_enqueue_timeout_ms: int = Field(50, env="DB_WRITE_BEHIND_ENQUEUE_TIMEOUT_MS")
+    
     # Supabase Configuration
     supabase_url: Optional[str] = Field(None, env="SUPABASE_URL")
     supabase_key: Optional[str] = Field(None, env="SUPABASE_KEY")
@@ -71,15 +118,44 @@ class WellSyncConfig(BaseSettings):
     agent_temperature: float = Field(0.1, env="AGENT_TEMPERATURE")
     agent_max_tokens: int = Field(2000, env="AGENT_MAX_TOKENS")
     agent_retry_attempts: int = Field(3, env="AGENT_RETRY_ATTEMPTS")
+    # Prompt budgets (estimated tokens): whole prompt, prior-plan history, and the
+    # context window swarms keeps for each agent's conversation
+    agent_prompt_max_tokens: int = Field(6000, env="AGENT_PROMPT_MAX_TOKENS")
+    agent_history_max_tokens: int = Field(800, env="AGENT_HISTORY_MAX_TOKENS")
+    agent_context_length: int = Field(32000, env="AGENT_CONTEXT_LENGTH")
     
     # System Configuration
     log_level: str = Field("INFO", env="LOG_LEVEL")
     max_concurrent_agents: int = Field(4, env="MAX_CONCURRENT_AGENTS")
     workflow_timeout_seconds: int = Field(300, env="WORKFLOW_TIMEOUT_SECONDS")
     
+    # Agent Pool Configuration
+    agent_pool_size: int = Field(2, env="AGENT_POOL_SIZE")
+    agent_pool_checkout_timeout_seconds: int = Field(30, env="AGENT_POOL_CHECKOUT_TIMEOUT_SECONDS")
+    agent_pool_warmup: bool = Field(True, env="AGENT_POOL_WARMUP")
+    plan_job_workers: int = Field(2, env="PLAN_JOB_WORKERS")
+    swarm_worker_timeout_seconds: int = Field(20, env="SWARM_WORKER_TIMEOUT_SECONDS")
+    
+    # Proposal Cache Configuration
+    agent_cache_share_across_users: bool = Field(True, env="AGENT_CACHE_SHARE_ACROSS_USERS")
+    
     # Memory Configuration
     memory_retention_days: int = Field(90, env="MEMORY_RETENTION_DAYS")
     redis_memory_ttl_seconds: int = Field(3600, env="REDIS_MEMORY_TTL_SECONDS")
+    # Op-log commits between full shared state snapshots
+    shared_state_snapshot_interval: int = Field(20, env="SHARED_STATE_SNAPSHOT_INTERVAL")
+    # Hydrated SharedState objects kept in memory per process (LRU)
+    shared_state_cache_size: int = Field(1000, env="SHARED_STATE_CACHE_SIZE")
+    shared_state_cache_max_mb: int = Field(256, env="SHARED_STATE_CACHE_MAX_MB")
+    shared_state_idle_ttl_seconds: int = Field(1800, env="SHARED_STATE_IDLE_TTL_SECONDS")
+    shared_state_sweep_interval_seconds: int = Field(60, env="SHARED_STATE_SWEEP_INTERVAL_SECONDS")
+    # Chat history: recent messages sent verbatim, older ones folded into a bounded summary
+    chat_history_window: int = Field(12, env="CHAT_HISTORY_WINDOW")
+    chat_summary_max_tokens: int = Field(400, env="CHAT_SUMMARY_MAX_TOKENS")
+    chat_history_ttl_seconds: int = Field(604800, env="CHAT_HISTORY_TTL_SECONDS")
+    # Cached digest of the user's latest plan, injected into chat prompts
+    chat_plan_digest_max_tokens: int = Field(300, env="CHAT_PLAN_DIGEST_MAX_TOKENS")
+    chat_plan_digest_ttl_seconds: int = Field(86400, env="CHAT_PLAN_DIGEST_TTL_SECONDS")
     
     # Safety and Limits
     max_workout_intensity: float = Field(0.9, env="MAX_WORKOUT_INTENSITY")
@@ -124,6 +200,12 @@ def validate_config() -> bool:
         if config.agent_max_tokens < 100:
             raise ValueError("AGENT_MAX_TOKENS must be at least 100")
         
+        if config.agent_context_length < config.agent_prompt_max_tokens + config.agent_max_tokens:
+            raise ValueError("AGENT_CONTEXT_LENGTH must fit AGENT_PROMPT_MAX_TOKENS plus AGENT_MAX_TOKENS")
+        
+        if config.plan_job_workers > config.agent_pool_size:
+            raise ValueError("PLAN_JOB_WORKERS must not exceed AGENT_POOL_SIZE")
+        
         if config.max_workout_intensity < 0.1 or config.max_workout_intensity > 1.0:
             raise ValueError("MAX_WORKOUT_INTENSITY must be between 0.1 and 1.0")
         
@@ -0,0 +1,113 @@
+"""
+Input fingerprinting for WellSync AI proposal caching.
+
+Agents declare which (optionally bucketed) input fields affect their
+output. The fingerprint is a canonical, order-independent view of just
+those fields, so equivalent requests - including requests from different
+users with the same profile - map to the same cache key.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+# Bump when prompts change in a way that should invalidate cached proposals
+FINGERPRINT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class FingerprintField:
+    """
+    One input that influences an agent's proposal.
+
+    Attributes:
+        path: Dotted path rooted at 'user_profile', 'constraints' or
+            'shared_state' (e.g. 'user_profile.goals.fitness')
+        bucket: Round numeric values down to a multiple of this step
+        unordered: Treat lists as sets (e.g. equipment, allergies)
+    """
+    path: str
+    bucket: Optional[float] = None
+    unordered: bool = False
+
+
+def canonicalize(value: Any, unordered: bool = False) -> Any:
+    """
+    Normalize a JSON-like value so equivalent encodings compare equal.
+
+    - Integral floats become ints (3.0 == 3) and floats are rounded
+    - Strings are stripped; strings in unordered lists are also case-folded
+    - Empty values and None inside dicts are dropped (agents treat them
+      like missing keys)
+    - Lists keep their order unless ``unordered`` is set
+    """
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        return round(value, 6)
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        result = {}
+        for key in sorted(value, key=str):
+            item = canonicalize(value[key])
+            if item is None or item == {} or item == [] or item == '':
+                continue
+            result[str(key)] = item
+        return result
+    if isinstance(value, (list, tuple, set)):
+        items = [canonicalize(item) for item in value]
+        if unordered or isinstance(value, set):
+            items = [item.casefold() if isinstance(item, str) else item for item in items]
+            unique = {json.dumps(item, sort_keys=True): item for item in items}
+            items = [unique[token] for token in sorted(unique)]
+        return items
+    return str(value)
+
+
+def bucket_number(value: Any, step: float) -> Any:
+    """Round a number down to a multiple of ``step``; non-numbers pass through."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or step <= 0:
+        return value
+    bucketed = (value // step) * step
+    return int(bucketed) if float(bucketed).is_integer() else bucketed
+
+
+def resolve_path(sources: Dict[str, Any], path: str) -> Any:
+    """Follow a dotted path through nested dicts, returning None when absent."""
+    current: Any = sources
+    for part in path.split('.'):
+        if not isinstance(current, dict):
+            return None
+        current = current.get(part)
+        if current is None:
+            return None
+    return current
+
+
+def build_fingerprint(fields: Iterable[FingerprintField], sources: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract and canonicalize the declared fields from the request inputs.
+
+    Args:
+        fields: Field declarations
+        sources: {'user_profile': ..., 'constraints': ..., 'shared_state': ...}
+
+    Returns:
+        Canonical dict suitable for CacheManager.generate_key
+    """
+    fingerprint: Dict[str, Any] = {'v': FINGERPRINT_VERSION}
+    for field in fields:
+        value = resolve_path(sources, field.path)
+        if field.bucket is not None:
+            value = bucket_number(value, field.bucket)
+        value = canonicalize(value, unordered=field.unordered)
+        if value is None or value == {} or value == [] or value == '':
+            continue
+        fingerprint[field.path] = value
+    return fingerprint
+
@@ -0,0 +1,183 @@
+"""
+JSON codec layer for WellSync AI.
+
+All state, cache and database payloads are encoded through this module so
+the implementation can be swapped in one place. orjson is used when it is
+installed (several times faster than the stdlib for both directions and
+UTF-8 native); otherwise, or with JSON_CODEC=stdlib, the standard library
+``json`` module is used. Both produce JSON that either can read back.
+
+Typed decoding: ``from_dict``/``loads_as`` build the dataclass records used
+for known state shapes (AgentProposal, BudgetState, ...) from decoded
+JSON, recursing into nested dataclass fields and ignoring unknown keys.
+"""
+
+import dataclasses
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Union, get_type_hints
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from wellsync_ai.utils.config import get_config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class JSONCodec:
+    """Standard library codec; the reference behaviour for other codecs."""
+
+    name = "stdlib"
+
+    def dumps(
+        self,
+        obj: Any,
+        *,
+        sort_keys: bool = False,
+        indent: Optional[int] = None,
+        default: Optional[Callable[[Any], Any]] = None
+    ) -> str:
+        return json.dumps(obj, sort_keys=sort_keys, indent=indent, default=default)
+
+    def dumps_bytes(self, obj: Any, **kwargs) -> bytes:
+        return self.dumps(obj, **kwargs).encode("utf-8")
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson-backed codec. Falls back to the stdlib for values orjson rejects."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._fallback = JSONCodec()
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return self.dumps_bytes(obj, **kwargs).decode("utf-8")
+
+    def dumps_bytes(
+        self,
+        obj: Any,
+        *,
+        sort_keys: bool = False,
+        indent: Optional[int] = None,
+        default: Optional[Callable[[Any], Any]] = None
+    ) -> bytes:
+        if indent not in (None, 2):
+            return self._fallback.dumps_bytes(obj, sort_keys=sort_keys, indent=indent, default=default)
+
+        # Match the stdlib in accepting int/float/bool/None dict keys
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib raises if it also can't
+            return self._fallback.dumps_bytes(obj, sort_keys=sort_keys, indent=indent, default=default)
+
+    def loads(self, data: Union[str, bytes, bytearray, memoryview]) -> Any:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+
+
+_CODECS: Dict[str, Type[JSONCodec]] = {"stdlib": JSONCodec}
+if ORJSON_AVAILABLE:
+    _CODECS["orjson"] = OrjsonCodec
+
+_codec: Optional[JSONCodec] = None
+_codec_lock = threading.Lock()
+
+
+def register_codec(name: str, codec_class: Type[JSONCodec]) -> None:
+    """Make a codec selectable with JSON_CODEC / set_codec."""
+    _CODECS[name] = codec_class
+
+
+def available_codecs() -> Dict[str, Type[JSONCodec]]:
+    """Registered codecs by name."""
+    return dict(_CODECS)
+
+
+def set_codec(name: str) -> JSONCodec:
+    """Switch the process-wide codec ('auto' picks the fastest available)."""
+    global _codec
+    if name == "auto":
+        name = "orjson" if "orjson" in _CODECS else "stdlib"
+    if name not in _CODECS:
+        logger.warning(f"JSON codec '{name}' is not available, using stdlib")
+        name = "stdlib"
+    with _codec_lock:
+        _codec = _CODECS[name]()
+    return _codec
+
+
+def get_codec() -> JSONCodec:
+    """Get the process-wide codec, chosen from config on first use."""
+    if _codec is None:
+        return set_codec(get_config().json_codec)
+    return _codec
+
+
+def dumps(obj: Any, **kwargs) -> str:
+    """Encode to a JSON string (kwargs: sort_keys, indent, default)."""
+    return get_codec().dumps(obj, **kwargs)
+
+
+def dumps_bytes(obj: Any, **kwargs) -> bytes:
+    """Encode to UTF-8 JSON bytes."""
+    return get_codec().dumps_bytes(obj, **kwargs)
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Decode JSON from str or bytes."""
+    return get_codec().loads(data)
+
+
+def from_dict(cls: Type[T], data: Dict[str, Any]) -> T:
+    """
+    Build a dataclass record from decoded JSON.
+
+    Nested dataclass fields are built recursively; keys that are not
+    fields are ignored so older or newer payloads still load.
+    """
+    hints = _field_types(cls)
+    kwargs = {}
+    for name, field_type in hints.items():
+        if name not in data:
+            continue
+        value = data[name]
+        if dataclasses.is_dataclass(field_type) and isinstance(value, dict):
+            value = from_dict(field_type, value)
+        kwargs[name] = value
+    return cls(**kwargs)
+
+
+def loads_as(data: Union[str, bytes], cls: Type[T]) -> T:
+    """Decode JSON straight into a dataclass record."""
+    return from_dict(cls, loads(data))
+
+
+_field_type_cache: Dict[type, Dict[str, Any]] = {}
+
+
+def _field_types(cls: type) -> Dict[str, Any]:
+    types = _field_type_cache.get(cls)
+    if types is None:
+        resolved = get_type_hints(cls)
+        types = {field.name: resolved.get(field.name) for field in dataclasses.fields(cls) if field.init}
+        _field_type_cache[cls] = types
+    return types
@@ -1,25 +1,84 @@
+"""
+Gemini chat clients for the /chat coach.
+
+``genai.configure`` and ``GenerativeModel`` construction happen once per
+process: get_chat_client_pool() holds one long-lived client per chat
+model (LLM_MODEL followed by LLM_FALLBACK_MODELS, Gemini models only,
+since this SDK talks to Gemini). Requests go to the first healthy model.
+A model that fails is put in a cooldown that doubles with each
+consecutive failure, and rate limits are reported to the shared
+LLMScheduler, so the next request moves on to a fallback instead of
+retrying a model that is known to be down.
+
+Responses can also be streamed token by token (stream_response); fallback
+to another model is then only possible until the first token is sent.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
 import structlog
 try:
     import google.generativeai as genai
 except ImportError:
     genai = None
 
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.error_manager import WellnessError, ErrorSeverity
 from wellsync_ai.utils.llm_config import LLMConfig
+from wellsync_ai.utils.llm_scheduler import LLMPriority, LLMScheduler, get_llm_scheduler, estimate_tokens
 
 logger = structlog.get_logger()
 
+DEFAULT_CHAT_MODEL = 'gemini/gemini-3-flash-preview'
+NOT_CONFIGURED_RESPONSE = "I am unable to process your request at the moment (LLM not configured)."
+
+# System Prompt for Wellness Coach
+SYSTEM_PROMPT = """You are the WellSync AI Wellness Coach.
+Your goal is to help users improve their health through holistic plans covering fitness, nutrition, sleep, and mental wellness.
+You are supportive, knowledgeable, data-driven, and concise.
+Always answer in the context of the user's wellness journey.
+Do not offer generic AI assistance (like writing essays or coding) unless it relates to the health app.
+If you don't know something, suggest the user consult a professional healthcare provider."""
+
+_genai_lock = threading.Lock()
+_genai_api_key: Optional[str] = None
+
+
+def _configure_genai(api_key: str) -> None:
+    """Configure the SDK once per process (and again only if the key changes)."""
+    global _genai_api_key
+    with _genai_lock:
+        if _genai_api_key != api_key:
+            genai.configure(api_key=api_key)
+            _genai_api_key = api_key
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return '429' in str(error) or 'quota' in str(error).lower()
+
+
+class ChatModelsUnavailable(WellnessError):
+    """Raised when every configured chat model failed for a request."""
+
+    def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
+        super().__init__(message, severity=ErrorSeverity.RECOVERABLE, context=context)
+
+
 class GoogleGeminiChat:
     """
     Wrapper for Google Gemini Chat API.
     """
-    
-    def __init__(self, config: LLMConfig):
+
+    def __init__(self, config: LLMConfig, model_name: str = DEFAULT_CHAT_MODEL):
         self.config = config
+        self.model_name = model_name
         if genai and self.config.api_key:
             try:
-                genai.configure(api_key=self.config.api_key)
-                self.model = genai.GenerativeModel('gemini-3-flash-preview')
-                logger.info("Gemini Model configured successfully")
+                _configure_genai(self.config.api_key)
+                self.model = genai.GenerativeModel(model_name.split('/', 1)[-1])
+                logger.info("Gemini Model configured successfully", model=model_name)
             except Exception as e:
                 self.model = None
                 logger.error(f"Gemini configuration failed: {e}")
@@ -27,28 +86,241 @@ class GoogleGeminiChat:
              self.model = None
              reason = "genai lib missing" if not genai else "API Key missing"
              logger.warning(f"Gemini API not configured: {reason}")
-             
+
+    def build_prompt(self, message: str, context: str = "") -> str:
+        """Construct the coach prompt with context."""
+        context_str = str(context) if context else ""
+        return f"{SYSTEM_PROMPT}\n\nContext: {context_str}\n\nUser: {message}\nAI:"
+
+    def complete(self, message: str, context: str = "") -> str:
+        """Generate a response, raising on failure (rate limits are reported to the scheduler)."""
+        prompt = self.build_prompt(message, context)
+        get_llm_scheduler().acquire_sync(
+            self.model_name,
+            estimate_tokens(prompt, self.config.max_tokens),
+            LLMPriority.CHAT
+        )
+        try:
+            response = self.model.generate_content(prompt)
+        except Exception as e:
+            if _is_rate_limit(e):
+                get_llm_scheduler().report_rate_limited(self.model_name)
+            raise
+        get_llm_scheduler().report_success(self.model_name)
+        return response.text
+
+    def stream(self, message: str, context: str = "") -> Iterator[str]:
+        """Yield the response text as the model produces it, raising on failure."""
+        prompt = self.build_prompt(message, context)
+        get_llm_scheduler().acquire_sync(
+            self.model_name,
+            estimate_tokens(prompt, self.config.max_tokens),
+            LLMPriority.CHAT
+        )
+        try:
+            for chunk in self.model.generate_content(prompt, stream=True):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. the final finish-reason chunk)
+                    continue
+                if text:
+                    yield text
+        except Exception as e:
+            if _is_rate_limit(e):
+                get_llm_scheduler().report_rate_limited(self.model_name)
+            raise
+        get_llm_scheduler().report_success(self.model_name)
+
     def generate_response(self, message: str, context: str = "") -> str:
         """
         Generate a response from the LLM.
         """
         if not self.model:
-            return "I am unable to process your request at the moment (LLM not configured)."
-            
-        try:
-            # System Prompt for Wellness Coach
-            system_prompt = """You are the WellSync AI Wellness Coach. 
-Your goal is to help users improve their health through holistic plans covering fitness, nutrition, sleep, and mental wellness.
-You are supportive, knowledgeable, data-driven, and concise. 
-Always answer in the context of the user's wellness journey.
-Do not offer generic AI assistance (like writing essays or coding) unless it relates to the health app.
-If you don't know something, suggest the user consult a professional healthcare provider."""
+            return NOT_CONFIGURED_RESPONSE
 
-            # Construct prompt with context
-            context_str = str(context) if context else ""
-            prompt = f"{system_prompt}\n\nContext: {context_str}\n\nUser: {message}\nAI:"
-            response = self.model.generate_content(prompt)
-            return response.text
+        try:
+            return self.complete(message, context)
         except Exception as e:
             logger.error("LLM Generation Failed", error=str(e))
             return "I'm having trouble thinking right now. Please try again later."
+
+
+class ChatClientPool:
+    """
+    Process-wide chat clients, one per model, with health tracking.
+
+    Clients are built once and shared by all requests. Each model tracks
+    successes, failures and a cooldown after consecutive failures; healthy
+    models are tried in configured order and a model in cooldown is only
+    tried when no healthy one is left.
+    """
+
+    def __init__(self, models: Optional[List[str]] = None, config: Optional[LLMConfig] = None):
+        settings = get_config()
+        self.config = config or LLMConfig()
+        self.max_cooldown = float(settings.llm_max_backoff_seconds)
+        if models is None:
+            models = [settings.llm_model] + settings.get_fallback_models()
+        models = [m for m in dict.fromkeys(models) if LLMScheduler.provider_for(m) == 'gemini']
+        self.models = models or [DEFAULT_CHAT_MODEL]
+
+        self._lock = threading.Lock()
+        self._clients: Dict[str, GoogleGeminiChat] = {}
+        self._health: Dict[str, Dict[str, Any]] = {
+            model: {'successes': 0, 'failures': 0, 'consecutive_failures': 0,
+                    'last_error': None, 'cooldown_until': 0.0}
+            for model in self.models
+        }
+
+    def warm_up(self) -> int:
+        """Build every client up front. Returns the number with a usable model."""
+        return sum(1 for model in self.models if self._client(model).model is not None)
+
+    def generate_response(self, message: str, context: str = "") -> str:
+        """
+        Generate a response from the first healthy model.
+
+        Raises:
+            ChatModelsUnavailable: if every configured model failed
+        """
+        attempted = []
+        last_error: Optional[Exception] = None
+        for model in self._candidates():
+            client = self._client(model)
+            if client.model is None:
+                continue
+            attempted.append(model)
+            try:
+                response = client.complete(message, context)
+            except Exception as e:
+                self._record_failure(model, e)
+                last_error = e
+                continue
+            self._record_success(model)
+            return response
+
+        if not attempted:
+            return NOT_CONFIGURED_RESPONSE
+        raise ChatModelsUnavailable(
+            f"All chat models failed: {last_error}",
+            context={'models': attempted}
+        )
+
+    def stream_response(self, message: str, context: str = "") -> Iterator[str]:
+        """
+        Stream a response from the first healthy model.
+
+        A model that fails before its first token falls back to the next
+        one; a failure mid-response is raised, since another model's answer
+        cannot be spliced onto a partial one.
+
+        Raises:
+            ChatModelsUnavailable: if every configured model failed
+        """
+        attempted = []
+        last_error: Optional[Exception] = None
+        for model in self._candidates():
+            client = self._client(model)
+            if client.model is None:
+                continue
+            attempted.append(model)
+            started = False
+            try:
+                for text in client.stream(message, context):
+                    started = True
+                    yield text
+            except Exception as e:
+                self._record_failure(model, e)
+                if started:
+                    raise
+                last_error = e
+                continue
+            self._record_success(model)
+            return
+
+        if not attempted:
+            yield NOT_CONFIGURED_RESPONSE
+            return
+        raise ChatModelsUnavailable(
+            f"All chat models failed: {last_error}",
+            context={'models': attempted}
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-model health for monitoring."""
+        now = time.monotonic()
+        scheduler = get_llm_scheduler()
+        with self._lock:
+            return {
+                model: {
+                    'configured': model in self._clients and self._clients[model].model is not None,
+                    'healthy': health['cooldown_until'] <= now and not scheduler.is_blocked(model),
+                    'successes': health['successes'],
+                    'failures': health['failures'],
+                    'consecutive_failures': health['consecutive_failures'],
+                    'last_error': health['last_error']
+                }
+                for model, health in self._health.items()
+            }
+
+    def _candidates(self) -> List[str]:
+        """Healthy models in configured order, then the rest by soonest recovery."""
+        now = time.monotonic()
+        scheduler = get_llm_scheduler()
+        with self._lock:
+            healthy = [m for m in self.models
+                       if self._health[m]['cooldown_until'] <= now and not scheduler.is_blocked(m)]
+            cooling = sorted(
+                (m for m in self.models if m not in healthy),
+                key=lambda m: self._health[m]['cooldown_until']
+            )
+        return healthy + cooling
+
+    def _client(self, model: str) -> GoogleGeminiChat:
+        client = self._clients.get(model)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(model)
+                if client is None:
+                    client = self._clients[model] = GoogleGeminiChat(self.config, model)
+        return client
+
+    def _record_success(self, model: str) -> None:
+        with self._lock:
+            health = self._health[model]
+            health['successes'] += 1
+            health['consecutive_failures'] = 0
+            health['cooldown_until'] = 0.0
+
+    def _record_failure(self, model: str, error: Exception) -> None:
+        logger.warning("Chat model failed, trying fallback", model=model, error=str(error))
+        with self._lock:
+            health = self._health[model]
+            health['failures'] += 1
+            health['consecutive_failures'] += 1
+            health['last_error'] = str(error)[:200]
+            # Rate limits are tracked by the scheduler; other errors back off here
+            if not _is_rate_limit(error):
+                cooldown = min(self.max_cooldown, 2 ** (health['consecutive_failures'] - 1))
+                health['cooldown_until'] = time.monotonic() + cooldown
+
+
+# Global chat client pool
+_chat_client_pool: Optional[ChatClientPool] = None
+_chat_client_pool_lock = threading.Lock()
+
+
+def get_chat_client_pool() -> ChatClientPool:
+    """Get the process-wide chat client pool."""
+    global _chat_client_pool
+    if _chat_client_pool is None:
+        with _chat_client_pool_lock:
+            if _chat_client_pool is None:
+                _chat_client_pool = ChatClientPool()
+    return _chat_client_pool
+
+
+def warm_up_chat_clients() -> int:
+    """Eagerly build the process-wide chat clients."""
+    return get_chat_client_pool().warm_up()
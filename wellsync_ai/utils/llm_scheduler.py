@@ -0,0 +1,237 @@
+"""
+Rate-limit-aware LLM request scheduler for WellSync AI system.
+
+Admits LLM calls against per-provider token buckets (requests/min and
+tokens/min), lets higher-priority traffic dip deeper into the buckets,
+and backs off per model when a provider answers with HTTP 429. Calls
+are only delayed when the configured quota actually requires it.
+"""
+
+import asyncio
+import enum
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
+
+from wellsync_ai.utils.config import get_config
+
+
+class LLMPriority(enum.Enum):
+    """Priority classes for LLM traffic, highest first."""
+    CHAT = "chat"                    # Interactive coach messages
+    PLAN = "plan"                    # Wellness plan domain agents / coordinator
+    SWARM_WORKER = "swarm_worker"    # Nutrition swarm worker analyses
+
+
+# Fraction of each bucket that must remain after admission, per priority.
+# Chat may drain a bucket completely; background work leaves headroom for it.
+PRIORITY_RESERVE = {
+    LLMPriority.CHAT: 0.0,
+    LLMPriority.PLAN: 0.1,
+    LLMPriority.SWARM_WORKER: 0.25,
+}
+
+
+class TokenBucket:
+    """Continuously refilling token bucket (not thread-safe on its own)."""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.tokens = float(capacity)
+        self._last_refill = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self._last_refill = now
+
+    def time_until_available(self, amount: float, reserve: float = 0.0, now: Optional[float] = None) -> float:
+        """Seconds until ``amount`` can be taken while leaving ``reserve`` of capacity."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        # Requests larger than the bucket are admitted once it is full
+        needed = min(amount + reserve * self.capacity, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float('inf')
+        return (needed - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= amount
+
+
+class LLMScheduler:
+    """
+    Central admission control for outbound LLM calls.
+
+    Thread-safe: agents running on different event loops (one per plan
+    job) and synchronous callers share the same buckets.
+    """
+
+    def __init__(self, rate_limits: Optional[Dict[str, Tuple[int, int]]] = None):
+        config = get_config()
+        self._rate_limits = rate_limits if rate_limits is not None else config.get_llm_rate_limits()
+        self._default_limits = (config.llm_requests_per_minute, config.llm_tokens_per_minute)
+        self._max_backoff = float(config.llm_max_backoff_seconds)
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[TokenBucket, TokenBucket]] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._consecutive_429s: Dict[str, int] = {}
+        self._stats = {'admitted': 0, 'delayed': 0, 'total_wait_seconds': 0.0, 'rate_limited': 0}
+
+    @staticmethod
+    def provider_for(model_name: str) -> str:
+        """Map a LiteLLM model string (e.g. 'gemini/gemini-2.5-flash') to its provider."""
+        if '/' in model_name:
+            return model_name.split('/', 1)[0].lower()
+        if model_name.startswith(('gpt-', 'o1', 'o3')):
+            return 'openai'
+        if model_name.startswith('gemini'):
+            return 'gemini'
+        if model_name.startswith('claude'):
+            return 'anthropic'
+        return 'default'
+
+    async def acquire(
+        self,
+        model_name: str,
+        estimated_tokens: int,
+        priority: LLMPriority = LLMPriority.PLAN
+    ) -> float:
+        """
+        Wait until a call to ``model_name`` is admitted.
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self._try_admit(model_name, estimated_tokens, priority)
+            if delay <= 0:
+                self._record_admission(waited)
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def acquire_sync(
+        self,
+        model_name: str,
+        estimated_tokens: int,
+        priority: LLMPriority = LLMPriority.PLAN
+    ) -> float:
+        """Blocking variant of acquire for synchronous call sites."""
+        waited = 0.0
+        while True:
+            delay = self._try_admit(model_name, estimated_tokens, priority)
+            if delay <= 0:
+                self._record_admission(waited)
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def report_rate_limited(self, model_name: str, retry_after: Optional[float] = None) -> float:
+        """
+        Record a 429 from the provider and block the model until it may retry.
+
+        Uses the provider's Retry-After when given, otherwise exponential
+        backoff (1s, 2s, 4s, ... capped at llm_max_backoff_seconds).
+
+        Returns:
+            Backoff applied in seconds
+        """
+        with self._lock:
+            count = self._consecutive_429s.get(model_name, 0) + 1
+            self._consecutive_429s[model_name] = count
+            backoff = retry_after if retry_after else min(self._max_backoff, 2 ** (count - 1))
+            self._blocked_until[model_name] = max(
+                self._blocked_until.get(model_name, 0.0),
+                time.monotonic() + backoff
+            )
+            self._stats['rate_limited'] += 1
+            return backoff
+
+    def report_success(self, model_name: str) -> None:
+        """Reset the 429 backoff streak for a model."""
+        with self._lock:
+            self._consecutive_429s.pop(model_name, None)
+
+    def is_blocked(self, model_name: str) -> bool:
+        """Check whether a model is currently backing off after a 429."""
+        with self._lock:
+            return self._blocked_until.get(model_name, 0.0) > time.monotonic()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission counters and current bucket levels."""
+        with self._lock:
+            now = time.monotonic()
+            buckets = {}
+            for provider, (requests, tokens) in self._buckets.items():
+                requests.time_until_available(0, now=now)
+                tokens.time_until_available(0, now=now)
+                buckets[provider] = {
+                    'requests_available': round(requests.tokens, 2),
+                    'tokens_available': int(tokens.tokens)
+                }
+            return {**self._stats, 'buckets': buckets}
+
+    def _try_admit(self, model_name: str, estimated_tokens: int, priority: LLMPriority) -> float:
+        """Consume quota and return 0, or return how long to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+
+            blocked_for = self._blocked_until.get(model_name, 0.0) - now
+            if blocked_for > 0:
+                return blocked_for
+
+            requests, tokens = self._get_buckets(self.provider_for(model_name))
+            reserve = PRIORITY_RESERVE.get(priority, 0.0)
+            delay = max(
+                requests.time_until_available(1, reserve, now),
+                tokens.time_until_available(estimated_tokens, reserve, now)
+            )
+            if delay > 0:
+                return delay
+
+            requests.consume(1)
+            tokens.consume(estimated_tokens)
+            return 0.0
+
+    def _get_buckets(self, provider: str) -> Tuple[TokenBucket, TokenBucket]:
+        if provider not in self._buckets:
+            rpm, tpm = self._rate_limits.get(provider, self._default_limits)
+            self._buckets[provider] = (
+                TokenBucket(rpm, rpm / 60.0),
+                TokenBucket(tpm, tpm / 60.0)
+            )
+        return self._buckets[provider]
+
+    def _record_admission(self, waited: float) -> None:
+        with self._lock:
+            self._stats['admitted'] += 1
+            if waited > 0:
+                self._stats['delayed'] += 1
+                self._stats['total_wait_seconds'] += waited
+
+
+def estimate_tokens(text: str, max_output_tokens: int = 0) -> int:
+    """Rough token estimate (~4 characters per token) plus the output allowance."""
+    return len(text) // 4 + max_output_tokens
+
+
+# Global scheduler instance
+_llm_scheduler: Optional[LLMScheduler] = None
+_llm_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the process-wide LLM scheduler."""
+    global _llm_scheduler
+    if _llm_scheduler is None:
+        with _llm_scheduler_lock:
+            if _llm_scheduler is None:
+                _llm_scheduler = LLMScheduler()
+    return _llm_scheduler
@@ -0,0 +1,125 @@
+"""
+Cached wellness plan digests for the /chat coach.
+
+Instead of loading the latest plan from the database and pasting the
+whole dict into every chat prompt, /chat uses a compact, pre-rendered
+digest of it: one line per plan section, with nested values flattened
+and clipped, and the whole digest capped at CHAT_PLAN_DIGEST_MAX_TOKENS.
+Digests are cached per user (users without a plan included) under the
+``plan:<user_id>`` tag, which is invalidated whenever a new plan is
+stored.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Optional
+
+from wellsync_ai.utils import json_codec
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.llm_scheduler import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PREFIX = "chat:plan_digest:"
+# Characters kept per plan section line, and per flattened value within it
+DIGEST_LINE_CHARS = 300
+DIGEST_VALUE_CHARS = 80
+# Items kept from each list, and how deep nested dicts are flattened
+DIGEST_LIST_ITEMS = 3
+DIGEST_MAX_DEPTH = 2
+
+
+def _clip(text: str, limit: int) -> str:
+    text = re.sub(r"\s+", " ", text).strip()
+    if len(text) > limit:
+        return text[:limit - 3].rstrip() + "..."
+    return text
+
+
+def _compact(value: Any, depth: int = 0) -> str:
+    """Flatten a plan value into a short "key=value; ..." string."""
+    if isinstance(value, dict):
+        if depth >= DIGEST_MAX_DEPTH:
+            return ", ".join(str(k) for k in value)
+        parts = []
+        for key, item in value.items():
+            rendered = _compact(item, depth + 1)
+            if rendered:
+                parts.append(f"{key}={rendered}" if depth == 0 else f"{key}: {rendered}")
+        return "; ".join(parts) if depth == 0 else f"({', '.join(parts)})"
+    if isinstance(value, (list, tuple)):
+        items = [_compact(item, depth) for item in value[:DIGEST_LIST_ITEMS]]
+        rendered = ", ".join(item for item in items if item)
+        if len(value) > DIGEST_LIST_ITEMS:
+            rendered += f" (+{len(value) - DIGEST_LIST_ITEMS} more)"
+        return f"[{rendered}]"
+    if value is None or value == "":
+        return ""
+    return _clip(str(value), DIGEST_VALUE_CHARS)
+
+
+def render_plan_digest(plan_data: Any, max_tokens: int) -> str:
+    """
+    Render a wellness plan as a bounded digest.
+
+    Each top-level section becomes one line clipped to DIGEST_LINE_CHARS;
+    sections are added in plan order until max_tokens is reached.
+    """
+    if isinstance(plan_data, str):
+        try:
+            plan_data = json_codec.loads(plan_data)
+        except ValueError:
+            return _clip(plan_data, max_tokens * 4)
+    if not isinstance(plan_data, dict):
+        return ""
+
+    lines = []
+    for section, value in plan_data.items():
+        rendered = _compact(value)
+        if not rendered:
+            continue
+        line = _clip(f"{section}: {rendered}", DIGEST_LINE_CHARS)
+        if estimate_tokens("\n".join(lines + [line])) > max_tokens:
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def get_plan_digest(user_id: str) -> Dict[str, Optional[str]]:
+    """
+    Get the digest of the user's latest wellness plan.
+
+    Returns:
+        {'digest': str, 'plan_date': str or None}; the digest is empty
+        when the user has no plan yet
+    """
+    from wellsync_ai.utils.cache_manager import get_cache_manager
+    cache_manager = get_cache_manager()
+    key = f"{DIGEST_PREFIX}{user_id}"
+
+    cached = cache_manager.get(key)
+    if cached is not None:
+        return cached
+
+    from wellsync_ai.data.database import get_database_manager
+    config = get_config()
+    recent_plans = get_database_manager().get_user_history(user_id, limit=1)
+
+    entry = {'digest': '', 'plan_date': None}
+    if recent_plans:
+        latest_plan = recent_plans[0]
+        entry = {
+            'digest': render_plan_digest(latest_plan.get('plan_data', {}), config.chat_plan_digest_max_tokens),
+            'plan_date': latest_plan.get('timestamp')
+        }
+
+    cache_manager.set(key, entry, ttl=config.chat_plan_digest_ttl_seconds, tags=[f"plan:{user_id}"])
+    return entry
+
+
+def invalidate_plan_digest(user_id: Optional[str]) -> None:
+    """Drop the cached digest after a new plan was stored for the user."""
+    if not user_id:
+        return
+    from wellsync_ai.utils.cache_manager import get_cache_manager
+    get_cache_manager().invalidate_tags(f"plan:{user_id}")
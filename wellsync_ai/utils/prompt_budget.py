@@ -0,0 +1,202 @@
+"""
+Token budgeting for agent prompts.
+
+Agent prompts are assembled from sections with PromptBuilder. Each
+section may have its own token cap, and the whole prompt has a budget
+(AGENT_PROMPT_MAX_TOKENS). When the prompt is over budget, the
+lowest-priority sections are truncated first, and dropped if too little
+of them would be left. REQUIRED sections (the request header, hard
+constraints, the task) are never touched.
+
+Structured data goes into prompts through compact_json. It produces JSON
+without indentation, with long key words abbreviated (``duration_minutes``
+becomes ``dur_mins``). Given a token cap, it keeps the most recent (last)
+items of long lists before falling back to cutting the text.
+
+Token counts use the scheduler's estimate_tokens (~4 characters per token).
+"""
+
+import enum
+import json
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.llm_scheduler import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+TRUNCATION_MARKER = "[...truncated]"
+SECTION_SEPARATOR = "\n\n"
+# A section cut below this many tokens is dropped instead
+MIN_SECTION_TOKENS = 24
+# Cap for one bulky data field in a prompt (a history, another agent's proposal)
+FIELD_MAX_TOKENS = 600
+
+# Word-level key abbreviations; kept readable so the model needs no legend
+KEY_ABBREVIATIONS = {
+    'availability': 'avail',
+    'average': 'avg',
+    'calories': 'kcal',
+    'confidence': 'conf',
+    'configuration': 'config',
+    'description': 'desc',
+    'duration': 'dur',
+    'environment': 'env',
+    'estimated': 'est',
+    'frequency': 'freq',
+    'history': 'hist',
+    'hours': 'hrs',
+    'information': 'info',
+    'maximum': 'max',
+    'minimum': 'min',
+    'minutes': 'mins',
+    'number': 'num',
+    'percent': 'pct',
+    'percentage': 'pct',
+    'preference': 'pref',
+    'preferences': 'prefs',
+    'recommendation': 'rec',
+    'recommendations': 'recs',
+    'requirements': 'reqs',
+    'schedule': 'sched',
+    'seconds': 'secs',
+    'temperature': 'temp',
+    'timestamp': 'ts',
+}
+
+
+class PromptPriority(enum.IntEnum):
+    """How readily a section gives way when the prompt is over budget."""
+    LOW = 10         # Background: history, reference data
+    MEDIUM = 20      # Derived metrics, other agents' output
+    HIGH = 30        # The user's own profile and inputs
+    REQUIRED = 100   # Never truncated: request header, hard constraints, task
+
+
+@lru_cache(maxsize=1024)
+def abbreviate_key(key: str) -> str:
+    """Abbreviate the words of a snake_case key."""
+    return "_".join(KEY_ABBREVIATIONS.get(word, word) for word in key.split("_"))
+
+
+def _prepare(value: Any, max_items: Optional[int], abbreviate: bool) -> Any:
+    """Abbreviate keys and keep the last max_items of each list."""
+    if isinstance(value, dict):
+        return {
+            (abbreviate_key(key) if abbreviate and isinstance(key, str) else key): _prepare(item, max_items, abbreviate)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        items = [_prepare(item, max_items, abbreviate) for item in value]
+        if max_items is not None and len(items) > max_items:
+            return [f"+{len(items) - max_items} earlier"] + items[-max_items:]
+        return items
+    return value
+
+
+def _longest_list(value: Any) -> int:
+    if isinstance(value, dict):
+        return max((_longest_list(item) for item in value.values()), default=0)
+    if isinstance(value, (list, tuple)):
+        return max([len(value)] + [_longest_list(item) for item in value])
+    return 0
+
+
+def _dumps(value: Any) -> str:
+    # Prompt text rather than a stored payload, so the stdlib's separators
+    # option is used directly instead of the json_codec layer
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to max_tokens, preferably at a line break, marking the cut."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * 4 - len(TRUNCATION_MARKER) - 1)
+    cut = text[:limit]
+    newline = cut.rfind("\n")
+    if newline > limit // 2:
+        cut = cut[:newline]
+    return f"{cut.rstrip()}\n{TRUNCATION_MARKER}" if cut.strip() else TRUNCATION_MARKER
+
+
+def compact_json(value: Any, max_tokens: Optional[int] = None, abbreviate: bool = True) -> str:
+    """
+    Render a value as compact JSON for a prompt.
+
+    Args:
+        value: JSON-like value (non-serializable leaves are stringified)
+        max_tokens: Optional cap; lists are shortened to their most recent
+            items (halving until it fits) before the text itself is cut
+        abbreviate: Abbreviate key words (see KEY_ABBREVIATIONS)
+    """
+    text = _dumps(_prepare(value, None, abbreviate))
+    if max_tokens is None or estimate_tokens(text) <= max_tokens:
+        return text
+
+    max_items = _longest_list(value)
+    while max_items > 1:
+        max_items //= 2
+        text = _dumps(_prepare(value, max_items, abbreviate))
+        if estimate_tokens(text) <= max_tokens:
+            return text
+    return truncate_to_tokens(text, max_tokens)
+
+
+@dataclass
+class PromptSection:
+    """One block of a prompt."""
+    text: str
+    priority: PromptPriority
+    max_tokens: Optional[int] = None
+
+
+class PromptBuilder:
+    """
+    Assembles a prompt from prioritized sections within a token budget.
+
+    Sections are rendered in the order they were added, separated by a
+    blank line.
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        self.max_tokens = max_tokens or get_config().agent_prompt_max_tokens
+        self.sections: List[PromptSection] = []
+
+    def add(
+        self,
+        text: str,
+        priority: PromptPriority = PromptPriority.MEDIUM,
+        max_tokens: Optional[int] = None
+    ) -> "PromptBuilder":
+        """Add a section, optionally capped at max_tokens on its own."""
+        self.sections.append(PromptSection(text.strip("\n"), priority, max_tokens))
+        return self
+
+    def render(self) -> str:
+        """Render the prompt, truncating low-priority sections to fit the budget."""
+        texts = [
+            truncate_to_tokens(section.text, section.max_tokens) if section.max_tokens else section.text
+            for section in self.sections
+        ]
+
+        over = estimate_tokens(SECTION_SEPARATOR.join(texts)) - self.max_tokens
+        if over > 0:
+            # Lowest priority first; among equals, later sections give way first
+            candidates = sorted(
+                (i for i, section in enumerate(self.sections) if section.priority < PromptPriority.REQUIRED),
+                key=lambda i: (self.sections[i].priority, -i)
+            )
+            for i in candidates:
+                if over <= 0:
+                    break
+                keep = estimate_tokens(texts[i]) - over
+                texts[i] = truncate_to_tokens(texts[i], keep) if keep >= MIN_SECTION_TOKENS else ""
+                over = estimate_tokens(SECTION_SEPARATOR.join(t for t in texts if t)) - self.max_tokens
+
+            logger.debug(f"Prompt over budget ({self.max_tokens} tokens); truncated low-priority sections")
+
+        return "\n" + SECTION_SEPARATOR.join(text for text in texts if text) + "\n"
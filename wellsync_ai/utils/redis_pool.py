@@ -0,0 +1,100 @@
+"""
+Shared Redis connection pools for WellSync AI.
+
+RedisManager and CacheManager draw their connections from one bounded pool
+per Redis URL instead of each opening its own. A pool holds at most
+REDIS_MAX_CONNECTIONS sockets; when all are busy, callers wait up to
+REDIS_POOL_TIMEOUT_SECONDS for one to be released rather than opening
+more. Values that may be compressed are read through a second pool with
+response decoding turned off.
+
+Pools count checkouts (one per command or pipeline round trip), the time
+spent acquiring a connection (waiting for a free one, or connecting a new
+one) and failed checkouts; get_pool_stats() reports these next to the
+connection counts.
+"""
+
+import threading
+import time
+from typing import Any, Dict, Tuple
+
+import redis
+
+from wellsync_ai.utils.config import get_config
+
+
+class MeteredConnectionPool(redis.BlockingConnectionPool):
+    """BlockingConnectionPool that records checkout counts and wait time."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_errors = 0
+        self.wait_seconds = 0.0
+
+    def get_connection(self, *args, **kwargs):
+        start = time.monotonic()
+        try:
+            connection = super().get_connection(*args, **kwargs)
+        except Exception:
+            # Pool exhausted for longer than the timeout, or the connect failed
+            self.checkout_errors += 1
+            raise
+        self.checkouts += 1
+        self.wait_seconds += time.monotonic() - start
+        return connection
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Connection counts and checkout counters."""
+        connections = len(self._connections)
+        idle = sum(1 for connection in list(self.pool.queue) if connection is not None)
+        return {
+            'max_connections': self.max_connections,
+            'connections': connections,
+            'in_use': connections - idle,
+            'idle': idle,
+            'checkouts': self.checkouts,
+            'checkout_errors': self.checkout_errors,
+            'avg_wait_ms': round(self.wait_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0
+        }
+
+
+_pools: Dict[Tuple[str, bool], MeteredConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_redis_pool(redis_url: str, decode_responses: bool = True) -> MeteredConnectionPool:
+    """Get (creating on first use) the shared pool for a URL and decoding mode."""
+    key = (redis_url, decode_responses)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                config = get_config()
+                pool = MeteredConnectionPool.from_url(
+                    redis_url,
+                    max_connections=config.redis_max_connections,
+                    timeout=config.redis_pool_timeout_seconds,
+                    decode_responses=decode_responses,
+                    socket_connect_timeout=5,
+                    socket_timeout=5
+                )
+                _pools[key] = pool
+    return pool
+
+
+def get_redis_client(redis_url: str, decode_responses: bool = True) -> redis.Redis:
+    """A client backed by the shared pool; clients themselves are cheap."""
+    return redis.Redis(connection_pool=get_redis_pool(redis_url, decode_responses))
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats for every pool created in this process, keyed by endpoint and mode."""
+    stats = {}
+    for (_, decode_responses), pool in list(_pools.items()):
+        kwargs = pool.connection_kwargs
+        # Never expose the URL itself: it may carry credentials
+        endpoint = f"{kwargs.get('host', kwargs.get('path', ''))}:{kwargs.get('port', '')}/{kwargs.get('db', 0)}"
+        stats[f"{endpoint} ({'text' if decode_responses else 'binary'})"] = pool.get_stats()
+    return stats
@@ -3,4 +3,13 @@ Workflow orchestration module for WellSync AI system.
 
 Contains the 8-step wellness planning workflow orchestrator
 and related coordination logic.
-"""
\ No newline at end of file
+"""
+
+from .agent_pool import AgentPool, AgentSet, AgentPoolExhausted, get_agent_pool, warm_up_agent_pool
+from .plan_jobs import PlanJobRunner, run_plan_workflow, get_plan_job_runner
+
+__all__ = [
+    'AgentPool', 'AgentSet', 'AgentPoolExhausted',
+    'get_agent_pool', 'warm_up_agent_pool',
+    'PlanJobRunner', 'run_plan_workflow', 'get_plan_job_runner'
+]
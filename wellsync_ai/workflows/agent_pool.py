@@ -0,0 +1,187 @@
+"""
+Agent pool for WellSync AI workflows.
+
+Keeps long-lived sets of domain agents per process so wellness plan
+requests check out warm agents instead of constructing the coordinator,
+domain agents, LLM clients and memory stores on every call.
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+import structlog
+
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.error_manager import WellnessError, ErrorSeverity
+
+logger = structlog.get_logger()
+
+# How long check-in waits for an agent's background memory writes
+SIDE_EFFECT_DRAIN_SECONDS = 5.0
+
+
+class AgentPoolExhausted(WellnessError):
+    """Raised when no agent set becomes available within the checkout timeout."""
+
+    def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
+        super().__init__(message, severity=ErrorSeverity.RECOVERABLE, context=context)
+
+
+class AgentSet:
+    """
+    One coordinator plus the four domain agents used by a single workflow.
+
+    An AgentSet is only ever used by one request at a time; the pool
+    resets each agent's per-request state (session id, constraints,
+    per-user trackers, working memory) on checkout and check-in so that
+    nothing bleeds between requests.
+    """
+
+    def __init__(self):
+        from wellsync_ai.agents.fitness_agent import FitnessAgent
+        from wellsync_ai.agents.nutrition_agent import NutritionAgent
+        from wellsync_ai.agents.sleep_agent import SleepAgent
+        from wellsync_ai.agents.mental_wellness_agent import MentalWellnessAgent
+        from wellsync_ai.agents.coordinator_agent import CoordinatorAgent
+
+        self.coordinator = CoordinatorAgent()
+        self.agents = {
+            'FitnessAgent': FitnessAgent(),
+            'NutritionAgent': NutritionAgent(),
+            'SleepAgent': SleepAgent(),
+            'MentalWellnessAgent': MentalWellnessAgent()
+        }
+
+    def reset_session(self) -> None:
+        """Drop request-scoped state without touching persisted memory."""
+        for agent in [self.coordinator, *self.agents.values()]:
+            # Let the last request's memory writes land before the next one starts
+            if not agent.wait_for_side_effects(timeout=SIDE_EFFECT_DRAIN_SECONDS):
+                logger.warning("Agent memory writes still pending at check-in", agent=agent.agent_name)
+            agent.reset_state()
+
+
+class AgentPool:
+    """
+    Bounded pool of AgentSets.
+
+    Sets are created lazily up to ``size`` (or eagerly via ``warm_up``).
+    When every set is checked out, callers block for up to
+    ``checkout_timeout`` seconds before AgentPoolExhausted is raised.
+    """
+
+    def __init__(self, size: Optional[int] = None, checkout_timeout: Optional[float] = None):
+        config = get_config()
+        self.size = max(1, size or config.agent_pool_size)
+        self.checkout_timeout = (
+            checkout_timeout if checkout_timeout is not None
+            else config.agent_pool_checkout_timeout_seconds
+        )
+
+        self._available: "queue.Queue[AgentSet]" = queue.Queue(maxsize=self.size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checked_out = 0
+        self._total_checkouts = 0
+        self._timeouts = 0
+
+    def warm_up(self) -> int:
+        """Build every agent set up front. Returns the number of sets created."""
+        created = 0
+        while True:
+            agent_set = self._try_create()
+            if agent_set is None:
+                break
+            self._available.put(agent_set)
+            created += 1
+
+        logger.info("Agent pool warmed up", created=created, size=self.size)
+        return created
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[AgentSet]:
+        """
+        Check out an AgentSet for the duration of a workflow.
+
+        Usage:
+            with pool.checkout() as agent_set:
+                orchestrator = WellnessWorkflowOrchestrator(agent_set)
+        """
+        agent_set = self._acquire(self.checkout_timeout if timeout is None else timeout)
+        agent_set.reset_session()
+        try:
+            yield agent_set
+        finally:
+            agent_set.reset_session()
+            with self._lock:
+                self._checked_out -= 1
+            self._available.put(agent_set)
+
+    def _acquire(self, timeout: float) -> AgentSet:
+        try:
+            agent_set = self._available.get_nowait()
+        except queue.Empty:
+            agent_set = self._try_create()
+            if agent_set is None:
+                try:
+                    agent_set = self._available.get(timeout=timeout)
+                except queue.Empty:
+                    with self._lock:
+                        self._timeouts += 1
+                    raise AgentPoolExhausted(
+                        f"No agent set available after {timeout}s",
+                        context={'pool_size': self.size}
+                    )
+
+        with self._lock:
+            self._checked_out += 1
+            self._total_checkouts += 1
+        return agent_set
+
+    def _try_create(self) -> Optional[AgentSet]:
+        """Reserve a slot and build a new AgentSet, or return None if the pool is full."""
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+
+        try:
+            return AgentSet()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get pool utilisation counters."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'available': self._available.qsize(),
+                'checked_out': self._checked_out,
+                'total_checkouts': self._total_checkouts,
+                'checkout_timeouts': self._timeouts
+            }
+
+
+# Global agent pool (one per worker process)
+_agent_pool: Optional[AgentPool] = None
+_agent_pool_lock = threading.Lock()
+
+
+def get_agent_pool() -> AgentPool:
+    """Get the process-wide agent pool."""
+    global _agent_pool
+    if _agent_pool is None:
+        with _agent_pool_lock:
+            if _agent_pool is None:
+                _agent_pool = AgentPool()
+    return _agent_pool
+
+
+def warm_up_agent_pool() -> int:
+    """Eagerly build the process-wide agent pool."""
+    return get_agent_pool().warm_up()
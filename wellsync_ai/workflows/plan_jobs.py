@@ -0,0 +1,251 @@
+"""
+Background execution of wellness plan workflows.
+
+Lets /wellness-plan return a state_id immediately while the orchestrator
+runs on a bounded worker pool. Progress is published through
+RedisManager.set_workflow_status and the shared state's workflow_status
+so GET /wellness-plan/<state_id> can report it.
+"""
+
+import asyncio
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Iterator, Tuple
+
+import structlog
+
+from wellsync_ai.data.database import get_database_manager
+from wellsync_ai.data.redis_client import get_redis_manager
+from wellsync_ai.data.shared_state import get_shared_state
+from wellsync_ai.utils.config import get_config
+from wellsync_ai.utils.error_manager import WellnessError, ErrorSeverity
+from wellsync_ai.utils.plan_digest import invalidate_plan_digest
+from wellsync_ai.workflows.agent_pool import get_agent_pool
+
+logger = structlog.get_logger()
+
+
+class PlanJobInFlight(WellnessError):
+    """Raised when a streamed run is requested for a state that already has a job."""
+
+    def __init__(self, message: str, context: Optional[Dict[str, Any]] = None):
+        super().__init__(message, severity=ErrorSeverity.RECOVERABLE, context=context)
+
+
+def run_plan_workflow(
+    state_id: str,
+    user_id: Optional[str],
+    on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run the orchestrator for a prepared shared state and store the plan.
+
+    Shared by the synchronous /wellness-plan path, background jobs and
+    the streaming endpoint.
+
+    Args:
+        state_id: Prepared shared state
+        user_id: Owner of the plan
+        on_event: Optional orchestrator event callback (see execute_workflow)
+
+    Returns:
+        The orchestrator result (plan and metadata)
+    """
+    from wellsync_ai.workflows.wellness_orchestrator import WellnessWorkflowOrchestrator
+
+    with get_agent_pool().checkout() as agent_set:
+        orchestrator = WellnessWorkflowOrchestrator(agent_set)
+        result = asyncio.run(orchestrator.execute_workflow(state_id, on_event=on_event))
+
+    if not result:
+        raise RuntimeError("Workflow execution returned no result")
+
+    unified_plan = result.get('plan', {})
+    get_database_manager().store_wellness_plan(
+        user_id=user_id,
+        plan_data=unified_plan,
+        confidence=unified_plan.get('confidence', 0.85)
+    )
+    # The chat coach's digest of the previous plan is now stale
+    invalidate_plan_digest(user_id)
+
+    return result
+
+
+class PlanJobRunner:
+    """
+    Bounded worker pool for asynchronous wellness plan jobs.
+
+    At most one job per state_id runs at a time; resubmitting a state
+    that is still in flight returns the existing job, and streaming one
+    raises PlanJobInFlight.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        config = get_config()
+        # Each running job holds an agent set, so extra workers would only
+        # block on the pool checkout
+        self.max_workers = max_workers or min(config.plan_job_workers, config.agent_pool_size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="plan-job"
+        )
+        self._jobs: Dict[str, Future] = {}
+        # Reentrant: a job that finishes before its done callback is added
+        # runs _forget() at once, inside the caller's locked block
+        self._lock = threading.RLock()
+
+    def submit(self, state_id: str, user_id: Optional[str], request_id: Optional[str] = None) -> bool:
+        """
+        Queue a workflow run for a shared state.
+
+        Returns:
+            True if a new job was queued, False if one is already in flight
+        """
+        with self._lock:
+            existing = self._jobs.get(state_id)
+            if existing and not existing.done():
+                return False
+
+            _set_job_status(state_id, 'queued', {'request_id': request_id})
+            future = self._executor.submit(self._run_job, state_id, user_id, request_id)
+            self._jobs[state_id] = future
+            future.add_done_callback(lambda _f, sid=state_id: self._forget(sid, _f))
+            return True
+
+    def stream(
+        self,
+        state_id: str,
+        user_id: Optional[str],
+        request_id: Optional[str] = None,
+        keepalive_seconds: float = 15.0
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run a workflow on the pool and return an iterator over its events.
+
+        The job is queued before this returns, so a conflict surfaces
+        here rather than on first iteration. The iterator yields
+        ('proposal', ...) per agent, then ('plan', ...) or ('error', ...),
+        and ('keepalive', {}) while waiting so proxies keep the stream open.
+        The workflow keeps running (and its plan is stored) even if the
+        consumer stops iterating early.
+
+        Raises:
+            PlanJobInFlight: A job for state_id is already queued or running
+        """
+        events: "queue.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = queue.Queue()
+
+        def on_event(event: str, payload: Dict[str, Any]) -> None:
+            events.put((event, payload))
+
+        def run() -> None:
+            try:
+                self._run_job(state_id, user_id, request_id, on_event=on_event)
+            finally:
+                events.put(None)
+
+        with self._lock:
+            existing = self._jobs.get(state_id)
+            if existing and not existing.done():
+                raise PlanJobInFlight(
+                    f"A plan job is already running for state {state_id}",
+                    context={'state_id': state_id}
+                )
+
+            _set_job_status(state_id, 'queued', {'request_id': request_id})
+            future = self._executor.submit(run)
+            self._jobs[state_id] = future
+            future.add_done_callback(lambda _f, sid=state_id: self._forget(sid, _f))
+
+        return self._drain(events, keepalive_seconds)
+
+    @staticmethod
+    def _drain(
+        events: "queue.Queue[Optional[Tuple[str, Dict[str, Any]]]]",
+        keepalive_seconds: float
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        while True:
+            try:
+                item = events.get(timeout=keepalive_seconds)
+            except queue.Empty:
+                yield 'keepalive', {}
+                continue
+            if item is None:
+                return
+            yield item
+
+    def is_running(self, state_id: str) -> bool:
+        """Check whether a job for state_id is queued or running."""
+        with self._lock:
+            future = self._jobs.get(state_id)
+            return bool(future and not future.done())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get job runner counters."""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'in_flight': sum(1 for f in self._jobs.values() if not f.done())
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._executor.shutdown(wait=wait)
+
+    def _forget(self, state_id: str, future: Future) -> None:
+        with self._lock:
+            if self._jobs.get(state_id) is future:
+                del self._jobs[state_id]
+
+    def _run_job(
+        self,
+        state_id: str,
+        user_id: Optional[str],
+        request_id: Optional[str],
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> None:
+        logger.info("Plan job started", state_id=state_id, request_id=request_id)
+        try:
+            run_plan_workflow(state_id, user_id, on_event=on_event)
+            logger.info("Plan job completed", state_id=state_id, request_id=request_id)
+        except Exception as e:
+            from wellsync_ai.utils.error_manager import get_error_manager
+            error_info = get_error_manager().handle_error(
+                e, "PlanJobRunner", {'state_id': state_id, 'user_id': user_id}
+            )
+
+            shared_state = get_shared_state(state_id)
+            if shared_state:
+                shared_state.update_workflow_status('failed', {'error': error_info['message']})
+            _set_job_status(state_id, 'failed', {'error': error_info['message']})
+            if on_event:
+                on_event('error', {'state_id': state_id, 'error': error_info['message']})
+
+            logger.error("Plan job failed", state_id=state_id, error=error_info['message'])
+
+
+def _set_job_status(state_id: str, status: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """Merge job-level fields into the workflow status record for state_id."""
+    redis_manager = get_redis_manager()
+    current = redis_manager.get_workflow_status(state_id) or {}
+    merged = dict(current.get('data') or {})
+    merged.update(data or {})
+    merged[f'{status}_at'] = datetime.now().isoformat()
+    redis_manager.set_workflow_status(state_id, status, merged)
+
+
+# Global job runner (one per worker process)
+_plan_job_runner: Optional[PlanJobRunner] = None
+_plan_job_runner_lock = threading.Lock()
+
+
+def get_plan_job_runner() -> PlanJobRunner:
+    """Get the process-wide plan job runner."""
+    global _plan_job_runner
+    if _plan_job_runner is None:
+        with _plan_job_runner_lock:
+            if _plan_job_runner is None:
+                _plan_job_runner = PlanJobRunner()
+    return _plan_job_runner
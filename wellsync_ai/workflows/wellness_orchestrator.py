@@ -2,97 +2,123 @@ import asyncio
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 
 import structlog
 
 from wellsync_ai.data.shared_state import get_shared_state, SharedState
-from wellsync_ai.agents.fitness_agent import FitnessAgent
-from wellsync_ai.agents.nutrition_agent import NutritionAgent
-from wellsync_ai.agents.sleep_agent import SleepAgent
-from wellsync_ai.agents.mental_wellness_agent import MentalWellnessAgent
-from wellsync_ai.agents.coordinator_agent import CoordinatorAgent
 from wellsync_ai.data.database import get_database_manager
+from wellsync_ai.data.redis_client import get_redis_manager
+from wellsync_ai.workflows.agent_pool import AgentSet
 
 logger = structlog.get_logger()
 
+def invalidate_user_proposals(user_id: str) -> int:
+    """
+    Drop the cached proposals and plans a user may be served.
+
+    Proposals in the 'shared' scope carry the tag of every user they were
+    served to (see _run_agents), so this drops those too without touching
+    shared entries other users alone have seen.
+
+    Returns:
+        Number of cache entries removed
+    """
+    from wellsync_ai.utils.cache_manager import get_cache_manager
+    return get_cache_manager().invalidate_tags(f"user:{user_id}")
+
+
 class WellnessWorkflowOrchestrator:
     """
     Orchestrates the 8-step wellness planning workflow.
     Manages parallel agent execution, state updates, and coordination.
     """
     
-    def __init__(self):
-        self.coordinator = CoordinatorAgent()
-        # Lazily instantiate other agents or instantiate here
-        # Assuming agents are stateless per request or handle their own state via session_id
-        # For this implementation, we re-instantiate or reuse. 
-        # Ideally, we should have a registry. For now, instantiating directly.
-        
-        # Note: In a real system, these might injected or loaded from config
-        self.agents = {
-            'FitnessAgent': FitnessAgent(),
-            'NutritionAgent': NutritionAgent(),
-            'SleepAgent': SleepAgent(),
-            'MentalWellnessAgent': MentalWellnessAgent()
-        }
+    def __init__(self, agent_set: Optional[AgentSet] = None):
+        """
+        Args:
+            agent_set: Warm agents checked out from the AgentPool. When omitted,
+                a fresh set is constructed (used by scripts and tests).
+        """
+        if agent_set is None:
+            agent_set = AgentSet()
+        
+        self.coordinator = agent_set.coordinator
+        self.agents = agent_set.agents
+        self._state_id: Optional[str] = None
+        self._progress: Dict[str, Any] = {}
+        self._on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
 
-    async def execute_workflow(self, state_id: str) -> Dict[str, Any]:
+    async def execute_workflow(
+        self,
+        state_id: str,
+        on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
         """
         Execute the full wellness planning workflow.
         
         Args:
             state_id: ID of the shared state containing user profile and constraints
+            on_event: Optional callback receiving ('proposal', ...) as each agent
+                finishes and ('plan', ...) once the coordinator is done
             
         Returns:
             The final coordinated wellness plan
         """
         logger.info("Starting wellness workflow execution", state_id=state_id)
+        self._on_event = on_event
         
         # 1. Retrieve State
         shared_state = get_shared_state(state_id)
         if not shared_state:
             raise ValueError(f"Shared state {state_id} not found")
+        
+        self._start_progress(state_id)
+
+        # All state updates below are committed as one durable write
+        with shared_state.batch():
+            shared_state.update_workflow_status('running')
             
-        state_data = shared_state.get_state_data()
-        user_profile = state_data.get('user_profile', {})
-        constraints = state_data.get('constraints', {})
-        user_id = user_profile.get('user_id')
-        
-        # 2. Fetch Historical Context (RAG)
-        historical_context = []
-        if user_id:
-            db_manager = get_database_manager()
-            historical_context = db_manager.get_user_history(user_id, limit=3)
-            logger.info("Fetched historical context for RAG", user_id=user_id, planes_count=len(historical_context))
-        
-        # Inject history into state data for agents to see
-        state_data['historical_context'] = historical_context
-        
-        # 3. Phase 1: Sequential Agent Analysis
-        # We run domain agents sequentially to avoid rate limits
-        agent_proposals = await self._run_agents(user_profile, constraints, state_data)
-        
-        # Update state with proposals
-        shared_state.update_recent_data('agent_proposals', agent_proposals)
-        
-        # 3. Phase 2: Coordination & Conflict Resolution
-        # Coordinator analyzes proposals and constraints
-        unified_plan = self.coordinator.coordinate_agent_proposals(
-            agent_proposals, 
-            constraints, 
-            state_data
-        )
+            state_data = shared_state.get_state_data()
+            user_profile = state_data.get('user_profile', {})
+            constraints = state_data.get('constraints', {})
+            user_id = user_profile.get('user_id')
         
-        # 4. Phase 3: Finalization & Response
-        # Persist the unified plan to shared state's current_plans
-        # This ensures the plan is stored and retrievable
-        for domain in ['fitness', 'nutrition', 'sleep', 'mental_wellness']:
-            if domain in unified_plan:
-                shared_state.update_current_plans(domain, unified_plan[domain])
+            # 2. Fetch Historical Context (RAG)
+            historical_context = []
+            if user_id:
+                db_manager = get_database_manager()
+                historical_context = db_manager.get_user_history(user_id, limit=3)
+                logger.info("Fetched historical context for RAG", user_id=user_id, planes_count=len(historical_context))
         
-        # Also store the full unified plan for easy retrieval
-        shared_state.update_recent_data('unified_plan', unified_plan)
+            # Inject history into state data for agents to see
+            state_data['historical_context'] = historical_context
+        
+            # 3. Phase 1: Sequential Agent Analysis
+            # We run domain agents sequentially to avoid rate limits
+            agent_proposals = await self._run_agents(user_profile, constraints, state_data)
+        
+            # Update state with proposals
+            shared_state.update_recent_data('agent_proposals', agent_proposals)
+        
+            # 3. Phase 2: Coordination & Conflict Resolution
+            # Coordinator analyzes proposals and constraints
+            self._report_progress('running', stage='coordinating')
+            unified_plan = await self._coordinate(agent_proposals, constraints, state_data)
+        
+            # 4. Phase 3: Finalization & Response
+            # Persist the unified plan to shared state's current_plans
+            # This ensures the plan is stored and retrievable
+            for domain in ['fitness', 'nutrition', 'sleep', 'mental_wellness']:
+                if domain in unified_plan:
+                    shared_state.update_current_plans(domain, unified_plan[domain])
+        
+            # Also store the full unified plan for easy retrieval
+            shared_state.update_recent_data('unified_plan', unified_plan)
+            shared_state.update_workflow_status('completed')
+        
+        # Only report completion once the plan is committed
+        self._report_progress('completed', stage='completed')
         
         # Format the final response
         final_response = {
@@ -106,9 +132,11 @@ class WellnessWorkflowOrchestrator:
             }
         }
         
+        self._emit('plan', final_response)
         logger.info("Wellness workflow execution completed", state_id=state_id)
         
         return final_response
+
     async def _run_agents(
         self, 
         user_profile: Dict[str, Any], 
@@ -125,28 +153,49 @@ class WellnessWorkflowOrchestrator:
         tasks = []
         agent_names = []
         
+        user_tag = f"user:{user_profile.get('user_id')}"
+        cache_keys = {}
+        cache_tags = {}
+        shared_keys = set()
         for name, agent in self.agents.items():
-            # Generate cache key
-            cache_data = {
-                'agent': name,
-                'user_id': user_profile.get('user_id'),
-                'profile_age': user_profile.get('age'),
-                'constraints': constraints,
-                'domain': agent.domain
-            }
-            cache_key = cache_manager.generate_key(f"agent_proposal:{name}", cache_data)
-            
-            # Check cache
-            cached_result = cache_manager.get(cache_key)
+            # Cache key from the agent's normalized input fingerprint; 'shared'
+            # scoped keys let users with equivalent inputs reuse a proposal
+            scope, fingerprint = agent.cache_fingerprint(user_profile, constraints, shared_state_data)
+            cache_keys[name] = cache_manager.generate_key(f"agent_proposal:{name}:{scope}", fingerprint)
+            cache_tags[name] = [user_tag, f"agent:{name}"]
+            if scope == 'shared':
+                shared_keys.add(cache_keys[name])
+        
+        # Check every agent's cache entry in one Redis round trip
+        cached = cache_manager.get_many(cache_keys.values())
+        
+        served_shared = []
+        for name, agent in self.agents.items():
+            cache_key = cache_keys[name]
+            cached_result = cached.get(cache_key)
             if cached_result:
                 logger.info(f"Cache HIT for agent: {name}")
                 proposals[name] = cached_result
+                if cache_key in shared_keys:
+                    served_shared.append(cache_key)
+                self._set_agent_progress(name, 'cached')
+                self._emit_proposal(name, cached_result, cached=True)
                 continue
                 
             logger.info(f"Cache MISS for agent: {name}. Queueing for execution...")
-            tasks.append(self._execute_single_agent(name, agent, user_profile, constraints, shared_state_data, cache_manager, cache_key))
+            self._set_agent_progress(name, 'pending')
+            tasks.append(self._execute_single_agent(
+                name, agent, user_profile, constraints, shared_state_data,
+                cache_manager, cache_key, cache_tags[name],
+                shared=cache_key in shared_keys
+            ))
             agent_names.append(name)
+        
+        # Shared entries produced for another user now also belong to this one
+        cache_manager.add_tags(served_shared, [user_tag])
 
+        self._report_progress('running', stage='agents')
+        
         if tasks:
             logger.info(f"Executing {len(tasks)} agents in parallel...")
             results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -162,30 +211,46 @@ class WellnessWorkflowOrchestrator:
                         'confidence': 0.0,
                         'proposal': {}
                     }
+                    self._emit_proposal(name, proposals[name])
                 else:
                     proposals[name] = result
                     
         return proposals
 
-    async def _execute_single_agent(self, name, agent, user_profile, constraints, shared_state_data, cache_manager, cache_key):
-        """Helper to run a single agent with error handling and caching."""
+    async def _execute_single_agent(self, name, agent, user_profile, constraints, shared_state_data, cache_manager, cache_key, cache_tags, shared=False):
+        """Helper to run a single agent with error handling, caching and single-flight."""
         try:
-            # Random jitter to avoid exact simultaneous requests if uncached
-            import random
-            await asyncio.sleep(random.uniform(0.1, 2.0))
-            
             logger.info(f"Running agent: {name}")
+            self._set_agent_progress(name, 'running', report=True)
             
-            result = await asyncio.to_thread(
-                agent.process_wellness_request,
-                user_profile,
-                constraints,
-                shared_state_data
+            async def compute():
+                result = await agent.aprocess_wellness_request(
+                    user_profile,
+                    constraints,
+                    shared_state_data
+                )
+                # The producing session is meaningless to whoever reuses the entry
+                return {k: v for k, v in result.items() if k != 'session_id'}
+            
+            # Identical in-flight requests (double submits, launch spikes) await
+            # one LLM call; successful results are cached for 1 hour
+            result, source = await cache_manager.get_or_compute(
+                cache_key,
+                compute,
+                ttl=3600,
+                tags=cache_tags,
+                should_cache=lambda r: bool(r) and not r.get('is_error')
             )
             
-            # Store successful results in cache (TTL 1 hour)
-            if result and not result.get('is_error'):
-                cache_manager.set(cache_key, result, ttl=3600)
+            reused = source != 'computed'
+            if reused:
+                logger.info(f"Reused {source} result for agent: {name}")
+                if shared:
+                    # Stored under whichever user computed it; tag this one too
+                    cache_manager.add_tags([cache_key], [f"user:{user_profile.get('user_id')}"])
+            status = 'cached' if reused else ('failed' if result.get('is_error') else 'completed')
+            self._set_agent_progress(name, status, report=True)
+            self._emit_proposal(name, result, cached=reused)
             
             return result
         except Exception as e:
@@ -195,8 +260,9 @@ class WellnessWorkflowOrchestrator:
             error_info = get_error_manager().handle_error(e, f"Agent-{name}", error_context)
             
             logger.error(f"Agent {name} failed", error=error_info['message'])
+            self._set_agent_progress(name, 'failed', report=True)
             
-            return {
+            error_proposal = {
                 'agent_name': name,
                 'is_error': True,
                 'error_details': error_info,
@@ -204,5 +270,91 @@ class WellnessWorkflowOrchestrator:
                 'reasoning': f"Agent execution failed: {error_info['message']}",
                 'proposal': {} 
             }
-                
-        return proposals
\ No newline at end of file
+            self._emit_proposal(name, error_proposal)
+            return error_proposal
+
+    async def _coordinate(
+        self,
+        agent_proposals: Dict[str, Dict[str, Any]],
+        constraints: Dict[str, Any],
+        state_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Run the coordinator, coalescing identical concurrent requests.
+        
+        A user double-submitting the same request gets the same proposals
+        (coalesced above), so the second workflow reuses the first plan
+        instead of making another coordinator LLM call.
+        """
+        from wellsync_ai.utils.cache_manager import get_cache_manager
+        cache_manager = get_cache_manager()
+        user_id = state_data.get('user_profile', {}).get('user_id')
+        
+        cache_key = cache_manager.generate_key("coordinated_plan", {
+            'user_id': user_id,
+            'proposals': agent_proposals,
+            'constraints': constraints
+        })
+        
+        async def compute():
+            return self.coordinator.coordinate_agent_proposals(
+                agent_proposals,
+                constraints,
+                state_data
+            )
+        
+        unified_plan, _ = await cache_manager.get_or_compute(
+            cache_key,
+            compute,
+            ttl=300,
+            tags=[f"user:{user_id}", "agent:CoordinatorAgent"],
+            should_cache=lambda plan: bool(plan) and 'error' not in plan
+        )
+        return unified_plan
+    
+    def _start_progress(self, state_id: str) -> None:
+        """Seed per-workflow progress, keeping any job fields already recorded."""
+        self._state_id = state_id
+        existing = get_redis_manager().get_workflow_status(state_id) or {}
+        self._progress = dict(existing.get('data') or {})
+        self._progress.update({
+            'stage': 'started',
+            'started_at': datetime.now().isoformat(),
+            'agents': {name: 'pending' for name in self.agents}
+        })
+        self._report_progress('running')
+
+    def _set_agent_progress(self, name: str, status: str, report: bool = False) -> None:
+        """Record one agent's status, optionally publishing it immediately."""
+        self._progress.setdefault('agents', {})[name] = status
+        if report:
+            self._report_progress('running')
+
+    def _report_progress(self, status: str, **fields: Any) -> None:
+        """Publish workflow progress for GET /wellness-plan/<state_id>."""
+        if not self._state_id:
+            return
+        self._progress.update(fields)
+        self._progress['updated_at'] = datetime.now().isoformat()
+        try:
+            get_redis_manager().set_workflow_status(self._state_id, status, self._progress)
+        except Exception as e:
+            logger.warning("Failed to publish workflow progress", state_id=self._state_id, error=str(e))
+
+    def _emit_proposal(self, name: str, proposal: Dict[str, Any], cached: bool = False) -> None:
+        """Stream a single agent proposal as soon as it is available."""
+        self._emit('proposal', {
+            'state_id': self._state_id,
+            'agent': name,
+            'cached': cached,
+            'proposal': proposal
+        })
+
+    def _emit(self, event: str, payload: Dict[str, Any]) -> None:
+        """Forward a workflow event to the caller's callback, never failing the workflow."""
+        if not self._on_event:
+            return
+        try:
+            self._on_event(event, payload)
+        except Exception as e:
+            logger.warning("Workflow event callback failed", event=event, error=str(e))